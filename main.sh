@@ -1,4 +1 @@
-python3 src/main.py static public template.html
-cd public
-cd content 
-python3 -m http.server 8888
\ No newline at end of file
+python3 src/main.py serve --watch --port 8888
@@ -0,0 +1,132 @@
+import errno
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from manifest import hash_file
+
+LINK = "link"
+COPY = "copy"
+ASSET_MODES = (LINK, COPY)
+COPY_CHUNK_SIZE = 1 << 30
+
+class SyncStats:
+    def __init__(self):
+        self.skipped = 0
+        self.linked = 0
+        self.copied = 0
+        self.removed = 0
+
+    def add(self, result):
+        setattr(self, result, getattr(self, result) + 1)
+
+    def summary(self):
+        return (f"Assets: {self.skipped} unchanged, {self.linked} linked, "
+                f"{self.copied} copied, {self.removed} removed.")
+
+def is_page(path):
+    return path.endswith(".md")
+
+def up_to_date(src, dst, verify=False):
+    try:
+        dst_stat = os.stat(dst)
+    except FileNotFoundError:
+        return False
+    src_stat = os.stat(src)
+    if src_stat.st_size != dst_stat.st_size or src_stat.st_mtime_ns != dst_stat.st_mtime_ns:
+        return False
+    # a hard link to the source is up to date by definition, there is nothing to hash
+    if not verify or os.path.samestat(src_stat, dst_stat):
+        return True
+    return hash_file(src) == hash_file(dst)
+
+def _copy_range(src, dst):
+    """Copy with copy_file_range, which lets the kernel reflink or copy without a round trip through userspace."""
+    with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+        while os.copy_file_range(fsrc.fileno(), fdst.fileno(), COPY_CHUNK_SIZE):
+            pass
+    shutil.copystat(src, dst)
+
+def sync_file(src, dst, mode=LINK, verify=False):
+    """Bring dst up to date with src and return "skipped", "linked" or "copied".
+
+    Unchanged files (same size and mtime, and the same hash with verify) are
+    left alone. Otherwise dst is a hard link in link mode where the
+    filesystem allows it, then a copy_file_range copy, then a plain copy2.
+    """
+    if up_to_date(src, dst, verify):
+        return "skipped"
+    os.makedirs(os.path.dirname(dst) or ".", exist_ok=True)
+    # build next to dst and rename over it, so a reader never sees a half-written file
+    tmp = f"{dst}.{os.getpid()}.tmp"
+    try:
+        if mode == LINK:
+            try:
+                os.link(src, tmp)
+                os.replace(tmp, dst)
+                return "linked"
+            except OSError as e:
+                if e.errno not in (errno.EXDEV, errno.EPERM, errno.EMLINK, errno.ENOTSUP, errno.EACCES):
+                    raise
+        try:
+            _copy_range(src, tmp)
+        except (AttributeError, OSError):
+            # no copy_file_range on this platform or filesystem
+            shutil.copy2(src, tmp)
+        os.replace(tmp, dst)
+        return "copied"
+    finally:
+        if os.path.lexists(tmp):
+            os.remove(tmp)
+
+def sync_files(pairs, mode=LINK, verify=False, threads=None):
+    """Sync (src, dst) pairs on a thread pool (threads=None uses the executor default) and return SyncStats."""
+    stats = SyncStats()
+    if threads == 1 or len(pairs) < 2:
+        for src, dst in pairs:
+            stats.add(sync_file(src, dst, mode, verify))
+        return stats
+    # copying is I/O bound and releases the GIL, so threads are enough here
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        for result in executor.map(lambda pair: sync_file(pair[0], pair[1], mode, verify), pairs):
+            stats.add(result)
+    return stats
+
+def page_output(rel_path):
+    return rel_path[:-3] + ".html"
+
+def sync_assets(src, dst, mode=LINK, verify=False, threads=None, keep=()):
+    """Mirror the non-page files of src into dst and remove anything else from dst.
+
+    Returns (pages, stats) where pages lists (source .md, output .html) pairs
+    for the caller to render. Page outputs and the relative paths in keep are
+    kept, everything else in dst that no longer corresponds to a source file
+    is removed.
+    """
+    if not os.path.exists(src):
+        raise FileNotFoundError(f"Source directory '{src}' does not exist.")
+    pages = []
+    pairs = []
+    expected = set(keep)
+    for root, dirs, files in os.walk(src):
+        dirs.sort()
+        for name in sorted(files):
+            src_item = os.path.join(root, name)
+            rel_path = os.path.relpath(src_item, src)
+            if is_page(name):
+                output = page_output(rel_path)
+                pages.append((src_item, os.path.join(dst, output)))
+                expected.add(output)
+            else:
+                pairs.append((src_item, os.path.join(dst, rel_path)))
+                expected.add(rel_path)
+    os.makedirs(dst, exist_ok=True)
+    stats = sync_files(pairs, mode, verify, threads)
+    for root, dirs, files in os.walk(dst, topdown=False):
+        for name in files:
+            path = os.path.join(root, name)
+            if os.path.relpath(path, dst) not in expected:
+                os.remove(path)
+                stats.removed += 1
+        if root != dst and not os.listdir(root):
+            os.rmdir(root)
+    return pages, stats
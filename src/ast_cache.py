@@ -0,0 +1,86 @@
+import hashlib
+import json
+import os
+from metadata import PageMetadata
+from page_cache import DEFAULT_MAXSIZE, PageCache
+import manifest
+from version import GENERATOR_VERSION
+
+class AstCache(PageCache):
+    """Parsed pages, one JSON line of metadata followed by one line per block AST.
+
+    Keyed only by the source and GENERATOR_VERSION: neither the template nor
+    the base path is part of the key, so changing either re-wraps cached pages
+    without running the parser.
+    """
+    name = "AST cache"
+    suffix = ".jsonl"
+
+    def key(self, source_digest):
+        digest = hashlib.sha256()
+        for part in (GENERATOR_VERSION, source_digest):
+            digest.update(part.encode('utf-8'))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def writer(self, key):
+        return AstWriter(self, key)
+
+class AstWriter:
+    """Streams a page's metadata and block ASTs into a temporary file, moved into the cache on commit.
+
+    complete is set once every block has been written, a writer without it must be aborted.
+    """
+    def __init__(self, cache, key):
+        self.cache = cache
+        self.complete = False
+        self.path = cache.path_for(key)
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self.tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        self.file = open(self.tmp_path, 'w', encoding='utf-8')
+
+    def write_metadata(self, metadata):
+        fields = {"title": metadata.title, "description": metadata.description, "date": metadata.date,
+                  "tags": metadata.tags, "fields": metadata.fields}
+        self.write_line(fields)
+
+    def write_block(self, ast):
+        self.write_line(ast)
+
+    def write_line(self, value):
+        self.file.write(json.dumps(value, separators=(",", ":")))
+        self.file.write("\n")
+
+    def commit(self):
+        self.file.close()
+        os.replace(self.tmp_path, self.path)
+        self.cache.stores += 1
+
+    def abort(self):
+        self.file.close()
+        if os.path.exists(self.tmp_path):
+            os.remove(self.tmp_path)
+
+def iter_ast(path):
+    """Yield the PageMetadata of a cached page, then each block AST, reading one line at a time."""
+    with open(path, 'r', encoding='utf-8') as f:
+        yield PageMetadata(**json.loads(next(f)))
+        for line in f:
+            yield json.loads(line)
+
+def default_directory():
+    return os.path.join(manifest.CACHE_DIR, "ast")
+
+# None when --ast-cache-size is 0, see configure_ast_cache.
+_ast_cache = None
+
+def configure_ast_cache(directory, maxsize=DEFAULT_MAXSIZE):
+    global _ast_cache
+    if directory is None or maxsize <= 0:
+        _ast_cache = None
+        return None
+    _ast_cache = AstCache(directory, maxsize)
+    return _ast_cache
+
+def get_ast_cache():
+    return _ast_cache
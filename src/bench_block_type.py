@@ -0,0 +1,104 @@
+"""Micro-benchmark for BlockNode.determine_block_type.
+
+Compares the first-character dispatch classifier against the original
+regex-per-line implementation on a synthetic corpus.
+
+Usage: python3 src/bench_block_type.py [--blocks N] [--repeat R] [--seed S]
+"""
+import argparse
+import random
+import re
+import time
+from blocknode import BlockNode, BlockType
+
+def legacy_determine_block_type(content):
+    if re.match(r"#{1,6} ", content) and len(content.split("\n")) == 1:
+        return BlockType.HEADING
+    elif re.match(r"^```$.*^```$", content, re.DOTALL | re.MULTILINE):
+        return BlockType.CODE
+    else:
+        could_be_quote = True
+        could_be_unordered_list = True
+        could_be_ordered_list = True
+        newline = 0
+        for line in content.split("\n"):
+            newline += 1
+            if not re.match(r"> ", line):
+                could_be_quote = False
+            if not re.match(r"- ", line):
+                could_be_unordered_list = False
+            if not line.startswith(str(newline) + ". "):
+                could_be_ordered_list = False
+        if could_be_quote:
+            return BlockType.QUOTE
+        elif could_be_unordered_list:
+            return BlockType.UNORDERED_LIST
+        elif could_be_ordered_list:
+            return BlockType.ORDERED_LIST
+        else:
+            return BlockType.PARAGRAPH
+
+WORDS = "the quick brown fox jumps over lazy dog elves ring middle earth shire river".split()
+
+def sentence(rng):
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(6, 16))).capitalize() + "."
+
+def synthetic_block(rng):
+    kind = rng.random()
+    lines = rng.randint(1, 6)
+    if kind < 0.6:
+        return "\n".join(sentence(rng) for _ in range(lines))
+    if kind < 0.7:
+        return "#" * rng.randint(1, 6) + " " + sentence(rng)
+    if kind < 0.8:
+        return "- " + "\n- ".join(sentence(rng) for _ in range(lines))
+    if kind < 0.85:
+        return "\n".join(f"{i + 1}. {sentence(rng)}" for i in range(lines))
+    if kind < 0.9:
+        return "> " + "\n> ".join(sentence(rng) for _ in range(lines))
+    if kind < 0.95:
+        return "```\n" + "\n".join(sentence(rng) for _ in range(lines)) + "\n```"
+    # near misses that must still come out as paragraphs
+    return rng.choice(["#hashtag ", "- item\n", "1. one\n3. ", "> quote\n", "```\n"]) + sentence(rng)
+
+def synthetic_corpus(count, seed=0):
+    rng = random.Random(seed)
+    return [synthetic_block(rng) for _ in range(count)]
+
+def time_classifier(classify, corpus, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for content in corpus:
+            classify(content)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--blocks", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    corpus = synthetic_corpus(args.blocks, args.seed)
+    # BlockNode classifies in __init__, so time the method on a reused instance
+    node = BlockNode("", 1)
+    def classify(content):
+        node.content = content
+        return node.determine_block_type()
+
+    mismatches = [content for content in corpus if classify(content) != legacy_determine_block_type(content)]
+    if mismatches:
+        raise SystemExit(f"{len(mismatches)} block(s) classified differently, first: {mismatches[0]!r}")
+
+    legacy = time_classifier(legacy_determine_block_type, corpus, args.repeat)
+    current = time_classifier(classify, corpus, args.repeat)
+    print(f"{args.blocks} blocks, best of {args.repeat}")
+    print(f"  legacy classifier:  {legacy * 1000:8.2f} ms  ({legacy / args.blocks * 1e6:.2f} us/block)")
+    print(f"  current classifier: {current * 1000:8.2f} ms  ({current / args.blocks * 1e6:.2f} us/block)")
+    print(f"  speedup: {legacy / current:.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""Benchmark for rendering blocks through HTMLNode trees vs straight from the tokens.
+
+Renders a synthetic corpus with BlockNode.to_section().to_html() and with
+BlockNode.to_html(), checks both give the same HTML, and reports time per 1k
+blocks and how many TextNode and HTMLNode objects each path builds per
+inline token.
+
+Usage: python3 src/bench_inline_html.py [--blocks N] [--repeat R] [--mix NAME]
+"""
+import argparse
+import gc
+import random
+import time
+from benchmark import parse_mix, synthetic_block
+from diagnostics import Diagnostics, Policy
+from htmlnode import LeafNode, ImageNode, ParentNode
+from main import markdown_to_blocks
+from textnode import TextNode
+
+def corpus(count, mix, seed):
+    rng = random.Random(seed)
+    kinds = list(mix)
+    weights = [mix[kind] for kind in kinds]
+    return "\n\n".join(synthetic_block(rng, kind) for kind in rng.choices(kinds, weights=weights, k=count))
+
+def fresh_blocks(markdown):
+    # rendering strips block markers from the content, so every run gets its own blocks
+    return markdown_to_blocks(markdown, Diagnostics(Policy.COLLECT))
+
+def tree_render(blocks):
+    return [block.to_section().to_html() for block in blocks]
+
+def direct_render(blocks):
+    return [block.to_html() for block in blocks]
+
+def best_of(repeat, markdown, render):
+    best = None
+    for _ in range(repeat):
+        blocks = fresh_blocks(markdown)
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            render(blocks)
+            elapsed = time.perf_counter() - start
+        finally:
+            gc.enable()
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def constructed_nodes(markdown, render):
+    """How many TextNodes and HTMLNodes render builds for the corpus, counted in their __init__."""
+    classes = [TextNode, LeafNode, ImageNode, ParentNode, LeafNode.trusted, ImageNode.trusted, ParentNode.trusted]
+    originals = {cls: cls.__dict__.get("__init__") for cls in classes}
+    count = 0
+    def counting(init):
+        def counted(self, *args, **kwargs):
+            nonlocal count
+            # a validated subclass calls its base __init__ too, only count the outermost call
+            if type(self).__init__ is counted:
+                count += 1
+            init(self, *args, **kwargs)
+        return counted
+    for cls in classes:
+        cls.__init__ = counting(cls.__init__)
+    try:
+        render(fresh_blocks(markdown))
+    finally:
+        for cls, init in originals.items():
+            if init is None:
+                del cls.__init__
+            else:
+                cls.__init__ = init
+    return count
+
+def token_count(markdown):
+    total = 0
+    for block in fresh_blocks(markdown):
+        tag, payload = block.to_ast()
+        if tag == "ul" or tag == "ol":
+            total += sum(len(row) for row in payload)
+        elif tag != "pre":
+            total += len(payload)
+    return total
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--blocks", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--mix", default="balanced")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    markdown = corpus(args.blocks, parse_mix(args.mix), args.seed)
+    if tree_render(fresh_blocks(markdown)) != direct_render(fresh_blocks(markdown)):
+        raise SystemExit("direct rendering gave different HTML")
+
+    per_1k = 1000 / args.blocks
+    tokens = token_count(markdown)
+    tree = best_of(args.repeat, markdown, tree_render)
+    direct = best_of(args.repeat, markdown, direct_render)
+    tree_nodes = constructed_nodes(markdown, tree_render)
+    direct_nodes = constructed_nodes(markdown, direct_render)
+
+    print(f"{args.blocks} blocks, {tokens} inline tokens ({args.mix}), best of {args.repeat}")
+    print(f"  {'':<8} {'ms/1k blocks':>13} {'nodes/token':>12}")
+    print(f"  {'tree':<8} {tree * 1000 * per_1k:13.2f} {tree_nodes / tokens:12.2f}")
+    print(f"  {'direct':<8} {direct * 1000 * per_1k:13.2f} {direct_nodes / tokens:12.2f}")
+    print(f"  speedup: {tree / direct:.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Scaling benchmark for link and image matching on pathological lines.
+
+Times the old LINK_PATTERN/IMAGE_PATTERN regexes against LinkScanner on
+inputs full of unmatched brackets, unclosed images and long urls, doubling
+the input each step. Time per character should stay flat for the scanner;
+the regexes grow with the input.
+
+Usage: python3 src/bench_link_scan.py [--size N] [--steps S] [--repeat R] [--no-legacy]
+"""
+import argparse
+import re
+import time
+from inline_parser import text_to_text_nodes
+from link_scanner import LinkScanner
+
+LEGACY_LINK_PATTERN = re.compile(r"\[([^\[\]]*(?:\[[^\[\]]*\][^\[\]]*)*)\]\(([^)]+)\)")
+LEGACY_IMAGE_PATTERN = re.compile(r"!\[(.*?)\]\(([^)]+)\)")
+OPENER_PATTERN = re.compile(r"!\[|\[")
+
+CASES = {
+    "open brackets": lambda n: "[" * n,
+    "unclosed images": lambda n: "![alt " * (n // 6),
+    "long urls": lambda n: ("[link](" + "u" * 200 + " ") * (n // 208),
+    "empty image urls": lambda n: "![a " * (n // 8) + "]() " * (n // 8),
+    "nested brackets": lambda n: "[a [b] " * (n // 7) + "](/url)",
+}
+
+def legacy_scan(text):
+    tokens = []
+    pos = 0
+    while True:
+        opener = OPENER_PATTERN.search(text, pos)
+        if opener is None:
+            return tokens
+        pattern = LEGACY_IMAGE_PATTERN if opener.group() == "![" else LEGACY_LINK_PATTERN
+        match = pattern.match(text, opener.start())
+        if match is None:
+            pos = opener.start() + 1
+            continue
+        tokens.append((match.group(1), match.group(2), match.end()))
+        pos = match.end()
+
+def scan(text):
+    tokens = []
+    links = LinkScanner(text)
+    pos = 0
+    while True:
+        opener = OPENER_PATTERN.search(text, pos)
+        if opener is None:
+            return tokens
+        if opener.group() == "![":
+            token = links.match_image(opener.start())
+        else:
+            token = links.match_link(opener.start())
+        if token is None:
+            pos = opener.start() + 1
+            continue
+        tokens.append(token)
+        pos = token[2]
+
+def best_time(function, text, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(text)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=2000, help="characters in the smallest input")
+    parser.add_argument("--steps", type=int, default=5, help="how many times to double the input")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--no-legacy", action="store_true", help="skip the regexes, which get slow on big inputs")
+    args = parser.parse_args()
+
+    for name, make in CASES.items():
+        print(name)
+        for step in range(args.steps):
+            text = make(args.size * 2 ** step)
+            if not args.no_legacy and scan(text) != legacy_scan(text):
+                raise SystemExit(f"{name}: scanner and regexes disagree on a {len(text)} character input")
+            line = f"  {len(text):>9} chars"
+            if not args.no_legacy:
+                legacy = best_time(legacy_scan, text, args.repeat)
+                line += f"  regex {legacy * 1000:9.2f} ms ({legacy / len(text) * 1e9:8.1f} ns/char)"
+            current = best_time(scan, text, args.repeat)
+            line += f"  scanner {current * 1000:8.2f} ms ({current / len(text) * 1e9:6.1f} ns/char)"
+            rendered = best_time(text_to_text_nodes, text, args.repeat)
+            line += f"  inline parse {rendered * 1000:8.2f} ms"
+            print(line)
+
+if __name__ == "__main__":
+    main()
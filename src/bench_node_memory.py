@@ -0,0 +1,70 @@
+"""Memory benchmark for the node classes.
+
+Builds the same nodes with dict-based copies of the original classes and
+with the slotted classes, and reports traced bytes per node for each.
+
+Usage: python3 src/bench_node_memory.py [--nodes N]
+"""
+import argparse
+import gc
+import tracemalloc
+from htmlnode import LeafNode, ParentNode
+from textnode import TextNode, TextType
+
+class LegacyTextNode:
+    def __init__(self, text, text_type, url=None):
+        self.text = text
+        self.text_type = text_type
+        self.url = url
+
+class LegacyHTMLNode:
+    def __init__(self, tag=None, value=None, children=None, props=None):
+        self.tag = tag
+        self.value = value
+        self.children = children if children is not None else []
+        self.props = props if props is not None else {}
+
+class LegacyLeafNode(LegacyHTMLNode):
+    def __init__(self, tag, value, props=None):
+        super().__init__(tag=tag, value=value, props=props)
+
+class LegacyParentNode(LegacyHTMLNode):
+    def __init__(self, tag, children, props=None):
+        super().__init__(tag=tag, value=None, children=children, props=props)
+
+def measure(build, count):
+    """Return traced bytes per node for count nodes made by build(i)."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    nodes = [build(i) for i in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # the list holding the nodes is the same size in both runs, leave it out
+    list_bytes = nodes.__sizeof__()
+    del nodes
+    return (after - before - list_bytes) / count
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--nodes", type=int, default=100000)
+    args = parser.parse_args()
+
+    # values are shared so only the node objects themselves are measured
+    text = "some inline text"
+    child = [LeafNode(tag=None, value=text)]
+    legacy_child = [LegacyLeafNode(tag=None, value=text)]
+    cases = [
+        ("TextNode", lambda i: LegacyTextNode(text, TextType.PLAIN), lambda i: TextNode(text, TextType.PLAIN)),
+        ("LeafNode", lambda i: LegacyLeafNode(None, text), lambda i: LeafNode(None, text)),
+        ("ParentNode", lambda i: LegacyParentNode("p", legacy_child), lambda i: ParentNode("p", child)),
+    ]
+    print(f"{args.nodes} nodes per class, traced bytes per node")
+    print(f"  {'class':<12} {'before':>10} {'after':>10} {'saved':>8}")
+    for name, legacy, current in cases:
+        before = measure(legacy, args.nodes)
+        after = measure(current, args.nodes)
+        print(f"  {name:<12} {before:10.1f} {after:10.1f} {(1 - after / before) * 100:7.1f}%")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Benchmark for splitting a large markdown file into blocks, line by line vs from its bytes.
+
+Writes a synthetic page of --blocks blocks to a temporary file, checks both
+scanners give the same BlockNodes, and reports the best time of each to split
+it, with and without classifying the blocks.
+
+Usage: python3 src/bench_scanner.py [--blocks N] [--repeat R] [--mix NAME]
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+import blocknode
+import byte_scanner
+from benchmark import parse_mix, synthetic_block
+
+def write_corpus(path, count, mix, seed):
+    rng = random.Random(seed)
+    kinds = list(mix)
+    weights = [mix[kind] for kind in kinds]
+    with open(path, "w", encoding="utf-8") as f:
+        for kind in rng.choices(kinds, weights=weights, k=count):
+            f.write(synthetic_block(rng, kind))
+            f.write("\n\n")
+
+def text_scan(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return list(blocknode.iter_blocks(f))
+
+def bytes_scan(path):
+    return list(byte_scanner.iter_file_blocks(path))
+
+def best_time(function, path, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(path)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def split_only(repeat, path):
+    """Times with make_block replaced by a stub, so only finding the block boundaries is measured."""
+    make_block = blocknode.make_block
+    blocknode.make_block = byte_scanner.make_block = lambda text, start_line, diagnostics=None, block_type=None: None
+    try:
+        return best_time(text_scan, path, repeat), best_time(bytes_scan, path, repeat)
+    finally:
+        blocknode.make_block = byte_scanner.make_block = make_block
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--blocks", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--mix", default="balanced")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    fd, path = tempfile.mkstemp(suffix=".md")
+    os.close(fd)
+    try:
+        write_corpus(path, args.blocks, parse_mix(args.mix), args.seed)
+        if text_scan(path) != bytes_scan(path):
+            raise SystemExit("bytes scanner gave different blocks")
+        size = os.path.getsize(path) / 2 ** 20
+        text = best_time(text_scan, path, args.repeat)
+        scanned = best_time(bytes_scan, path, args.repeat)
+        text_split, bytes_split = split_only(args.repeat, path)
+    finally:
+        os.remove(path)
+
+    print(f"{args.blocks} blocks, {size:.1f} MB ({args.mix}), best of {args.repeat}")
+    print(f"  {'':<8} {'blocks s':>9} {'split only s':>13}")
+    print(f"  {'text':<8} {text:9.3f} {text_split:13.3f}")
+    print(f"  {'bytes':<8} {scanned:9.3f} {bytes_split:13.3f}")
+    print(f"  speedup: {text / scanned:.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""Benchmark for building and rendering block trees, validated vs trusted construction.
+
+Tokenizes a synthetic corpus once, then times building the HTMLNode trees
+for every block with the validating constructors and with the trusted()
+factories, and rendering each set of trees with to_html.
+
+Usage: python3 src/bench_tree_build.py [--blocks N] [--repeat R] [--mix NAME]
+"""
+import argparse
+import gc
+import random
+import time
+from benchmark import parse_mix, synthetic_block
+from blocknode import BlockType
+from diagnostics import Diagnostics, Policy
+from htmlnode import LeafNode, ImageNode, ParentNode
+from main import markdown_to_blocks
+from textnode import TextType
+
+LEAF_TAGS = {TextType.PLAIN: None, TextType.BOLD: "b", TextType.ITALIC: "i", TextType.CODE: "code"}
+BLOCK_TAGS = {BlockType.PARAGRAPH: "p", BlockType.QUOTE: "blockquote", BlockType.UNORDERED_LIST: "ul", BlockType.ORDERED_LIST: "ol"}
+
+def validated_leaf(node):
+    if node.text_type == TextType.LINK:
+        return LeafNode(tag="a", value=node.text, props={"href": node.url})
+    if node.text_type == TextType.IMAGE:
+        return ImageNode(tag="img", props={"src": node.url, "alt": node.text})
+    return LeafNode(tag=LEAF_TAGS[node.text_type], value=node.text)
+
+def trusted_leaf(node):
+    if node.text_type == TextType.LINK:
+        return LeafNode.trusted(tag="a", value=node.text, props={"href": node.url})
+    if node.text_type == TextType.IMAGE:
+        return ImageNode.trusted(tag="img", props={"src": node.url, "alt": node.text})
+    return LeafNode.trusted(tag=LEAF_TAGS[node.text_type], value=node.text)
+
+def tokenize(count, mix, seed):
+    """Return (tag, rows) per block, where rows holds one TextNode list per line item."""
+    rng = random.Random(seed)
+    kinds = list(mix)
+    weights = [mix[kind] for kind in kinds]
+    markdown = "\n\n".join(synthetic_block(rng, kind) for kind in rng.choices(kinds, weights=weights, k=count))
+    items = []
+    for block in markdown_to_blocks(markdown, Diagnostics(Policy.COLLECT)):
+        if block.block_type in (BlockType.UNORDERED_LIST, BlockType.ORDERED_LIST):
+            rows = [block.block_text_to_text_nodes(line[line.index(" ") + 1:]) for line in block.content.split("\n")]
+            items.append((BLOCK_TAGS[block.block_type], rows))
+        elif block.block_type in BLOCK_TAGS:
+            items.append((BLOCK_TAGS[block.block_type], [block.block_text_to_text_nodes()]))
+        elif block.block_type == BlockType.HEADING:
+            items.append(("h2", [block.block_text_to_text_nodes(block.content.lstrip("# "))]))
+        else:
+            items.append(("pre", [block.content]))
+    return items
+
+def build(items, parent, leaf):
+    trees = []
+    for tag, rows in items:
+        if tag == "pre":
+            inner = parent("pre", [leaf_code(rows[0], leaf)])
+        elif tag in ("ul", "ol"):
+            inner = parent(tag, [parent("li", [leaf(node) for node in row]) for row in rows])
+        else:
+            inner = parent(tag, [leaf(node) for node in rows[0]])
+        trees.append(parent("div", [inner]))
+    return trees
+
+def leaf_code(text, leaf):
+    return LeafNode(tag="code", value=text) if leaf is validated_leaf else LeafNode.trusted(tag="code", value=text)
+
+def best_of(repeat, func):
+    best = None
+    result = None
+    for _ in range(repeat):
+        # drop the previous trees and keep the collector out of the timing, like timeit does
+        result = None
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            result = func()
+            elapsed = time.perf_counter() - start
+        finally:
+            gc.enable()
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--blocks", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--mix", default="balanced")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    items = tokenize(args.blocks, parse_mix(args.mix), args.seed)
+    per_1k = 1000 / len(items)
+    validated_build, validated_trees = best_of(args.repeat, lambda: build(items, lambda tag, children: ParentNode(tag=tag, children=children), validated_leaf))
+    trusted_build, trusted_trees = best_of(args.repeat, lambda: build(items, lambda tag, children: ParentNode.trusted(tag=tag, children=children), trusted_leaf))
+    validated_render, validated_html = best_of(args.repeat, lambda: [tree.to_html() for tree in validated_trees])
+    trusted_render, trusted_html = best_of(args.repeat, lambda: [tree.to_html() for tree in trusted_trees])
+    if validated_html != trusted_html:
+        raise SystemExit("trusted trees rendered different HTML")
+
+    print(f"{len(items)} blocks ({args.mix}), best of {args.repeat}, ms per 1k blocks")
+    print(f"  {'':<10} {'build':>8} {'render':>8} {'total':>8}")
+    print(f"  {'validated':<10} {validated_build * 1000 * per_1k:8.2f} {validated_render * 1000 * per_1k:8.2f} {(validated_build + validated_render) * 1000 * per_1k:8.2f}")
+    print(f"  {'trusted':<10} {trusted_build * 1000 * per_1k:8.2f} {trusted_render * 1000 * per_1k:8.2f} {(trusted_build + trusted_render) * 1000 * per_1k:8.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+"""Benchmark suite for the markdown to HTML pipeline.
+
+Generates a synthetic corpus and times each pipeline stage on its own,
+then writes the results as JSON so runs can be compared across commits.
+
+Usage (from src/): python3 -m benchmark [--pages N] [--blocks N] [--mix NAME|k=v,...] [--output FILE]
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import tempfile
+import time
+from blocknode import section_html
+from diagnostics import Diagnostics, Policy
+from main import markdown_to_blocks, get_title
+from template import CompiledTemplate
+
+WORDS = ("the quick brown fox jumps over lazy dog elves ring middle earth shire river "
+         "mountain forest wizard hobbit journey council road").split()
+
+MIXES = {
+    "balanced": {"paragraph": 0.4, "heading": 0.1, "list": 0.2, "links": 0.15, "code": 0.1, "quote": 0.05},
+    "paragraph": {"paragraph": 0.85, "heading": 0.1, "quote": 0.05},
+    "list": {"list": 0.8, "paragraph": 0.1, "heading": 0.1},
+    "links": {"links": 0.8, "paragraph": 0.1, "heading": 0.1},
+    "code": {"code": 0.7, "paragraph": 0.2, "heading": 0.1},
+}
+
+STAGES = ("read", "markdown_to_blocks", "determine_block_type", "block_text_to_text_nodes",
+          "parse_html", "section_html", "template_fill", "write")
+
+TEMPLATE = CompiledTemplate.compile(
+    "<!doctype html>\n<html>\n<head><title>{{ Title }}</title>"
+    '<link href="/index.css" rel="stylesheet" /></head>\n'
+    "<body><article>{{ Content }}</article></body>\n</html>\n"
+)
+
+def parse_mix(value):
+    if value in MIXES:
+        return dict(MIXES[value])
+    mix = {}
+    for part in value.split(","):
+        kind, _, weight = part.partition("=")
+        kind = kind.strip()
+        if kind not in MIXES["balanced"]:
+            raise argparse.ArgumentTypeError(f"unknown block kind '{kind}', expected one of {', '.join(MIXES['balanced'])}")
+        mix[kind] = float(weight)
+    return mix
+
+def words(rng, low, high):
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(low, high)))
+
+def inline_sentence(rng):
+    parts = [words(rng, 3, 8)]
+    for _ in range(rng.randint(0, 2)):
+        parts.append(rng.choice([f"**{words(rng, 1, 3)}**", f"_{words(rng, 1, 2)}_", f"`{rng.choice(WORDS)}()`"]))
+        parts.append(words(rng, 2, 6))
+    return " ".join(parts).capitalize() + "."
+
+def synthetic_block(rng, kind):
+    lines = rng.randint(2, 6)
+    if kind == "paragraph":
+        return "\n".join(inline_sentence(rng) for _ in range(lines))
+    if kind == "heading":
+        return "#" * rng.randint(2, 4) + " " + words(rng, 2, 6).title()
+    if kind == "list":
+        if rng.random() < 0.5:
+            return "\n".join(f"- {inline_sentence(rng)}" for _ in range(lines))
+        return "\n".join(f"{i + 1}. {inline_sentence(rng)}" for i in range(lines))
+    if kind == "links":
+        parts = []
+        for _ in range(lines * 2):
+            parts.append(words(rng, 2, 5))
+            if rng.random() < 0.7:
+                parts.append(f"[{words(rng, 1, 3)}](/{rng.choice(WORDS)}/{rng.choice(WORDS)}/)")
+            else:
+                parts.append(f"![{words(rng, 1, 3)}](/images/{rng.choice(WORDS)}.png)")
+        return " ".join(parts) + "."
+    if kind == "code":
+        body = "\n".join(f"    {rng.choice(WORDS)} = {rng.choice(WORDS)}({rng.randint(0, 99)})" for _ in range(lines * 8))
+        return f"```\n{body}\n```"
+    if kind == "quote":
+        return "\n".join(f"> {inline_sentence(rng)}" for _ in range(lines))
+    raise ValueError(f"Unknown block kind: {kind}")
+
+def synthetic_page(rng, blocks, mix):
+    kinds = list(mix)
+    weights = [mix[kind] for kind in kinds]
+    parts = [f"# {words(rng, 2, 5).title()}"]
+    for kind in rng.choices(kinds, weights=weights, k=blocks):
+        parts.append(synthetic_block(rng, kind))
+    return "\n\n".join(parts) + "\n"
+
+def synthetic_corpus(pages, blocks, mix, seed=0):
+    rng = random.Random(seed)
+    return [synthetic_page(rng, blocks, mix) for _ in range(pages)]
+
+def git_revision():
+    try:
+        result = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5,
+                                cwd=os.path.dirname(os.path.abspath(__file__)))
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return result.stdout.strip() or None
+
+def quiet_blocks(markdown):
+    return markdown_to_blocks(markdown, Diagnostics(Policy.COLLECT))
+
+def run_once(corpus, workdir):
+    """Time every stage once over the whole corpus, returning seconds per stage."""
+    timings = dict.fromkeys(STAGES, 0.0)
+    sources = []
+    for i, markdown in enumerate(corpus):
+        path = os.path.join(workdir, f"page{i}.md")
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(markdown)
+        sources.append(path)
+
+    start = time.perf_counter()
+    texts = []
+    for path in sources:
+        with open(path, 'r', encoding='utf-8') as f:
+            texts.append(f.read())
+    timings["read"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    pages = [quiet_blocks(markdown) for markdown in texts]
+    timings["markdown_to_blocks"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for blocks in pages:
+        for block in blocks:
+            block.determine_block_type()
+    timings["determine_block_type"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for blocks in pages:
+        for block in blocks:
+            block.block_text_to_text_nodes()
+    timings["block_text_to_text_nodes"] = time.perf_counter() - start
+
+    # parse_html mutates block content, so it gets freshly split blocks
+    pages = [quiet_blocks(markdown) for markdown in texts]
+    titles = [get_title(blocks) for blocks in pages]
+    start = time.perf_counter()
+    parsed = [[block.parse_html() for block in blocks] for blocks in pages]
+    timings["parse_html"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    bodies = ["\n".join(section_html(tag, payload) for tag, payload in sections) for sections in parsed]
+    timings["section_html"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    outputs = [TEMPLATE.render_to_string({"Title": title, "Content": body}) for title, body in zip(titles, bodies)]
+    timings["template_fill"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for path, html in zip(sources, outputs):
+        with open(path[:-3] + ".html", 'w', encoding='utf-8') as f:
+            f.write(html)
+    timings["write"] = time.perf_counter() - start
+
+    block_count = sum(len(blocks) for blocks in pages)
+    bytes_out = sum(len(html.encode('utf-8')) for html in outputs)
+    return timings, block_count, bytes_out
+
+def run_benchmark(pages=200, blocks=40, mix="balanced", repeat=3, seed=0):
+    mix_weights = parse_mix(mix) if isinstance(mix, str) else mix
+    corpus = synthetic_corpus(pages, blocks, mix_weights, seed)
+    bytes_in = sum(len(markdown.encode('utf-8')) for markdown in corpus)
+    best = None
+    workdir = tempfile.mkdtemp(prefix="ssg-bench-")
+    try:
+        for _ in range(repeat):
+            timings, block_count, bytes_out = run_once(corpus, workdir)
+            best = timings if best is None else {stage: min(best[stage], timings[stage]) for stage in STAGES}
+    finally:
+        shutil.rmtree(workdir)
+    total = sum(best.values())
+    return {
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {"pages": pages, "blocks_per_page": blocks, "mix": mix_weights, "repeat": repeat, "seed": seed},
+        "corpus": {"pages": pages, "blocks": block_count, "bytes_in": bytes_in, "bytes_out": bytes_out},
+        "stages": {
+            stage: {
+                "seconds": best[stage],
+                "ms_per_page": best[stage] * 1000 / pages,
+                "share": best[stage] / total if total else 0.0,
+            }
+            for stage in STAGES
+        },
+        "total_seconds": total,
+        "pages_per_second": pages / total if total else None,
+        "mb_per_second": bytes_in / total / 1e6 if total else None,
+    }
+
+def print_summary(result):
+    corpus = result["corpus"]
+    print(f"{corpus['pages']} pages, {corpus['blocks']} blocks, {corpus['bytes_in'] / 1e6:.2f} MB markdown, best of {result['config']['repeat']}")
+    for stage, timing in result["stages"].items():
+        print(f"  {stage:<26} {timing['seconds'] * 1000:9.2f} ms  {timing['share'] * 100:5.1f}%")
+    print(f"  {'total':<26} {result['total_seconds'] * 1000:9.2f} ms  ({result['pages_per_second']:.0f} pages/s, {result['mb_per_second']:.2f} MB/s)")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--blocks", type=int, default=40, help="blocks per page")
+    parser.add_argument("--mix", default="balanced", help=f"one of {', '.join(MIXES)} or weights like paragraph=0.5,code=0.5")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the JSON result to this file instead of stdout")
+    args = parser.parse_args()
+    try:
+        mix = parse_mix(args.mix)
+    except (argparse.ArgumentTypeError, ValueError) as e:
+        parser.error(str(e))
+
+    result = run_benchmark(args.pages, args.blocks, mix, args.repeat, args.seed)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2)
+        print_summary(result)
+        print(f"Results written to {args.output}")
+    else:
+        print(json.dumps(result, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,67 @@
 import re
 from enum import Enum
 from htmlnode import LeafNode, ImageNode, ParentNode
-from textnode import TextNode, TextType
-from split_nodes import split_node_at_delimiter, split_node_at_links, split_node_at_images
+from textnode import TextNode, TextType, HTML_EMITTERS, text_to_html, text_to_html_node
+from inline_parser import scan_inline
+from diagnostics import Diagnostics
+
+HEADING_PATTERN = re.compile(r"#{1,6} ")
+FENCE = "```"
+
+TEXT_TYPES = {text_type.value: text_type for text_type in TextType}
+
+def token_nodes(token_list, base_path=None):
+    return [text_to_html_node(token[0], TEXT_TYPES[token[1]], token[2] if len(token) > 2 else None, base_path) for token in token_list]
+
+def text_nodes(nodes, base_path=None):
+    return [node.to_html_node(base_path) for node in nodes]
+
+def build_block_node(tag, payload, leaves, base_path=None):
+    if tag == "pre":
+        return ParentNode.trusted(tag="pre", children=[LeafNode(tag="code", value=payload)])
+    if tag == "ul" or tag == "ol":
+        return ParentNode.trusted(tag=tag, children=[ParentNode.trusted(tag="li", children=leaves(row, base_path)) for row in payload])
+    return ParentNode.trusted(tag=tag, children=leaves(payload, base_path))
+
+def node_from_ast(ast, base_path=None):
+    """Build the HTMLNode for a block from the [tag, payload] pair made by BlockNode.to_ast."""
+    return build_block_node(ast[0], ast[1], token_nodes, base_path)
+
+def section_from_ast(ast, base_path=None):
+    return ParentNode.trusted(tag="div", children=[node_from_ast(ast, base_path)])
+
+def token_html(token_list, base_path=None):
+    return [text_to_html(token[0], TEXT_TYPES[token[1]], token[2] if len(token) > 2 else None, base_path) for token in token_list]
+
+def ast_html_payload(ast, base_path=None):
+    """(tag, payload) for section_html from the [tag, payload] pair made by BlockNode.to_ast."""
+    tag, payload = ast
+    if tag == "pre":
+        return tag, payload
+    if tag == "ul" or tag == "ol":
+        return tag, [token_html(row, base_path) for row in payload]
+    return tag, token_html(payload, base_path)
+
+def section_html(tag, payload):
+    """The HTML of a block section, the same as to_section().to_html() but without building the tree.
+
+    payload is laid out like the one from BlockNode.parse, with one HTML string
+    per inline token in place of each TextNode.
+    """
+    if not payload:
+        if tag == "pre":
+            raise ValueError("LeafNode must have a value.")
+        raise ValueError("ParentNode must have children.")
+    if tag == "pre":
+        return f"<div><pre><code>{payload}</code></pre></div>"
+    if tag == "ul" or tag == "ol":
+        items = []
+        for row in payload:
+            if not row:
+                raise ValueError("ParentNode must have children.")
+            items.append(f"<li>{''.join(row)}</li>")
+        return f"<div><{tag}>{''.join(items)}</{tag}></div>"
+    return f"<div><{tag}>{''.join(payload)}</{tag}></div>"
 
 class BlockType(Enum):
     PARAGRAPH = "PARAGRAPH"
@@ -12,39 +71,28 @@ class BlockType(Enum):
     UNORDERED_LIST = "UNORDERED_LIST"
     ORDERED_LIST = "ORDERED_LIST"
 
+def suspicious_paragraph_line(line):
+    if line.startswith("#"):
+        return ("paragraph-heading", "appears to contain a heading. Headings should consist of a single line starting with one or more '#' characters followed by a space, separated from surrounding blocks by blank lines.")
+    if "```" in line:
+        return ("paragraph-code-fence", "appears to contain a code block. Block code uses three backticks (```) and must be separated on either side by a blank line; inline code uses a single backtick.")
+    if line.startswith("> "):
+        return ("paragraph-quote", "appears to contain a quote. Block quotes should start with '> ' on every line and be separated on either side by a blank line.")
+    if line.startswith("- ") or re.match(r"^\d+\. ", line):
+        return ("paragraph-list", "appears to contain a list. Lists should start every line with '- ' or '1. ', '2. ', etc. and be separated on either side by a blank line.")
+    return None
+
 class BlockNode:
-    def __init__(self, content, start_line):
+    def __init__(self, content, start_line, diagnostics=None, block_type=None):
         self.content = content
         self.start_line = start_line
-        self.block_type = self.determine_block_type()
+        self.diagnostics = diagnostics if diagnostics is not None else Diagnostics()
+        # iter_blocks already knows the type from its scan, so only classify when it isn't given
+        self.block_type = block_type if block_type is not None else self.determine_block_type()
 
     def determine_block_type(self):
-        if re.match(r"#{1,6} ", self.content) and len(self.content.split("\n")) == 1:
-            return BlockType.HEADING
-        elif re.match(r"^```$.*^```$", self.content, re.DOTALL | re.MULTILINE):
-            return BlockType.CODE
-        else:
-            could_be_quote = True
-            could_be_unordered_list = True
-            could_be_ordered_list = True
-            newline = 0
-            for line in self.content.split("\n"):
-                newline += 1
-                if not re.match(r"> ", line):
-                    could_be_quote = False
-                if not re.match(r"- ", line):
-                    could_be_unordered_list = False
-                if not line.startswith(str(newline) + ". "):
-                    could_be_ordered_list = False
-            if could_be_quote:
-                return BlockType.QUOTE
-            elif could_be_unordered_list:
-                return BlockType.UNORDERED_LIST
-            elif could_be_ordered_list:
-                return BlockType.ORDERED_LIST
-            else:
-                return BlockType.PARAGRAPH
-            
+        return block_type_of(self.content)
+
     def __eq__(self, other):
         if not isinstance(other, BlockNode):
             return False
@@ -56,107 +104,186 @@ class BlockNode:
         return f"BlockNode(content={self.content}, start_line={self.start_line}, block_type={self.block_type.value})"
             
     def block_text_to_text_nodes(self, text=None):
+        nodes = []
+        append = nodes.append
+        self.scan_text(text, lambda text_type, value, url: append(TextNode(value, text_type, url)))
+        return nodes
+
+    def block_text_to_tokens(self, text=None):
+        """Like block_text_to_text_nodes, as the [text, type] or [text, type, url] lists of to_ast."""
+        token_list = []
+        append = token_list.append
+        self.scan_text(text, lambda text_type, value, url: append([value, text_type.value, url] if url else [value, text_type.value]))
+        return token_list
+
+    def block_text_to_html(self, text=None, base_path=None):
+        """Like block_text_to_text_nodes, as one HTML string per token, see section_html."""
+        parts = []
+        append = parts.append
+        emitters = HTML_EMITTERS
+        self.scan_text(text, lambda text_type, value, url: append(emitters[text_type](value, url, base_path)))
+        return parts
+
+    def scan_text(self, text, emit):
         if text is None:
             text = self.content
-        nodes = [TextNode(text, TextType.PLAIN)]
         start_line = self.start_line
         end_line = start_line + self.content.count('\n')
-        if "**" in self.content:
-            try:
-                nodes = split_node_at_delimiter(nodes, "**", TextType.BOLD)
-            except ValueError as e:
-                print(f"Error processing bold text in lines {start_line}-{end_line}: {e}")
-                if input("Continue? (y/n): ").lower() != 'y':
-                    raise ValueError(f"Error processing bold text: {e}")
-                else:
-                    print("Continuing without bold text processing.")
-        if "_" in self.content:
-            try:
-                nodes = split_node_at_delimiter(nodes, "_", TextType.ITALIC)
-            except ValueError as e:
-                print(f"Error processing italic text in lines {start_line}-{end_line}: {e}")
-                if input("Continue? (y/n): ").lower() != 'y':
-                    raise ValueError(f"Error processing italic text: {e}")
-                else:
-                    print("Continuing without italic text processing.")
-        if "`" in self.content:
-            try:
-                nodes = split_node_at_delimiter(nodes, "`", TextType.CODE)
-            except ValueError as e:
-                print(f"Error processing code text in lines {start_line}-{end_line}: {e}")
-                if input("Continue? (y/n): ").lower() != 'y':
-                    raise ValueError(f"Error processing inline code text: {e}")
-                else:
-                    print("Continuing without inline code text processing.")
-        if "](" in self.content:
-            print(f"Processing images and links in lines: {start_line}-{end_line}, please confirm syntax if output is unexpected.")
-            print("See README.md for more information on supported markdown syntax.")
-            nodes = split_node_at_images(nodes)
-            nodes = split_node_at_links(nodes)
-        return nodes
+        scan_inline(text, emit, lambda rule_id, message: self.diagnostics.warn(rule_id, start_line, end_line, message))
+
+    def to_ast(self):
+        """Tokenize the block into a JSON-ready [tag, payload] pair, see node_from_ast.
+
+        The payload is the code text for "pre", one token list per item for
+        "ul" and "ol", and a single token list otherwise. Diagnostics are
+        raised here, so a cached AST renders without touching the parser.
+        """
+        return list(self.parse(self.block_text_to_tokens))
+
+    def parse(self, inline=None):
+        """Return (tag, payload) like to_ast, with TextNode lists instead of tokens.
 
-    def to_parent_node(self):
+        inline(text=None) turns the block's inline text into the payload's lists,
+        block_text_to_text_nodes unless given.
+        """
+        if inline is None:
+            inline = self.block_text_to_text_nodes
         if self.block_type == BlockType.PARAGRAPH:
             current_line = self.start_line - 1
             for line in self.content.split("\n"):
                 current_line += 1
-                if line.startswith("#"):
-                    print(f"Warning:\nblock:\n {self.content} \nstarting at line: {self.start_line} was detected as a paragraph but appears to contain a heading at line {current_line}. This may be a syntax error.")
-                    print(f" If this is a heading please add a blank line before and after it to separate it from the surrounding blocks. Otherwise type 'y' to continue processing as a paragraph.")
-                    print("Reminder: Headings should consist of a single line starting with one or more '#' characters followed by a space.")
-                    if input("Continue? (y/n): ").lower() != 'y':
-                        raise ValueError(f"Syntax Error Confirmed in block starting at line {self.start_line}. Please confirm supported markdown syntax in README.md.")
-                    else:
-                        print("Continuing processing as a paragraph. No other syntax errors will be checked in this block.")
-                        break
-                if "```" in line:
-                    print(f"Warning:\nblock:\n {self.content} \nstarting at line: {self.start_line} was detected as a paragraph but appears to contain a code block starting at line: {current_line}. This may be a syntax error.")
-                    print(f" If this is a code block please review README.md for supported syntax. Otherwise type 'y' to continue processing as a paragraph.")
-                    print(f"Reminder: Inline code is supported in paragraphs with a single backtick (`) on either side of the code. Block code is supported with three backticks (```), but must be separated on either side by a blank line.")
-                    if input("Continue? (y/n): ").lower() != 'y':
-                        raise ValueError(f"Syntax Error Confirmed in block starting at line {self.start_line}. Please confirm supported markdown syntax in README.md.")
-                    else:
-                        print("Continuing processing as a paragraph. No other syntax errors will be checked in this block.")
-                        break
-                if line.startswith("> "):
-                    print(f"Warning:\nblock:\n {self.content} \nstarting at line: {self.start_line} was detected as a paragraph but appears to contain a quote starting at line: {current_line}. This may be a syntax error.")
-                    print(f" If this is a quote please review README.md for supported syntax. Otherwise type 'y' to continue processing as a paragraph.")
-                    print("Reminder: Block quotes should start with '> ' at the beginning of each line and should be separated on either side by a blank line.")
-                    if input("Continue? (y/n): ").lower() != 'y':
-                        raise ValueError(f"Syntax Error Confirmed in block starting at line {self.start_line}. Please confirm supported markdown syntax in README.md.")
-                    else:
-                        print("Continuing processing as a paragraph. No other syntax errors will be checked in this block.")
-                        break
-                if line.startswith("- ") or re.match(r"^\d+\. ", line):
-                    print(f"Warning:\nblock:\n {self.content} \nstarting at line: {self.start_line} was detected as a paragraph but appears to contain a list starting at line: {current_line}. This may be a syntax error.")
-                    print(f" If this is a list please review README.md to confirm supported syntax. Otherwise type 'y' to continue processing as a paragraph.")
-                    print("Reminder: Unordered lists should start with '- ' at the beginning of each line and ordered lists should start with '1. ', '2. ', etc. at the beginning of each line, and should be separated on either side by a blank line.")
-                    if input("Continue? (y/n): ").lower() != 'y':
-                        raise ValueError(f"Syntax Error Confirmed in block starting at line {self.start_line}. Please confirm supported markdown syntax in README.md.")
-                    else:
-                        print("Continuing processing as a paragraph. No other syntax errors will be checked in this block.")
-                        break
-            return ParentNode(tag="p", children=[node.to_html_node() for node in self.block_text_to_text_nodes()])
+                suspect = suspicious_paragraph_line(line)
+                if suspect is not None:
+                    rule_id, message = suspect
+                    # like the old interactive prompt, only the first suspicious line of a block is reported
+                    self.diagnostics.warn(rule_id, current_line, current_line, f"Block starting at line {self.start_line} was detected as a paragraph but {message}")
+                    break
+            return "p", inline()
         elif self.block_type == BlockType.HEADING:
             level = re.match(r"#{1,6}", self.content).group(0)
             self.content = self.content.lstrip("#")
             self.content = self.content.lstrip(" ")
-            return ParentNode(tag=f"h{len(level)}", children=[node.to_html_node() for node in self.block_text_to_text_nodes()])
+            return f"h{len(level)}", inline()
         elif self.block_type == BlockType.CODE:
-            self.content = self.content.lstrip("```\n")
-            self.content = self.content.rstrip("\n```")
-            return ParentNode(tag="pre", children=[LeafNode(tag="code", value=self.content)])
+            # drop the fence lines themselves, blank lines and backticks inside the fences are code
+            lines = self.content.split("\n")[1:]
+            if lines and lines[-1].strip() == FENCE:
+                lines.pop()
+            self.content = "\n".join(lines)
+            return "pre", self.content
         elif self.block_type == BlockType.QUOTE:
             self.content = "\n".join(line.lstrip("> ") for line in self.content.split("\n"))
-            return ParentNode(tag="blockquote", children=[node.to_html_node() for node in self.block_text_to_text_nodes()])
+            return "blockquote", inline()
         elif self.block_type == BlockType.UNORDERED_LIST:
             self.content = "\n".join(line.lstrip("- ") for line in self.content.split("\n"))
-            return ParentNode(tag="ul", children=[ParentNode(tag="li", children=[node.to_html_node() for node in self.block_text_to_text_nodes(line)]) for line in self.content.split("\n")])
+            return "ul", [inline(line) for line in self.content.split("\n")]
         elif self.block_type == BlockType.ORDERED_LIST:
             self.content = "\n".join(line.lstrip(f"{i+1}. ") for i, line in enumerate(self.content.split("\n")))
-            return ParentNode(tag="ol", children=[ParentNode(tag="li", children=[node.to_html_node() for node in self.block_text_to_text_nodes(line)]) for line in self.content.split("\n")])
+            return "ol", [inline(line) for line in self.content.split("\n")]
         else:
             raise ValueError(f"Unsupported BlockType: {self.block_type}")
-        
-    def to_section(self):
-        return ParentNode(tag="div", children=[self.to_parent_node()])
\ No newline at end of file
+
+    def to_parent_node(self, base_path=None):
+        tag, payload = self.parse()
+        return build_block_node(tag, payload, text_nodes, base_path)
+
+    def to_section(self, base_path=None):
+        return ParentNode.trusted(tag="div", children=[self.to_parent_node(base_path)])
+
+    def parse_html(self, base_path=None):
+        """Return (tag, payload) like parse, with HTML strings instead of TextNodes, see section_html."""
+        return self.parse(lambda text=None: self.block_text_to_html(text, base_path))
+
+    def to_html(self, base_path=None):
+        """The same HTML as to_section(base_path).to_html(), emitted straight from the tokens."""
+        return section_html(*self.parse_html(base_path))
+
+def block_type_of(content):
+    """The BlockType of a block's content, already stripped at both ends."""
+    # Every non-paragraph type is decided by its first line, so the first character
+    # picks the only type worth checking and everything else is a paragraph straight away.
+    first = content[:1]
+    if first == "#":
+        if HEADING_PATTERN.match(content) and "\n" not in content:
+            return BlockType.HEADING
+    elif first == "`":
+        lines = content.split("\n")
+        if lines[0] == FENCE and FENCE in lines[1:]:
+            return BlockType.CODE
+    elif first == ">":
+        if all(line.startswith("> ") for line in content.split("\n")):
+            return BlockType.QUOTE
+    elif first == "-":
+        if all(line.startswith("- ") for line in content.split("\n")):
+            return BlockType.UNORDERED_LIST
+    elif first == "1":
+        number = 0
+        for line in content.split("\n"):
+            number += 1
+            if not line.startswith(f"{number}. "):
+                return BlockType.PARAGRAPH
+        return BlockType.ORDERED_LIST
+    return BlockType.PARAGRAPH
+
+
+def make_block(text, start_line, diagnostics=None, block_type=None):
+    """Build the BlockNode for a run of lines joined into text, classifying it unless block_type is known."""
+    content = text.strip()
+    return BlockNode(content, start_line, diagnostics, block_type or block_type_of(content))
+
+
+def split_on_blank_lines(lines, start_line, diagnostics=None):
+    """Yield a BlockNode for every run of non-blank lines in lines, the first numbered start_line."""
+    block_lines = []
+    block_start = start_line
+    for line_number, line in enumerate(lines, start_line):
+        if line.strip() == "":
+            if block_lines:
+                yield make_block("\n".join(block_lines), block_start, diagnostics)
+                block_lines = []
+            continue
+        if not block_lines:
+            block_start = line_number
+        block_lines.append(line)
+    if block_lines:
+        yield make_block("\n".join(block_lines), block_start, diagnostics)
+
+
+def iter_blocks(lines, diagnostics=None, skip_lines=0):
+    """Yield a BlockNode for every block, reading lines as it goes.
+
+    Blocks are runs of non-blank lines, except that a ``` fence opening a block runs to
+    its closing ``` line, blank lines and all. A fence that is never closed is split on
+    blank lines like any other text. lines can be an open text file, so only the current
+    block is ever held in memory. The first skip_lines lines (front matter) are treated
+    as blank so line numbers stay true.
+    """
+    block_lines = []
+    block_start = 1
+    in_fence = False
+    for line_number, line in enumerate(lines, 1):
+        if line.endswith("\n"):
+            line = line[:-1]
+        if line_number <= skip_lines:
+            line = ""
+        if in_fence:
+            block_lines.append(line)
+            if line.strip() == FENCE:
+                yield make_block("\n".join(block_lines), block_start, diagnostics, BlockType.CODE)
+                block_lines = []
+                in_fence = False
+            continue
+        # gather lines until you hit a blank
+        if line.strip() == "":
+            if block_lines:
+                yield make_block("\n".join(block_lines), block_start, diagnostics)
+                block_lines = []
+            continue
+        if not block_lines:
+            block_start = line_number
+            in_fence = line.strip() == FENCE
+        block_lines.append(line)
+    if in_fence:
+        yield from split_on_blank_lines(block_lines, block_start, diagnostics)
+    elif block_lines:
+        yield make_block("\n".join(block_lines), block_start, diagnostics)
@@ -0,0 +1,124 @@
+import mmap
+import re
+from blocknode import BlockType, make_block
+
+TEXT = "text"
+BYTES = "bytes"
+SCANNERS = (TEXT, BYTES)
+
+# UTF-8 for every character str.strip() removes, except the newline that ends a line
+WHITESPACE = (rb"(?:[\t\x0b\x0c\r\x1c-\x1f ]|\xc2[\x85\xa0]|\xe1\x9a\x80"
+              rb"|\xe2\x80[\x80-\x8a\xa8\xa9\xaf]|\xe2\x81\x9f|\xe3\x80\x80)")
+ASCII_WHITESPACE = b"\t\x0b\x0c\r\x1c\x1d\x1e\x1f "
+# first bytes of the multi-byte characters in WHITESPACE
+WIDE_WHITESPACE_LEADS = b"\xc2\xe1\xe2\xe3"
+BACKTICK = ord("`")
+BLANK_LINES = re.compile(rb"(?:[\t\x0b\x0c\r\x1c-\x1f ]*\n)*")
+# A line that might be blank: ASCII whitespace and any byte of a multi-byte character. A
+# plain byte class is much cheaper for re than the exact WHITESPACE alternation, and the
+# few candidates with multi-byte characters are checked exactly by is_blank.
+BLANK_CANDIDATE = re.compile(rb"\n[\t\x0b\x0c\r\x1c-\x1f \x80-\xbf\xc2\xe1\xe2\xe3]*\n")
+FENCE_OPEN = re.compile(WHITESPACE + rb"*```" + WHITESPACE + rb"*(?=\n|\Z)")
+FENCE_CLOSE = re.compile(rb"\n" + WHITESPACE + rb"*```" + WHITESPACE + rb"*(?=\n|\Z)")
+
+_scanner = TEXT
+
+def configure_scanner(name):
+    """Select how page sources are split into blocks: TEXT reads them line by line, BYTES scans raw bytes."""
+    global _scanner
+    if name not in SCANNERS:
+        raise ValueError(f"Unknown scanner '{name}', expected one of {', '.join(SCANNERS)}.")
+    _scanner = name
+    return _scanner
+
+def get_scanner():
+    return _scanner
+
+def is_blank(line):
+    """Whether the bytes of one line are all whitespace, as line.strip() == "" would say."""
+    return not line.decode("utf-8").strip()
+
+def block_end(data, start):
+    """Where the block starting at start ends: the newline before its first blank line, or the end of data."""
+    pos = start
+    while True:
+        candidate = BLANK_CANDIDATE.search(data, pos)
+        if candidate is None:
+            # a last line of whitespace without a newline is stripped from the block anyway
+            return len(data)
+        line = data[candidate.start() + 1:candidate.end() - 1]
+        if line.isascii() or is_blank(line):
+            return candidate.start()
+        pos = candidate.end() - 1
+
+def iter_bytes_blocks(data, diagnostics=None, skip_lines=0):
+    """Yield the same BlockNodes as iter_blocks over the lines of UTF-8 data.
+
+    data can be bytes or an mmap. Blank lines and fences are found by regex
+    searches over the raw bytes, so Python only does work per block, never per
+    line; each block is decoded on its own and classified by make_block.
+    """
+    if data.find(b"\r") != -1:
+        # text mode reads \r\n and lone \r as \n, so match it (this copies the data)
+        data = data[:].replace(b"\r\n", b"\n").replace(b"\r", b"\n")
+    size = len(data)
+    pos = 0
+    for _ in range(skip_lines):
+        pos = data.find(b"\n", pos) + 1
+        if pos == 0:
+            return
+    # pos is always the start of a line, and line_number its number
+    line_number = skip_lines + 1
+    skip_blank_lines = BLANK_LINES.match
+    find_candidate = BLANK_CANDIDATE.search
+    while True:
+        start = skip_blank_lines(data, pos).end()
+        if start >= size:
+            return
+        line_number += data[pos:start].count(b"\n")
+        first = data[start]
+        leading_space = first in ASCII_WHITESPACE or first in WIDE_WHITESPACE_LEADS
+        if leading_space:
+            # still blank if it is the last line and has no newline, or holds wide whitespace
+            line_end = data.find(b"\n", start)
+            if line_end == -1:
+                line_end = size
+            if is_blank(data[start:line_end]):
+                line_number += 1
+                pos = line_end + 1
+                continue
+        block_type = None
+        closer = None
+        if first == BACKTICK or leading_space:
+            opener = FENCE_OPEN.match(data, start)
+            if opener is not None:
+                closer = FENCE_CLOSE.search(data, opener.end())
+        if closer is not None:
+            end = closer.end()
+            block_type = BlockType.CODE
+        else:
+            # a fence that is never closed is split on blank lines like any other text
+            candidate = find_candidate(data, start)
+            if candidate is None:
+                end = size
+            elif data[candidate.start() + 1:candidate.end() - 1].isascii():
+                end = candidate.start()
+            else:
+                end = block_end(data, start)
+        text = data[start:end].decode("utf-8")
+        yield make_block(text, line_number, diagnostics, block_type)
+        line_number += text.count("\n") + 1
+        pos = end + 1
+
+def iter_file_blocks(path, diagnostics=None, skip_lines=0):
+    """iter_bytes_blocks over the file at path, memory-mapped so it is never read into memory whole."""
+    with open(path, "rb") as source:
+        try:
+            data = mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # empty files can't be mapped
+            return
+        try:
+            yield from iter_bytes_blocks(data, diagnostics, skip_lines)
+        finally:
+            data.close()
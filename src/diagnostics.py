@@ -0,0 +1,71 @@
+from enum import Enum
+
+class Policy(Enum):
+    STRICT = "strict"
+    LENIENT = "lenient"
+    COLLECT = "collect"
+
+class MarkdownSyntaxError(ValueError):
+    pass
+
+class Diagnostic:
+    def __init__(self, source, start_line, end_line, rule_id, message):
+        self.source = source
+        self.start_line = start_line
+        self.end_line = end_line
+        self.rule_id = rule_id
+        self.message = message
+
+    def __eq__(self, other):
+        if not isinstance(other, Diagnostic):
+            return False
+        return (self.source == other.source and
+                self.start_line == other.start_line and
+                self.end_line == other.end_line and
+                self.rule_id == other.rule_id and
+                self.message == other.message)
+
+    def __repr__(self):
+        return f"Diagnostic({self.source}, {self.start_line}-{self.end_line}, {self.rule_id}, {self.message})"
+
+    def __str__(self):
+        location = self.source if self.source else "<markdown>"
+        if self.start_line == self.end_line:
+            return f"{location}:{self.start_line}: [{self.rule_id}] {self.message}"
+        return f"{location}:{self.start_line}-{self.end_line}: [{self.rule_id}] {self.message}"
+
+class Diagnostics:
+    """Collects syntax warnings for one page or a whole build.
+
+    strict raises MarkdownSyntaxError on the first warning, lenient prints each
+    warning as it happens and carries on, collect carries on silently and leaves
+    the warnings for report() at the end of the build.
+    """
+    def __init__(self, policy=Policy.LENIENT, source=None):
+        self.policy = policy
+        self.source = source
+        self.warnings = []
+
+    def for_source(self, source):
+        return Diagnostics(self.policy, source)
+
+    def warn(self, rule_id, start_line, end_line, message):
+        diagnostic = Diagnostic(self.source, start_line, end_line, rule_id, message)
+        if self.policy == Policy.STRICT:
+            raise MarkdownSyntaxError(str(diagnostic))
+        if self.policy == Policy.LENIENT:
+            print(f"Warning: {diagnostic}")
+        self.warnings.append(diagnostic)
+
+    def extend(self, warnings):
+        self.warnings.extend(warnings)
+
+    def report(self):
+        if not self.warnings:
+            return
+        if self.policy == Policy.COLLECT:
+            print(f"Diagnostics report: {len(self.warnings)} warning(s)")
+            for diagnostic in sorted(self.warnings, key=lambda d: (d.source or "", d.start_line, d.rule_id)):
+                print(f"  {diagnostic}")
+        else:
+            print(f"Build finished with {len(self.warnings)} warning(s).")
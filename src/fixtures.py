@@ -0,0 +1,41 @@
+import os
+import shutil
+import tempfile
+import unittest
+import manifest
+
+TEMPLATE = "<title>{{ Title }}</title><main>{{ Content }}</main>"
+
+class SiteTestCase(unittest.TestCase):
+    """A throwaway site under self.tmp: static/ sources in self.src, public/ output in self.dst, and self.template.
+
+    manifest.CACHE_DIR points into self.tmp for the duration of each test, so
+    manifests, site indexes and listing state never land in the working directory.
+    """
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.old_cache_dir = manifest.CACHE_DIR
+        manifest.CACHE_DIR = os.path.join(self.tmp, ".cache")
+        self.src = os.path.join(self.tmp, "static")
+        self.dst = os.path.join(self.tmp, "public")
+        self.template = os.path.join(self.tmp, "template.html")
+        self.write(self.template, TEMPLATE)
+
+    def tearDown(self):
+        manifest.CACHE_DIR = self.old_cache_dir
+        shutil.rmtree(self.tmp)
+
+    def write(self, path, text):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+
+    def read(self, path):
+        with open(path, 'r', encoding='utf-8') as f:
+            return f.read()
+
+    def write_small_site(self):
+        """A home page, one blog post and a stylesheet."""
+        self.write(os.path.join(self.src, "index.md"), "# Home\n\nWelcome.")
+        self.write(os.path.join(self.src, "blog", "post.md"), "# Post\n\nHello.")
+        self.write(os.path.join(self.src, "index.css"), "body {}")
@@ -0,0 +1,71 @@
+import re
+from diagnostics import Diagnostics
+
+# opening fence -> key/value separator: YAML-ish "---" blocks use "key: value", TOML-ish "+++" blocks "key = value"
+FENCES = {"---": ":", "+++": "="}
+KEY_PATTERN = re.compile(r"[A-Za-z_][A-Za-z0-9_-]*$")
+
+def parse_value(text):
+    text = text.strip()
+    if len(text) >= 2 and text[0] == text[-1] and text[0] in "\"'":
+        return text[1:-1]
+    if text.startswith("[") and text.endswith("]"):
+        inner = text[1:-1].strip()
+        return [parse_value(item) for item in inner.split(",")] if inner else []
+    if text in ("true", "false"):
+        return text == "true"
+    return text
+
+def parse_fields(lines, separator, diagnostics=None, first_line=2):
+    """Parse front matter lines into a dict, warning on lines that are not key/value pairs.
+
+    Only the flat subset used for page metadata is understood: strings, quoted
+    strings, true/false, [a, b] lists and, in the YAML form, "- item" lists
+    under an empty key.
+    """
+    if diagnostics is None:
+        diagnostics = Diagnostics()
+    fields = {}
+    list_key = None
+    for line_number, line in enumerate(lines, first_line):
+        stripped = line.strip()
+        if not stripped or stripped.startswith("#"):
+            continue
+        if separator == ":" and list_key is not None and stripped.startswith("- "):
+            fields[list_key].append(parse_value(stripped[2:]))
+            continue
+        key, found, value = stripped.partition(separator)
+        key = key.strip()
+        if not found or not KEY_PATTERN.match(key):
+            diagnostics.warn("front-matter-syntax", line_number, line_number, f"Front matter line '{stripped}' is not a '{key or 'key'}{separator} value' pair and was ignored.")
+            list_key = None
+            continue
+        if separator == ":" and not value.strip():
+            fields[key] = []
+            list_key = key
+            continue
+        fields[key] = parse_value(value)
+        list_key = None
+    return fields
+
+def read_front_matter(lines, diagnostics=None):
+    """Read front matter from the top of lines, returning (fields, line_count).
+
+    line_count covers both fences, so the body starts after it; it is 0 when
+    there is no front matter or the block is never closed.
+    """
+    iterator = iter(lines)
+    first = next(iterator, None)
+    fence = first.rstrip("\n").rstrip() if first is not None else None
+    if fence not in FENCES:
+        return {}, 0
+    body = []
+    for line in iterator:
+        line = line.rstrip("\n")
+        if line.rstrip() == fence:
+            return parse_fields(body, FENCES[fence], diagnostics), len(body) + 2
+        body.append(line)
+    if diagnostics is None:
+        diagnostics = Diagnostics()
+    diagnostics.warn("front-matter-unclosed", 1, 1, f"Front matter opened with '{fence}' is never closed, it is treated as part of the page.")
+    return {}, 0
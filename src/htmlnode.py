@@ -1,14 +1,56 @@
+class _EmptyChildren(list):
+    # a list so it still compares equal to [], but one that can never be filled in
+    __slots__ = ()
+
+    def _immutable(self, *args, **kwargs):
+        raise TypeError("The shared empty children list cannot be modified, assign a new list instead.")
+
+    append = extend = insert = remove = pop = clear = sort = reverse = _immutable
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _immutable
+
+    def __reduce__(self):
+        # pickle and copy by name, so copies of a node share the same empty list again
+        return "EMPTY_CHILDREN"
+
+class _EmptyProps(dict):
+    # a dict so it still compares equal to {}, but one that can never be filled in
+    __slots__ = ()
+
+    def _immutable(self, *args, **kwargs):
+        raise TypeError("The shared empty props cannot be modified, assign a new dict instead.")
+
+    update = setdefault = pop = popitem = clear = _immutable
+    __setitem__ = __delitem__ = __ior__ = _immutable
+
+    def __reduce__(self):
+        return "EMPTY_PROPS"
+
+# Shared by every node without children or props, so leaves don't allocate an empty list and dict each.
+EMPTY_CHILDREN = _EmptyChildren()
+EMPTY_PROPS = _EmptyProps()
+
+def rebase_url(url, base_path):
+    # only root-relative urls move under the base path, absolute and protocol-relative ones are left alone
+    if base_path and url.startswith("/") and not url.startswith("//"):
+        return base_path + url[1:]
+    return url
+
 class HTMLNode:
+    __slots__ = ("tag", "value", "children", "props")
+
     def __init__(self, tag=None, value=None, children=None, props=None):
         self.tag = tag
         self.value = value
-        self.children = children if children is not None else []
-        self.props = props if props is not None else {}
+        self.children = children if children is not None else EMPTY_CHILDREN
+        self.props = props if props is not None else EMPTY_PROPS
         if not value and not children and not props:
             raise ValueError("HTMLNode must have either a value, children or attributes.")
         
     def to_html(self):
         raise NotImplementedError("Subclasses should implement this method.")
+
+    def write_html(self, stream):
+        stream.write(self.to_html())
     
     def props_to_html(self):
         if not self.props:
@@ -40,6 +82,8 @@ class HTMLNode:
                 self.props == other.props)
     
 class LeafNode(HTMLNode):
+    __slots__ = ()
+
     def __init__(self, tag, value, props=None):
         super().__init__(tag=tag, value=value, props=props)
         if not value:
@@ -54,6 +98,8 @@ class LeafNode(HTMLNode):
         return f"<{self.tag}{props_html}>{self.value}</{self.tag}>"
     
 class ImageNode(HTMLNode):
+    __slots__ = ()
+
     def __init__(self, tag, props):
         super().__init__(tag=tag, props=props)
         if not self.tag:
@@ -78,6 +124,8 @@ class ImageNode(HTMLNode):
         return f"<{self.tag}{props_html} />"
     
 class ParentNode(HTMLNode):
+    __slots__ = ()
+
     def __init__(self, tag, children, props=None):
         super().__init__(tag=tag, value=None, children=children, props=props)
         if not tag:
@@ -94,4 +142,75 @@ class ParentNode(HTMLNode):
         if not self.children:
             raise ValueError("ParentNode must have children to convert to HTML.")
         return f"<{self.tag}{self.props_to_html()}>" + "".join(child.to_html() for child in self.children) + f"</{self.tag}>"
+
+    def write_html(self, stream):
+        # same output as to_html, but written piece by piece so no level of the tree is joined into a string
+        if not self.tag:
+            raise ValueError("ParentNode must have a tag to convert to HTML.")
+        if not self.children:
+            raise ValueError("ParentNode must have children to convert to HTML.")
+        stream.write(f"<{self.tag}{self.props_to_html()}>")
+        for child in self.children:
+            child.write_html(stream)
+        stream.write(f"</{self.tag}>")
     
+
+# Trusted nodes are for trees the pipeline generates itself. They skip the checks in
+# __init__ and to_html that can't fail for those trees and otherwise behave exactly
+# like the validated classes. Build them through LeafNode.trusted, ImageNode.trusted
+# and ParentNode.trusted, which take the same arguments as the normal constructors.
+
+class _TrustedLeafNode(LeafNode):
+    __slots__ = ()
+
+    def __init__(self, tag, value, props=None):
+        # caller has already checked value is non-empty
+        self.tag = tag
+        self.value = value
+        self.children = EMPTY_CHILDREN
+        self.props = props if props is not None else EMPTY_PROPS
+
+    def to_html(self):
+        if not self.tag:
+            return self.value
+        if self.props:
+            return f"<{self.tag}{self.props_to_html()}>{self.value}</{self.tag}>"
+        return f"<{self.tag}>{self.value}</{self.tag}>"
+
+class _TrustedImageNode(ImageNode):
+    __slots__ = ()
+
+    def __init__(self, tag, props):
+        # caller has already checked src is a non-empty string
+        self.tag = tag
+        self.value = None
+        self.children = EMPTY_CHILDREN
+        self.props = props
+
+    def to_html(self):
+        return f"<{self.tag}{self.props_to_html()} />"
+
+class _TrustedParentNode(ParentNode):
+    __slots__ = ()
+
+    def __init__(self, tag, children, props=None):
+        # tag and child types are taken on trust, an empty children list still depends on the markdown
+        if not children:
+            raise ValueError("ParentNode must have children.")
+        self.tag = tag
+        self.value = None
+        self.children = children
+        self.props = props if props is not None else EMPTY_PROPS
+
+    def to_html(self):
+        return f"<{self.tag}{self.props_to_html()}>" + "".join(child.to_html() for child in self.children) + f"</{self.tag}>"
+
+    def write_html(self, stream):
+        stream.write(f"<{self.tag}{self.props_to_html()}>")
+        for child in self.children:
+            child.write_html(stream)
+        stream.write(f"</{self.tag}>")
+
+LeafNode.trusted = staticmethod(_TrustedLeafNode)
+ImageNode.trusted = staticmethod(_TrustedImageNode)
+ParentNode.trusted = staticmethod(_TrustedParentNode)
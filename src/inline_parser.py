@@ -0,0 +1,74 @@
+import re
+from textnode import TextNode, TextType
+from link_scanner import LinkScanner
+
+# Everything that can start an inline token. Bold is checked before the other
+# alternatives so `**` is never read as two literal asterisks.
+INLINE_START_PATTERN = re.compile(r"\*\*|!\[|[_`\[]")
+
+DELIMITERS = {
+    "**": (TextType.BOLD, "unbalanced-bold", "bold"),
+    "_": (TextType.ITALIC, "unbalanced-italic", "italic"),
+    "`": (TextType.CODE, "unbalanced-code", "inline code"),
+}
+
+def scan_inline(text, emit, warn=None):
+    """Walk text once, calling emit(text_type, value, url) for every token in order.
+
+    Produces the same tokens as the old bold, italic, code, image and link
+    split passes for well-formed markdown. An opening delimiter without a
+    matching close is kept as plain text and reported through warn(rule_id, message).
+    """
+    length = len(text)
+    plain_start = 0
+    pos = 0
+    # delimiters known to have no further occurrence, so unclosed openers stay O(1)
+    exhausted = set()
+    links = None
+    while pos < length:
+        match = INLINE_START_PATTERN.search(text, pos)
+        if match is None:
+            break
+        start = match.start()
+        marker = match.group()
+        if marker in DELIMITERS:
+            inner_start = start + len(marker)
+            close = -1 if marker in exhausted else text.find(marker, inner_start)
+            if close == -1:
+                if marker not in exhausted:
+                    exhausted.add(marker)
+                    if warn is not None:
+                        text_type, rule_id, name = DELIMITERS[marker]
+                        warn(rule_id, f"Did not find a closing {marker} for {name} text in {text}. Markdown syntax requires opening and closing delimiters to be in pairs.")
+                pos = inner_start
+                continue
+            if start > plain_start:
+                emit(TextType.PLAIN, text[plain_start:start], None)
+            if close > inner_start:
+                emit(DELIMITERS[marker][0], text[inner_start:close], None)
+            pos = plain_start = close + len(marker)
+            continue
+        if links is None:
+            links = LinkScanner(text)
+        if marker == "![":
+            token = links.match_image(start)
+            text_type = TextType.IMAGE
+        else:
+            token = links.match_link(start)
+            text_type = TextType.LINK
+        if token is None:
+            pos = start + 1
+            continue
+        if start > plain_start:
+            emit(TextType.PLAIN, text[plain_start:start], None)
+        value, url, end = token
+        emit(text_type, value, url)
+        pos = plain_start = end
+    if plain_start < length:
+        emit(TextType.PLAIN, text[plain_start:], None)
+
+def text_to_text_nodes(text, warn=None):
+    nodes = []
+    append = nodes.append
+    scan_inline(text, lambda text_type, value, url: append(TextNode(value, text_type, url)), warn)
+    return nodes
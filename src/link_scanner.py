@@ -0,0 +1,102 @@
+import re
+
+BRACKET_PATTERN = re.compile(r"[\[\]]")
+
+
+class ForwardFinder:
+    """text.find(needle, pos) that remembers its last answer.
+
+    A query at or after the last search start and no later than the occurrence it found
+    has the same answer, so positions that only move forward cost one pass over the text
+    in total instead of one pass per query.
+    """
+
+    def __init__(self, text, needle):
+        self.text = text
+        self.needle = needle
+        self.start = len(text) + 1
+        self.found = -1
+
+    def find(self, pos):
+        if self.start <= pos and (self.found == -1 or pos <= self.found):
+            return self.found
+        self.start = pos
+        self.found = self.text.find(self.needle, pos)
+        return self.found
+
+
+class LinkScanner:
+    """Matches markdown links and images in one text without backtracking.
+
+    match_link and match_image accept exactly what the old LINK_PATTERN
+    (one level of nested brackets in the text) and IMAGE_PATTERN (shortest alt
+    text on one line, followed by a non-empty url) regexes did, but every search
+    reuses what earlier ones found, so scanning a whole text for links stays linear
+    however many unmatched brackets, unclosed images or long urls it holds.
+    """
+
+    def __init__(self, text):
+        self.text = text
+        self.paren = ForwardFinder(text, ")")
+        self.newline = ForwardFinder(text, "\n")
+        self.image_close = ForwardFinder(text, "](")
+        # first ]( at or after _close_from followed by a url, as (close, url_end)
+        self._close_from = len(text) + 1
+        self._close = (-1, -1)
+
+    def match_link(self, start):
+        """(text, url, end) for a link whose [ is at start, or None."""
+        text = self.text
+        nested = False
+        pos = start + 1
+        while True:
+            bracket = BRACKET_PATTERN.search(text, pos)
+            if bracket is None:
+                return None
+            pos = bracket.start()
+            if text[pos] == "[":
+                if nested:
+                    return None
+                nested = True
+            elif nested:
+                nested = False
+            else:
+                break
+            pos += 1
+        url_start = pos + 2
+        if text[pos + 1:url_start] != "(":
+            return None
+        url_end = self.paren.find(url_start)
+        if url_end <= url_start:
+            return None
+        return text[start + 1:pos], text[url_start:url_end], url_end + 1
+
+    def match_image(self, start):
+        """(alt, url, end) for an image whose ![ is at start, or None."""
+        alt_start = start + 2
+        close, url_end = self._url_close(alt_start)
+        if close == -1:
+            return None
+        newline = self.newline.find(alt_start)
+        if newline != -1 and newline < close:
+            return None
+        return self.text[alt_start:close], self.text[close + 2:url_end], url_end + 1
+
+    def _url_close(self, pos):
+        # a ]( straight before ) can never close an image, so skip it for every start at once
+        close, url_end = self._close
+        if self._close_from <= pos and (close == -1 or pos <= close):
+            return self._close
+        close = self.image_close.find(pos)
+        url_end = -1
+        while close != -1:
+            url_end = self.paren.find(close + 2)
+            if url_end == -1:
+                close = -1
+            elif url_end == close + 2:
+                close = self.image_close.find(close + 1)
+                continue
+            break
+        self._close_from = pos
+        self._close = (close, url_end)
+        return self._close
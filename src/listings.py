@@ -0,0 +1,137 @@
+import hashlib
+import json
+import re
+from manifest import cache_path_for, load_versioned, save_versioned
+from textnode import TextType
+from version import GENERATOR_VERSION
+
+BLOG_DIR = "blog"
+DEFAULT_PER_PAGE = 10
+LISTINGS_VERSION = 1
+
+def listings_path_for(dst):
+    return cache_path_for(dst, "listings")
+
+def slugify(tag):
+    return re.sub(r"[^a-z0-9]+", "-", tag.lower()).strip("-") or "tag"
+
+def blog_posts(pages):
+    """Index entries under blog/, newest first, undated posts last, ties broken by path."""
+    prefix = BLOG_DIR + "/"
+    posts = [page for page in pages if page["path"].startswith(prefix) and page["path"] != prefix + "index.md"]
+    posts.sort(key=lambda page: page["path"])
+    # stable, so equal dates keep the path order
+    posts.sort(key=lambda page: page["date"] or "", reverse=True)
+    return posts
+
+def listing_output(directory, number):
+    if number == 1:
+        return f"{directory}/index.html"
+    return f"{directory}/page/{number}/index.html"
+
+def listing_url(directory, number):
+    if number == 1:
+        return f"/{directory}/"
+    return f"/{directory}/page/{number}/"
+
+def plain(text):
+    return [text, TextType.PLAIN.value]
+
+def link(text, url):
+    return [text, TextType.LINK.value, url]
+
+def listing_page(title, posts, directory, number, count):
+    """A listing page as {"title", "description", "blocks"}, with blocks laid out like BlockNode.to_ast.
+
+    Post titles go straight into link tokens instead of through markdown, so
+    brackets, underscores and asterisks in them are shown as written.
+    """
+    blocks = [["h1", [plain(title)]]]
+    description = None
+    if posts:
+        rows = []
+        for post in posts:
+            row = [link(post["title"], post["url"])]
+            if post["date"]:
+                row.append(plain(f" ({post['date']})"))
+            rows.append(row)
+        blocks.append(["ul", rows])
+    else:
+        description = "No posts yet."
+        blocks.append(["p", [plain(description)]])
+    links = []
+    if number > 1:
+        links.append(link("< Newer posts", listing_url(directory, number - 1)))
+    if number < count:
+        if links:
+            links.append(plain(" "))
+        links.append(link("Older posts >", listing_url(directory, number + 1)))
+    if links:
+        blocks.append(["p", links])
+    return {"title": title, "description": description, "blocks": blocks}
+
+def add_paginated(listings, title, posts, directory, per_page):
+    count = max(1, -(-len(posts) // per_page))
+    for number in range(1, count + 1):
+        chunk = posts[(number - 1) * per_page:number * per_page]
+        page_title = title if number == 1 else f"{title} (page {number})"
+        listings[listing_output(directory, number)] = listing_page(page_title, chunk, directory, number, count)
+
+def plan_listings(pages, per_page=DEFAULT_PER_PAGE):
+    """Return {output path: listing_page} for the paginated blog index, the tag pages and the tag overview.
+
+    Posts are sorted once and bucketed by tag in the same pass, so every tag
+    list comes out already sorted. Tags that differ only in case share a page,
+    named after the newest post's spelling; other tags whose slugs collide get
+    numbered slugs so no tag page overwrites another.
+    """
+    posts = blog_posts(pages)
+    listings = {}
+    add_paginated(listings, "Blog", posts, BLOG_DIR, per_page)
+    by_tag = {}
+    names = {}
+    for post in posts:
+        for key in dict.fromkeys(tag.lower() for tag in post["tags"]):
+            by_tag.setdefault(key, []).append(post)
+        for tag in post["tags"]:
+            names.setdefault(tag.lower(), tag)
+    if by_tag:
+        rows = []
+        slugs = set()
+        for key in sorted(by_tag):
+            tag = names[key]
+            slug = base = slugify(tag)
+            number = 2
+            while slug in slugs:
+                slug = f"{base}-{number}"
+                number += 1
+            slugs.add(slug)
+            directory = f"{BLOG_DIR}/tags/{slug}"
+            add_paginated(listings, f"Posts tagged {tag}", by_tag[key], directory, per_page)
+            rows.append([link(tag, listing_url(directory, 1)), plain(f" ({len(by_tag[key])})")])
+        listings[f"{BLOG_DIR}/tags/index.html"] = {"title": "Tags", "description": None, "blocks": [["h1", [plain("Tags")]], ["ul", rows]]}
+    return listings
+
+def listing_digest(page, template, base_path):
+    digest = hashlib.sha256()
+    for part in (GENERATOR_VERSION, template.digest(), base_path or "", json.dumps(page, sort_keys=True)):
+        digest.update(part.encode('utf-8'))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+class ListingState:
+    """The digest each generated listing page was last written from, so unchanged listings are skipped."""
+    def __init__(self, path):
+        self.path = path
+        self.entries = {}
+
+    @classmethod
+    def load(cls, path):
+        state = cls(path)
+        data = load_versioned(path, LISTINGS_VERSION, f"could not read listing state '{path}', regenerating all listing pages.")
+        if data is not None:
+            state.entries = data.get("entries", {})
+        return state
+
+    def save(self):
+        save_versioned(self.path, LISTINGS_VERSION, {"entries": self.entries})
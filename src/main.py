@@ -1,49 +1,195 @@
+import argparse
+import cProfile
+import html
 import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from io import StringIO
 import shutil
 import sys
-from blocknode import BlockType, BlockNode
+import assets
+from blocknode import BlockType, iter_blocks, ast_html_payload, section_html
+from byte_scanner import BYTES, SCANNERS, TEXT, configure_scanner, get_scanner, iter_file_blocks
+from diagnostics import Diagnostics, Policy
+from frontmatter import read_front_matter
+from metadata import PageMetadata, fallback_title, scan_metadata
+from manifest import Manifest, hash_file, manifest_path_for, stat_key
+from template import CompiledTemplate, load_template
+from profiler import BuildProfiler, PageProfile
+from render_cache import DEFAULT_MAXSIZE, configure_block_cache, get_block_cache
+import page_cache
+from page_cache import configure_page_cache, get_page_cache
+import ast_cache
+from ast_cache import configure_ast_cache, get_ast_cache, iter_ast
+from site_index import SiteIndex, index_path_for
+from version import GENERATOR_VERSION
+from listings import BLOG_DIR, DEFAULT_PER_PAGE, ListingState, listing_digest, listings_path_for, plan_listings
 
-def markdown_to_blocks(markdown):
-    lines = markdown.split('\n')
-    blocks = []
-    start_line = 1
-    i = 0
-    while i < len(lines):
-        # gather lines until you hit a blank
-        if lines[i].strip() == "":
-            i += 1
-            start_line += 1
-            continue
-        block_lines = []
-        block_start = start_line
-        while i < len(lines) and lines[i].strip() != "":
-            block_lines.append(lines[i])
-            i += 1
-            start_line += 1
-        blocks.append(BlockNode("\n".join(block_lines).strip(), block_start))
-    return blocks
-
-def clone_directory_and_generate(src, dst, template):
+def markdown_to_blocks(markdown, diagnostics=None):
+    return list(iter_blocks(markdown.split('\n'), diagnostics))
+
+def clone_directory_and_generate(src, dst, template, base_path=None, pages=None, asset_mode=assets.LINK, verify_assets=False):
+    """Sync the assets of src into dst, dropping anything stale, and render every page.
+
+    With a pages list the (source, output) pairs are only collected and the
+    caller renders them in one batch. Returns the asset SyncStats.
+    """
+    # generated listing pages have no source file, keep them so unchanged ones are not rewritten
+    keep = ListingState.load(listings_path_for(dst)).entries
+    found, stats = assets.sync_assets(src, dst, asset_mode, verify_assets, keep=keep)
+    if pages is not None:
+        pages.extend(found)
+    else:
+        for src_md, dst_html in found:
+            generate_page(src_md, template, dst_html, base_path)
+    return stats
+
+def outputs_for(rel_path):
+    # pages are rendered straight from the source tree, only their html lands in dst
+    if assets.is_page(rel_path):
+        return [assets.page_output(rel_path)]
+    return [rel_path]
+
+def remove_output(dst, rel_path):
+    path = os.path.join(dst, rel_path)
+    if os.path.isfile(path):
+        os.remove(path)
+    # prune directories left empty by the removal, stopping at the destination root
+    parent = os.path.dirname(path)
+    abs_dst = os.path.abspath(dst)
+    while os.path.abspath(parent) != abs_dst and os.path.isdir(parent) and not os.listdir(parent):
+        os.rmdir(parent)
+        parent = os.path.dirname(parent)
+
+def incremental_generate(src, dst, template, base_path=None, jobs=1, diagnostics=None, profiler=None, cache_file=None,
+                         asset_mode=assets.LINK, verify_assets=False, site_pages=None):
+    start = time.perf_counter()
     if not os.path.exists(src):
         raise FileNotFoundError(f"Source directory '{src}' does not exist.")
-    if not os.path.exists(dst):
+    if not os.path.exists(template):
+        raise FileNotFoundError(f"Template file '{template}' does not exist.")
+    manifest = Manifest.load(manifest_path_for(dst))
+    pages = []
+    if manifest.is_empty():
+        # no record of what is in dst, so start from the same clean slate as a full build
+        clone_directory_and_generate(src, dst, template, base_path, pages, asset_mode, verify_assets)
+    elif not os.path.exists(dst):
         os.makedirs(dst)
-    for item in os.listdir(dst):
-        item_path = os.path.join(dst, item)
-        if os.path.isfile(item_path):
-            os.remove(item_path)
-        elif os.path.isdir(item_path):
-            shutil.rmtree(item_path)
-    for item in os.listdir(src):
-        src_item = os.path.join(src, item)
-        dst_item = os.path.join(dst, item)
-        if os.path.isfile(src_item):
-            shutil.copy2(src_item, dst_item)
-            if item.endswith(".md"):
-                dst_html = os.path.join(dst, item[:-3] + ".html")
-                generate_page(dst_item, template, dst_html)
-        elif os.path.isdir(src_item):
-            clone_directory_and_generate(src_item, dst_item, template)
+
+    template_stat = stat_key(os.stat(template))
+    if manifest.template_stat == template_stat and manifest.template_hash:
+        template_hash = manifest.template_hash
+    else:
+        template_hash = hash_file(template)
+    # pages only need re-rendering when the template contents, the base path or the generated HTML actually changed
+    rerender_all = (template_hash != manifest.template_hash or base_path != manifest.base_path
+                    or manifest.generator_version != GENERATOR_VERSION)
+    fresh = manifest.is_empty()
+
+    seen = set()
+    updated = 0
+    asset_pairs = []
+    for root, dirs, files in os.walk(src):
+        dirs.sort()
+        for name in sorted(files):
+            src_item = os.path.join(root, name)
+            rel_path = os.path.relpath(src_item, src)
+            seen.add(rel_path)
+            outputs = outputs_for(rel_path)
+            is_page = assets.is_page(name)
+            if is_page and site_pages is not None:
+                # every page, changed or not, for the site index
+                site_pages.append((src_item, os.path.join(dst, outputs[0])))
+            current_stat = stat_key(os.stat(src_item))
+            entry = manifest.entries.get(rel_path)
+            outputs_exist = all(os.path.exists(os.path.join(dst, output)) for output in outputs)
+            if fresh:
+                content_hash = hash_file(src_item)
+            elif entry is not None and entry["stat"] == current_stat and outputs_exist and not (is_page and rerender_all):
+                continue
+            else:
+                content_hash = hash_file(src_item)
+                if (entry is not None and entry["hash"] == content_hash and outputs_exist
+                        and not (is_page and rerender_all)):
+                    # touched but not modified, just refresh the recorded stat
+                    entry["stat"] = current_stat
+                    continue
+                updated += 1
+                if is_page:
+                    pages.append((src_item, os.path.join(dst, outputs[0])))
+                else:
+                    asset_pairs.append((src_item, os.path.join(dst, rel_path)))
+            manifest.entries[rel_path] = {
+                "stat": current_stat,
+                "hash": content_hash,
+                "template": template_hash if is_page else None,
+                "outputs": outputs,
+            }
+
+    assets.sync_files(asset_pairs, asset_mode, verify_assets)
+    if profiler is not None:
+        profiler.record("scan and copy", time.perf_counter() - start)
+    start = time.perf_counter()
+    failures = render_pages(pages, template, base_path, jobs, diagnostics, profiler, cache_file)
+    if profiler is not None:
+        profiler.record("render pages", time.perf_counter() - start)
+    for failed_src, message in failures:
+        # forget failed pages so the next build retries them
+        manifest.entries.pop(os.path.relpath(failed_src, src), None)
+
+    removed = 0
+    for rel_path in sorted(set(manifest.entries) - seen):
+        for output in manifest.entries[rel_path]["outputs"]:
+            remove_output(dst, output)
+            removed += 1
+        del manifest.entries[rel_path]
+
+    manifest.template_hash = template_hash
+    manifest.template_stat = template_stat
+    manifest.base_path = base_path
+    manifest.generator_version = GENERATOR_VERSION
+    manifest.save()
+    if not fresh:
+        print(f"Incremental build: {updated} file(s) updated, {len(pages) - len(failures)} page(s) rendered, {removed} output(s) removed.")
+    return failures
+
+def generate_listings(src, dst, template, base_path=None, pages=(), per_page=DEFAULT_PER_PAGE):
+    """Write the blog listing and tag pages planned from the site index entries in pages.
+
+    Listings are only generated when the source has a blog/ directory without
+    its own index.md. A listing page is rewritten only when its content, the
+    template or the base path changed, so a new post touches just the pages
+    it appears on. Returns (written, removed).
+    """
+    state = ListingState.load(listings_path_for(dst))
+    blog_dir = os.path.join(src, BLOG_DIR)
+    planned = {}
+    if os.path.isdir(blog_dir) and not os.path.exists(os.path.join(blog_dir, "index.md")):
+        planned = plan_listings(pages, per_page)
+    compiled_template = load_template(template, base_path) if planned else None
+    entries = {}
+    written = 0
+    for output, page in planned.items():
+        digest = listing_digest(page, compiled_template, base_path)
+        entries[output] = digest
+        dst_path = os.path.join(dst, output)
+        if state.entries.get(output) == digest and os.path.exists(dst_path):
+            continue
+        os.makedirs(os.path.dirname(dst_path), exist_ok=True)
+        # the blocks are built from the index, not parsed, so there is nothing to warn about
+        metadata = PageMetadata(page["title"], page["description"])
+        tmp_path = dst_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            fill_template(f, metadata, lambda out: write_ast_body(out, page["blocks"], base_path), compiled_template)
+        os.replace(tmp_path, dst_path)
+        written += 1
+    removed = 0
+    for output in sorted(set(state.entries) - set(entries)):
+        remove_output(dst, output)
+        removed += 1
+    state.entries = entries
+    state.save()
+    return written, removed
 
 def get_title(blocks):
     for block in blocks:
@@ -52,57 +198,482 @@ def get_title(blocks):
                 return block.content[2:].strip()
     raise ValueError("Converter requires a title for website. Please add a level 1 heading.")
 
-def generate_page(src, template, dst):
-    print(f"Generating page from {src} using template {template} to {dst}")
+def page_metadata(blocks, diagnostics=None, source=None, front_matter=None):
+    """Pre-scan blocks for the page metadata, reporting a missing title as a diagnostic."""
+    metadata = scan_metadata(blocks, front_matter)
+    if metadata.title is None:
+        if diagnostics is None:
+            diagnostics = Diagnostics()
+        metadata.title = fallback_title(source or diagnostics.source)
+        diagnostics.warn("missing-title", 1, 1, f"Page has no level 1 heading, using '{metadata.title}' as its title. Add a '# ' heading to set one.")
+    return metadata
+
+def _profiled_blocks(blocks, profile):
+    # with a lazy iterator the blocks are parsed as the body is written, so time each step of it
+    iterator = iter(blocks)
+    while True:
+        start = time.perf_counter()
+        block = next(iterator, None)
+        profile.add("parse", time.perf_counter() - start)
+        if block is None:
+            return
+        profile.blocks += 1
+        yield block
+
+def write_body(stream, blocks, base_path=None, profile=None, ast_writer=None):
+    """Write the HTML of every block, passing each block's AST to ast_writer when one is given."""
+    cache = get_block_cache()
+    if profile is not None:
+        blocks = _profiled_blocks(blocks, profile)
+    for i, block in enumerate(blocks):
+        if i:
+            stream.write("\n")
+        if cache is not None:
+            key = (block.content, block.block_type.value, base_path)
+            html = cache.get(key)
+            if html is not None:
+                stream.write(html)
+                if ast_writer is not None:
+                    ast_writer.write_block(block.to_ast())
+                continue
+            warnings_before = len(block.diagnostics.warnings)
+        start = time.perf_counter()
+        # HTML is emitted straight from the tokens, no HTMLNode tree is built on this path
+        if ast_writer is None:
+            tag, payload = block.parse_html(base_path)
+        else:
+            ast = block.to_ast()
+            ast_writer.write_block(ast)
+            tag, payload = ast_html_payload(ast, base_path)
+        built = time.perf_counter()
+        html = section_html(tag, payload)
+        stream.write(html)
+        # blocks that raised warnings are re-rendered every time so their warnings are never lost
+        if cache is not None and len(block.diagnostics.warnings) == warnings_before:
+            cache.put(key, html)
+        if profile is not None:
+            profile.add("inline_html", built - start)
+            profile.add("serialize", time.perf_counter() - built)
+    if ast_writer is not None:
+        ast_writer.complete = True
+
+def write_ast_body(stream, asts, base_path=None, profile=None):
+    """Write the HTML of cached block ASTs, no parsing involved."""
+    for i, ast in enumerate(asts):
+        if i:
+            stream.write("\n")
+        start = time.perf_counter()
+        tag, payload = ast_html_payload(ast, base_path)
+        built = time.perf_counter()
+        stream.write(section_html(tag, payload))
+        if profile is not None:
+            profile.blocks += 1
+            profile.add("inline_html", built - start)
+            profile.add("serialize", time.perf_counter() - built)
+
+def body_seconds(profile):
+    return profile.stages["parse"] + profile.stages["inline_html"] + profile.stages["serialize"]
+
+def fill_template(stream, metadata, write_content, template, profile=None):
+    """Fill template with the page metadata and the body written by write_content(stream)."""
+    # template must already be rebased for the base path, see load_template
+    if profile is not None:
+        start = time.perf_counter()
+        body_before = body_seconds(profile)
+    if template.slot_count("Content") > 1:
+        # the body is streamed from lazy blocks, so a body used more than once is rendered once and reused
+        body = StringIO()
+        write_content(body)
+        content = body.getvalue()
+    else:
+        content = write_content
+    # the description is meant for attributes such as <meta name="description">, so it is escaped
+    description = html.escape(metadata.description or "")
+    template.render(stream, {"Title": metadata.title, "Description": description, "Content": content})
+    if profile is not None:
+        profile.add("template_fill", time.perf_counter() - start - (body_seconds(profile) - body_before))
+
+def render_page_to(stream, markdown, template, base_path=None, diagnostics=None, profile=None):
+    start = time.perf_counter()
+    lines = markdown.split('\n')
+    front_matter, skip_lines = read_front_matter(lines, diagnostics)
+    blocks = list(iter_blocks(lines, diagnostics, skip_lines))
+    metadata = page_metadata(blocks, diagnostics, front_matter=front_matter)
+    if profile is not None:
+        profile.add("parse", time.perf_counter() - start)
+    fill_template(stream, metadata, lambda out: write_body(out, blocks, base_path, profile), template, profile)
+
+def source_blocks(source, diagnostics=None, skip_lines=0):
+    """Blocks of an open markdown file, from its raw bytes when the bytes scanner is selected."""
+    name = getattr(source, "name", None)
+    if get_scanner() == BYTES and isinstance(name, str):
+        return iter_file_blocks(name, diagnostics, skip_lines)
+    source.seek(0)
+    return iter_blocks(source, diagnostics, skip_lines)
+
+def render_file_to(stream, source, template, base_path=None, diagnostics=None, profile=None, ast_writer=None):
+    """Render an open markdown file without holding more than one block of it in memory.
+
+    With an ast_writer the metadata and every block AST are streamed to it as well.
+    """
+    start = time.perf_counter()
+    # first pass only reads the front matter and up to the title, the second streams the body
+    front_matter, skip_lines = read_front_matter(source, diagnostics)
+    metadata = page_metadata(source_blocks(source, skip_lines=skip_lines), diagnostics, getattr(source, "name", None), front_matter)
+    if profile is not None:
+        profile.add("parse", time.perf_counter() - start)
+    if ast_writer is not None:
+        ast_writer.write_metadata(metadata)
+    blocks = source_blocks(source, diagnostics, skip_lines)
+    fill_template(stream, metadata, lambda out: write_body(out, blocks, base_path, profile, ast_writer), template, profile)
+
+def render_ast_to(stream, path, template, base_path=None, profile=None):
+    """Render a page from its cached AST file, re-wrapping it in template without parsing."""
+    entries = iter_ast(path)
+    metadata = next(entries)
+    fill_template(stream, metadata, lambda out: write_ast_body(out, entries, base_path, profile), template, profile)
+
+def render_page(markdown, template, base_path=None, diagnostics=None, profile=None):
+    if isinstance(template, str):
+        template = CompiledTemplate.compile(template).rebased(base_path)
+    output = StringIO()
+    render_page_to(output, markdown, template, base_path, diagnostics, profile)
+    return output.getvalue()
+
+def write_page(src, template, dst, base_path=None, diagnostics=None, profile=None):
     abs_src = os.path.abspath(src)
-    abs_template = os.path.abspath(template)
     abs_dst = os.path.abspath(dst)
     if not os.path.exists(abs_src):
         raise FileNotFoundError(f"Source file '{abs_src}' does not exist.")
-    if not os.path.exists(abs_template):
-        raise FileNotFoundError(f"Template file '{abs_template}' does not exist.")
     if not os.path.exists(os.path.dirname(abs_dst)):
-            os.makedirs(os.path.dirname(abs_dst))
-    with open(abs_src, 'r', encoding='utf-8') as f:
-        markdown = f.read()
-    with open(abs_template, 'r', encoding='utf-8') as f:
-        template_html = f.read()
-
-    blocks = markdown_to_blocks(markdown)
-    title = get_title(blocks)
-    body_html = "\n".join(block.to_section().to_html() for block in blocks)
-    if len(sys.argv) >= 2:
-        output_html = template_html.replace("{{ Title }}", title).replace("{{ Content }}", body_html).replace('href="/', f'href="{sys.argv[1]}').replace('src="/', f'src="{sys.argv[1]}')
-    else:
-        output_html = template_html.replace("{{ Title }}", title).replace("{{ Content }}", body_html)
-    with open(abs_dst, 'w', encoding='utf-8') as f:
-        f.write(output_html)
+            os.makedirs(os.path.dirname(abs_dst), exist_ok=True)
+    page_start = time.perf_counter()
+    # stream into a temporary file so a page that fails halfway never replaces the previous output
+    tmp_dst = abs_dst + ".tmp"
+    cache = get_page_cache()
+    asts = get_ast_cache()
+    source_digest = hash_file(abs_src) if cache is not None or asts is not None else None
+    if profile is not None:
+        # the markdown itself is read as it is parsed, so this is only the cache key hashing
+        profile.add("read", time.perf_counter() - page_start)
+        profile.bytes_read += os.path.getsize(abs_src)
+    cache_key = None
+    if cache is not None:
+        cache_key = cache.key(source_digest, template, base_path)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            write_start = time.perf_counter()
+            shutil.copyfile(cached, tmp_dst)
+            os.replace(tmp_dst, abs_dst)
+            if profile is not None:
+                profile.add("write", time.perf_counter() - write_start)
+                profile.bytes_written += os.path.getsize(abs_dst)
+                profile.seconds += time.perf_counter() - page_start
+            return
+    cached_ast = None
+    ast_writer = None
+    if asts is not None:
+        ast_key = asts.key(source_digest)
+        cached_ast = asts.get(ast_key)
+        if cached_ast is None:
+            ast_writer = asts.writer(ast_key)
+    if diagnostics is None and (cache is not None or ast_writer is not None):
+        diagnostics = Diagnostics()
+    warnings_before = len(diagnostics.warnings) if diagnostics is not None else 0
+    try:
+        with open(tmp_dst, 'w', encoding='utf-8') as f:
+            if cached_ast is not None:
+                render_ast_to(f, cached_ast, template, base_path, profile)
+            else:
+                with open(abs_src, 'r', encoding='utf-8') as source:
+                    render_file_to(f, source, template, base_path, diagnostics, profile, ast_writer)
+            write_start = time.perf_counter()
+        if profile is not None:
+            # rendering writes as it goes, this is the final flush and close
+            profile.add("write", time.perf_counter() - write_start)
+            profile.bytes_written += os.path.getsize(tmp_dst)
+    except BaseException:
+        if ast_writer is not None:
+            ast_writer.abort()
+        if os.path.exists(tmp_dst):
+            os.remove(tmp_dst)
+        raise
+    # pages with warnings are rendered every time so the warnings are reported on every build
+    clean = diagnostics is None or len(diagnostics.warnings) == warnings_before
+    if ast_writer is not None:
+        # a template without a Content slot never writes the body, so there are no blocks to cache
+        if clean and ast_writer.complete:
+            ast_writer.commit()
+        else:
+            ast_writer.abort()
+    if cache_key is not None and clean:
+        cache.put(cache_key, tmp_dst)
+    os.replace(tmp_dst, abs_dst)
+    if profile is not None:
+        profile.seconds += time.perf_counter() - page_start
+
+def generate_page(src, template, dst, base_path=None, diagnostics=None):
+    print(f"Generating page from {src} using template {template} to {dst}")
+    if diagnostics is not None:
+        diagnostics = diagnostics.for_source(src)
+    write_page(src, load_template(template, base_path), dst, base_path, diagnostics)
 
+# Worker state for parallel builds, set once per process by _init_worker so the
+# compiled template is not pickled along with every page.
+_worker_template = None
+_worker_base_path = None
+_worker_policy = None
+_worker_profile = False
+
+def _init_worker(template, base_path, policy, profile, cache_size, cache_file, page_cache_dir, page_cache_size,
+                 ast_cache_dir, ast_cache_size, scanner=TEXT):
+    global _worker_template, _worker_base_path, _worker_policy, _worker_profile
+    _worker_template = template
+    _worker_base_path = base_path
+    _worker_policy = policy
+    _worker_profile = profile
+    cache = configure_block_cache(cache_size, cache_file)
+    if cache is not None and cache_file:
+        cache.added = []
+    configure_page_cache(page_cache_dir, page_cache_size)
+    configure_ast_cache(ast_cache_dir, ast_cache_size)
+    configure_scanner(scanner)
+
+def _file_cache_counters(cache):
+    return (cache.hits, cache.misses, cache.stores) if cache is not None else None
+
+def _file_cache_delta(cache, before):
+    if cache is None:
+        return None
+    return tuple(after - start for after, start in zip(_file_cache_counters(cache), before))
+
+def _add_file_cache_delta(cache, delta):
+    if cache is not None and delta is not None:
+        hits, misses, stores = delta
+        cache.hits += hits
+        cache.misses += misses
+        cache.stores += stores
+
+def _render_page_job(src, dst):
+    # collect in the worker, the parent decides how to surface the warnings; strict still
+    # raises in write_page so a failing page never replaces its previous output
+    diagnostics = Diagnostics(Policy.STRICT if _worker_policy == Policy.STRICT else Policy.COLLECT, src)
+    profile = PageProfile(src) if _worker_profile else None
+    cache = get_block_cache()
+    if cache is not None:
+        hits, misses = cache.hits, cache.misses
+    page_counters = _file_cache_counters(get_page_cache())
+    ast_counters = _file_cache_counters(get_ast_cache())
+    try:
+        write_page(src, _worker_template, dst, _worker_base_path, diagnostics, profile)
+    except Exception as e:
+        return src, dst, f"{type(e).__name__}: {e}", diagnostics.warnings, None, None
+    # counters are sent back as deltas, the parent sums them into its own caches
+    block_stats = None
+    if cache is not None:
+        block_stats = (cache.hits - hits, cache.misses - misses, cache.added)
+        if cache.added is not None:
+            cache.added = []
+    cache_stats = (block_stats, _file_cache_delta(get_page_cache(), page_counters), _file_cache_delta(get_ast_cache(), ast_counters))
+    return src, dst, None, diagnostics.warnings, profile, cache_stats
+
+def render_pages(pages, template, base_path=None, jobs=1, diagnostics=None, profiler=None, cache_file=None):
+    """Render (src, dst) page pairs, fanning out to a process pool when jobs > 1.
+
+    Returns a list of (src, message) for pages that failed in parallel mode,
+    the serial path raises on the first error as generate_page always has.
+    """
+    compiled_template = load_template(template, base_path)
+    if diagnostics is None:
+        diagnostics = Diagnostics()
+    if jobs == 1 or len(pages) < 2:
+        for src, dst in pages:
+            print(f"Generating page from {src} using template {template} to {dst}")
+            page_diagnostics = diagnostics.for_source(src)
+            profile = PageProfile(src) if profiler is not None else None
+            write_page(src, compiled_template, dst, base_path, page_diagnostics, profile)
+            diagnostics.extend(page_diagnostics.warnings)
+            if profile is not None:
+                profiler.add_page(profile)
+        return []
+    failures = []
+    workers = min(jobs, len(pages))
+    chunksize = max(1, len(pages) // (workers * 4))
+    cache = get_block_cache()
+    cache_size = cache.maxsize if cache is not None else 0
+    pages_cache = get_page_cache()
+    asts = get_ast_cache()
+    initargs = (compiled_template, base_path, diagnostics.policy, profiler is not None, cache_size, cache_file,
+                pages_cache.directory if pages_cache is not None else None, pages_cache.maxsize if pages_cache is not None else 0,
+                asts.directory if asts is not None else None, asts.maxsize if asts is not None else 0, get_scanner())
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=initargs) as executor:
+        srcs = [src for src, dst in pages]
+        dsts = [dst for src, dst in pages]
+        for src, dst, error, warnings, profile, cache_stats in executor.map(_render_page_job, srcs, dsts, chunksize=chunksize):
+            block_stats, page_stats, ast_stats = cache_stats or (None, None, None)
+            if block_stats is not None:
+                hits, misses, added = block_stats
+                cache.hits += hits
+                cache.misses += misses
+                for key, html in added or ():
+                    cache.put(key, html)
+            _add_file_cache_delta(pages_cache, page_stats)
+            _add_file_cache_delta(asts, ast_stats)
+            if diagnostics.policy == Policy.LENIENT:
+                for warning in warnings:
+                    print(f"Warning: {warning}")
+            if diagnostics.policy != Policy.STRICT:
+                diagnostics.extend(warnings)
+            if profile is not None:
+                profiler.add_page(profile)
+            if error is None:
+                print(f"Generating page from {src} using template {template} to {dst}")
+            else:
+                print(f"Error generating page from {src}: {error}")
+                failures.append((src, error))
+    return failures
+
+def update_listings(src, dst, template, base_path=None, pages=(), per_page=DEFAULT_PER_PAGE):
+    """Bring the site index up to date with every (src, dst) page pair and regenerate the listings from it."""
+    site_index = SiteIndex.load(index_path_for(dst))
+    site_index.update(src, dst, pages)
+    site_index.save()
+    written, removed = generate_listings(src, dst, template, base_path, site_index.pages(), max(1, per_page))
+    if written or removed:
+        print(f"Listing pages: {written} written, {removed} removed.")
+    return written, removed
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument("paths", nargs="*")
+    parser.add_argument("--help", action="store_true")
+    parser.add_argument("--incremental", action="store_true")
+    parser.add_argument("--jobs", type=int, default=1)
+    parser.add_argument("--policy", choices=[policy.value for policy in Policy], default=Policy.LENIENT.value)
+    parser.add_argument("--profile", action="store_true")
+    parser.add_argument("--profile-top", type=int, default=10)
+    parser.add_argument("--profile-dump")
+    parser.add_argument("--block-cache-size", type=int, default=DEFAULT_MAXSIZE)
+    parser.add_argument("--block-cache-file")
+    parser.add_argument("--page-cache-size", type=int, default=page_cache.DEFAULT_MAXSIZE)
+    parser.add_argument("--ast-cache-size", type=int, default=page_cache.DEFAULT_MAXSIZE)
+    parser.add_argument("--clear-cache", action="store_true")
+    parser.add_argument("--asset-mode", choices=assets.ASSET_MODES, default=assets.LINK)
+    parser.add_argument("--verify-assets", action="store_true")
+    parser.add_argument("--posts-per-page", type=int, default=DEFAULT_PER_PAGE)
+    parser.add_argument("--scanner", choices=SCANNERS, default=TEXT)
+    parser.add_argument("--watch", action="store_true")
+    parser.add_argument("--port", type=int, default=8888)
+    parser.add_argument("--interval", type=float, default=0.25)
+    return parser.parse_args(argv)
+
+def build(src, dst, template, base_path, args):
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    diagnostics = Diagnostics(Policy(args.policy))
+    profiler = BuildProfiler() if args.profile else None
+    whole_build = cProfile.Profile() if args.profile_dump else None
+    if args.clear_cache:
+        page_cache.PageCache(page_cache.default_directory()).clear()
+        ast_cache.AstCache(ast_cache.default_directory()).clear()
+        if args.block_cache_file and os.path.exists(args.block_cache_file):
+            os.remove(args.block_cache_file)
+        print("Render caches cleared.")
+    cache = configure_block_cache(args.block_cache_size, args.block_cache_file)
+    pages_cache = configure_page_cache(page_cache.default_directory(), args.page_cache_size)
+    asts = configure_ast_cache(ast_cache.default_directory(), args.ast_cache_size)
+    configure_scanner(args.scanner)
+    if whole_build is not None:
+        whole_build.enable()
+    if args.incremental:
+        pages = []
+        failures = incremental_generate(src, dst, template, base_path, jobs, diagnostics, profiler, args.block_cache_file,
+                                        args.asset_mode, args.verify_assets, pages)
+    else:
+        pages = []
+        start = time.perf_counter()
+        stats = clone_directory_and_generate(src, dst, template, base_path, pages, args.asset_mode, args.verify_assets)
+        print(stats.summary())
+        if profiler is not None:
+            profiler.record("copy", time.perf_counter() - start)
+        start = time.perf_counter()
+        failures = render_pages(pages, template, base_path, jobs, diagnostics, profiler, args.block_cache_file)
+        if profiler is not None:
+            profiler.record("render pages", time.perf_counter() - start)
+    start = time.perf_counter()
+    update_listings(src, dst, template, base_path, pages, args.posts_per_page)
+    if profiler is not None:
+        profiler.record("site index and listings", time.perf_counter() - start)
+    if cache is not None and args.block_cache_file:
+        cache.save(args.block_cache_file)
+    for file_cache in (pages_cache, asts):
+        if file_cache is not None:
+            file_cache.prune()
+    if whole_build is not None:
+        whole_build.disable()
+        whole_build.dump_stats(args.profile_dump)
+        print(f"cProfile stats written to {args.profile_dump} (worker processes are not included)")
+    diagnostics.report()
+    for file_cache in (pages_cache, asts):
+        if file_cache is not None and file_cache.hits + file_cache.misses:
+            print(file_cache.summary())
+    if cache is not None and cache.hits + cache.misses:
+        print(cache.summary())
+    if profiler is not None:
+        print(profiler.summary(args.profile_top))
+    if failures:
+        print(f"{len(failures)} page(s) failed to render:")
+        for src_path, message in failures:
+            print(f"  {src_path}: {message}")
+        sys.exit(1)
 
 def main():
-    if len(sys.argv) == 4:
-        src = sys.argv[1]
-        dst = sys.argv[2]
-        template = sys.argv[3]
-        clone_directory_and_generate(src, dst, template)
+    args = parse_args(sys.argv[1:])
+    if args.paths[:1] == ["serve"] and len(args.paths) in (1, 4) and not args.help:
+        # imported here, the watch module builds on this one
+        from watch import serve
+        src, dst, template = args.paths[1:] or ("static", "public", "template.html")
+        build(src, dst, template, None, args)
+        serve(src, dst, template, None, args.port, args.watch, args.interval, Policy(args.policy), args.asset_mode,
+              args.posts_per_page)
+        return
+    if len(args.paths) == 3 and not args.help:
+        src, dst, template = args.paths
+        build(src, dst, template, None, args)
         return
-    if len(sys.argv) == 1 or len(sys.argv) == 2 and sys.argv[1] == "--help":
+    if len(args.paths) == 0 or args.help:
         print("For Testing or Local Hosting:")
         print("Usage: python3 src/main.py <source_directory> <destination_directory> <template_file>")
         print("Example: python3 src/main.py static public template.html")
         print("For Production Build:")
         print("if hosting on GitHub Pages, provide the repository name as the second argument to ensure correct asset linking.")
         print("Usage: python3 src/main.py '/REPO_NAME/'")
+        print("For Local Development:")
+        print("Usage: python3 src/main.py serve [--watch] [--port N] [<source_directory> <destination_directory> <template_file>]")
+        print("Builds once (static public template.html by default) and serves the output; with --watch, edits are rebuilt as they are saved.")
+        print("Options:")
+        print("  --incremental   only rebuild pages and assets that changed since the last build")
+        print("  --jobs N        render pages on N worker processes (0 = one per CPU)")
+        print("  --policy P      how to handle markdown syntax warnings: strict (fail the page), lenient (warn and continue, default) or collect (report at the end)")
+        print("  --profile       print per-stage timings and the slowest pages (--profile-top N, default 10) after the build")
+        print("  --profile-dump FILE  write cProfile stats for the whole build to FILE, readable with pstats")
+        print(f"  --block-cache-size N reuse the HTML of up to N identical blocks within a build (default {DEFAULT_MAXSIZE}, 0 disables)")
+        print("  --block-cache-file FILE  keep the block cache in FILE between builds")
+        print(f"  --page-cache-size N keep up to N rendered pages in .cache/pages between builds (default {page_cache.DEFAULT_MAXSIZE}, 0 disables)")
+        print(f"  --ast-cache-size N  keep up to N parsed pages in .cache/ast, so template or base path changes skip parsing (default {page_cache.DEFAULT_MAXSIZE}, 0 disables)")
+        print("  --clear-cache   empty the page and AST caches (and the --block-cache-file) before building")
+        print("  --asset-mode M  link (hard link assets into the output where possible, default) or copy")
+        print("  --verify-assets also compare hashes before skipping an asset whose size and mtime are unchanged")
+        print(f"  --posts-per-page N  posts on each generated blog and tag listing page (default {DEFAULT_PER_PAGE})")
+        print("  --scanner S     how page sources are split into blocks: text (line by line, default) or bytes (scan the memory-mapped file)")
+        print("  --watch         with serve, poll the sources every --interval seconds (default 0.25) and rebuild only what changed")
+        print("  --port N        with serve, the port to listen on (default 8888)")
         return
-    if len(sys.argv) == 2:
+    if len(args.paths) == 1:
         src = "static"
         template = "template.html"
         dst = "docs"
-        clone_directory_and_generate(src, dst, template)
+        build(src, dst, template, args.paths[0], args)
 
-    
-        
-    
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,89 @@
+import hashlib
+import json
+import os
+
+CACHE_DIR = ".cache"
+MANIFEST_VERSION = 2
+HASH_CHUNK_SIZE = 1 << 20
+
+def hash_file(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(HASH_CHUNK_SIZE)
+            if not chunk:
+                break
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def cache_path_for(dst, name):
+    # one file per destination so `public` and `docs` builds don't invalidate each other
+    key = hashlib.sha256(os.path.abspath(dst).encode('utf-8')).hexdigest()[:16]
+    return os.path.join(CACHE_DIR, f"{name}-{key}.json")
+
+def load_versioned(path, version, warning):
+    """The JSON object saved at path by save_versioned, or None if it is missing, unreadable or another version.
+
+    warning is printed when the file exists but can't be read.
+    """
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        print(f"Warning: {warning}")
+        return None
+    if not isinstance(data, dict) or data.get("version") != version:
+        return None
+    return data
+
+def save_versioned(path, version, fields):
+    """Write fields and version to path as one JSON object, replacing the file only once it is complete."""
+    directory = os.path.dirname(path)
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({"version": version, **fields}, f, separators=(",", ":"), sort_keys=True)
+    os.replace(tmp_path, path)
+
+def manifest_path_for(dst):
+    return cache_path_for(dst, "manifest")
+
+class Manifest:
+    def __init__(self, path):
+        self.path = path
+        self.template_hash = None
+        self.template_stat = None
+        self.base_path = None
+        self.generator_version = None
+        self.entries = {}
+
+    @classmethod
+    def load(cls, path):
+        manifest = cls(path)
+        data = load_versioned(path, MANIFEST_VERSION, f"could not read build manifest '{path}', starting a full rebuild.")
+        if data is None:
+            return manifest
+        manifest.template_hash = data.get("template_hash")
+        manifest.template_stat = data.get("template_stat")
+        manifest.base_path = data.get("base_path")
+        manifest.generator_version = data.get("generator_version")
+        manifest.entries = data.get("entries", {})
+        return manifest
+
+    def save(self):
+        save_versioned(self.path, MANIFEST_VERSION, {
+            "template_hash": self.template_hash,
+            "template_stat": self.template_stat,
+            "base_path": self.base_path,
+            "generator_version": self.generator_version,
+            "entries": self.entries,
+        })
+
+    def is_empty(self):
+        return not self.entries
+
+def stat_key(stat_result):
+    return [stat_result.st_size, stat_result.st_mtime_ns]
@@ -0,0 +1,56 @@
+import os
+from blocknode import BlockType
+
+class PageMetadata:
+    def __init__(self, title=None, description=None, date=None, tags=None, fields=None):
+        self.title = title
+        self.description = description
+        self.date = date
+        self.tags = tags if tags is not None else []
+        self.fields = fields if fields is not None else {}
+
+def normalize_tags(value):
+    if isinstance(value, str):
+        value = value.split(",")
+    if not isinstance(value, list):
+        return []
+    tags = []
+    for tag in value:
+        tag = str(tag).strip()
+        if tag and tag not in tags:
+            tags.append(tag)
+    return tags
+
+def scan_metadata(blocks, front_matter=None):
+    """Find the title and description, consuming blocks only up to the block after the title.
+
+    Front matter title, description, date and tags take precedence. Otherwise
+    the title is the first level 1 heading, and the description is the first
+    paragraph before the title or directly after it, joined onto one line.
+    """
+    front_matter = front_matter or {}
+    metadata = PageMetadata(fields=front_matter, date=front_matter.get("date"), tags=normalize_tags(front_matter.get("tags")))
+    title = front_matter.get("title")
+    description = front_matter.get("description")
+    found_heading = False
+    for block in blocks:
+        if found_heading:
+            if description is None and block.block_type == BlockType.PARAGRAPH:
+                description = " ".join(line.strip() for line in block.content.split("\n"))
+            break
+        if block.block_type == BlockType.HEADING and block.content.startswith("# "):
+            found_heading = True
+            if title is None:
+                title = block.content[2:].strip()
+        elif description is None and block.block_type == BlockType.PARAGRAPH:
+            description = " ".join(line.strip() for line in block.content.split("\n"))
+    metadata.title = str(title) if title is not None else None
+    metadata.description = str(description) if description is not None else None
+    return metadata
+
+def fallback_title(source):
+    """A title made from the page's path, for pages without a level 1 heading."""
+    name = os.path.splitext(os.path.basename(source))[0] if source else ""
+    if name in ("", "index"):
+        name = os.path.basename(os.path.dirname(os.path.abspath(source))) if source else ""
+    return name.replace("-", " ").replace("_", " ").strip().title() or "Untitled"
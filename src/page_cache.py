@@ -0,0 +1,105 @@
+import hashlib
+import os
+import shutil
+import manifest
+from version import GENERATOR_VERSION
+
+DEFAULT_MAXSIZE = 4096
+
+class PageCache:
+    """Rendered pages stored as one file per key in a directory, evicted least recently used first.
+
+    A hit refreshes the file's mtime, so the mtime order is the LRU order and
+    nothing besides the files themselves needs to be kept on disk.
+    """
+    name = "Page cache"
+    suffix = ".html"
+
+    def __init__(self, directory, maxsize=DEFAULT_MAXSIZE):
+        self.directory = directory
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+
+    def key(self, source_digest, template, base_path):
+        digest = hashlib.sha256()
+        for part in (GENERATOR_VERSION, template.digest(), base_path or "", source_digest):
+            digest.update(part.encode('utf-8'))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def path_for(self, key):
+        return os.path.join(self.directory, key[:2], key + self.suffix)
+
+    def get(self, key):
+        """Return the path of the cached page for key, or None."""
+        path = self.path_for(key)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return path
+
+    def put(self, key, rendered_path):
+        path = self.path_for(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # workers may store the same page at once, so copy to a private name and rename into place
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        shutil.copyfile(rendered_path, tmp_path)
+        os.replace(tmp_path, path)
+        self.stores += 1
+
+    def prune(self):
+        """Remove the least recently used pages until at most maxsize remain."""
+        if not os.path.isdir(self.directory):
+            return
+        entries = []
+        for root, dirs, files in os.walk(self.directory):
+            for name in files:
+                path = os.path.join(root, name)
+                try:
+                    entries.append((os.stat(path).st_mtime_ns, path))
+                except FileNotFoundError:
+                    continue
+        if len(entries) <= self.maxsize:
+            return
+        entries.sort()
+        for mtime, path in entries[:len(entries) - self.maxsize]:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                continue
+            self.evictions += 1
+
+    def clear(self):
+        if os.path.isdir(self.directory):
+            shutil.rmtree(self.directory)
+
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def summary(self):
+        return (f"{self.name}: {self.hits} hit(s), {self.misses} miss(es) "
+                f"({self.hit_rate() * 100:.1f}% hit rate), {self.stores} stored, {self.evictions} eviction(s)")
+
+def default_directory():
+    return os.path.join(manifest.CACHE_DIR, "pages")
+
+# None when --page-cache-size is 0, see configure_page_cache.
+_page_cache = None
+
+def configure_page_cache(directory, maxsize=DEFAULT_MAXSIZE):
+    global _page_cache
+    if directory is None or maxsize <= 0:
+        _page_cache = None
+        return None
+    _page_cache = PageCache(directory, maxsize)
+    return _page_cache
+
+def get_page_cache():
+    return _page_cache
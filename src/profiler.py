@@ -0,0 +1,49 @@
+PAGE_STAGES = ("read", "parse", "inline_html", "serialize", "template_fill", "write")
+
+class PageProfile:
+    """Timings and counts for one rendered page, filled in as the page goes through the pipeline."""
+    def __init__(self, source):
+        self.source = source
+        self.seconds = 0.0
+        self.stages = dict.fromkeys(PAGE_STAGES, 0.0)
+        self.bytes_read = 0
+        self.bytes_written = 0
+        self.blocks = 0
+
+    def add(self, stage, seconds):
+        self.stages[stage] += seconds
+
+class BuildProfiler:
+    def __init__(self):
+        self.stages = {}
+        self.pages = []
+
+    def record(self, name, seconds):
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    def add_page(self, page):
+        self.pages.append(page)
+
+    def summary(self, top=10):
+        lines = ["Build profile:"]
+        total = sum(self.stages.values())
+        lines.append(f"  build stages (wall time, {total * 1000:.1f} ms total):")
+        for name, seconds in self.stages.items():
+            share = seconds / total * 100 if total else 0.0
+            lines.append(f"    {name:<16} {seconds * 1000:10.1f} ms  {share:5.1f}%")
+        if self.pages:
+            # page stages are summed over pages, so with --jobs they can exceed the wall time above
+            page_total = sum(page.seconds for page in self.pages)
+            lines.append(f"  page stages (summed over {len(self.pages)} page(s), {page_total * 1000:.1f} ms):")
+            for name in PAGE_STAGES:
+                seconds = sum(page.stages[name] for page in self.pages)
+                share = seconds / page_total * 100 if page_total else 0.0
+                lines.append(f"    {name:<16} {seconds * 1000:10.1f} ms  {share:5.1f}%")
+            bytes_read = sum(page.bytes_read for page in self.pages)
+            bytes_written = sum(page.bytes_written for page in self.pages)
+            blocks = sum(page.blocks for page in self.pages)
+            lines.append(f"  {bytes_read} bytes read, {bytes_written} bytes written, {blocks} blocks")
+            lines.append(f"  slowest {min(top, len(self.pages))} page(s):")
+            for page in sorted(self.pages, key=lambda page: page.seconds, reverse=True)[:top]:
+                lines.append(f"    {page.seconds * 1000:10.1f} ms  {page.blocks:6d} blocks  {page.source}")
+        return "\n".join(lines)
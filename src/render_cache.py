@@ -0,0 +1,73 @@
+from collections import OrderedDict
+from manifest import load_versioned, save_versioned
+from version import GENERATOR_VERSION
+
+DEFAULT_MAXSIZE = 1024
+
+class RenderCache:
+    """LRU cache from (block content, block type, base path) to the block's rendered HTML."""
+    def __init__(self, maxsize=DEFAULT_MAXSIZE):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # set to a list by parallel workers so new entries can be sent back to the parent
+        self.added = None
+
+    def get(self, key):
+        html = self.entries.get(key)
+        if html is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return html
+
+    def put(self, key, html):
+        if self.maxsize <= 0:
+            return
+        self.entries[key] = html
+        self.entries.move_to_end(key)
+        if self.added is not None:
+            self.added.append((key, html))
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def summary(self):
+        return (f"Block render cache: {self.hits} hit(s), {self.misses} miss(es) "
+                f"({self.hit_rate() * 100:.1f}% hit rate), {self.evictions} eviction(s), "
+                f"{len(self.entries)}/{self.maxsize} entries")
+
+    def load(self, path):
+        data = load_versioned(path, GENERATOR_VERSION, f"could not read block render cache '{path}', starting empty.")
+        if data is None:
+            return
+        # entries are stored oldest first, so replaying them restores the LRU order
+        for content, block_type, base_path, html in data.get("entries", []):
+            self.put((content, block_type, base_path), html)
+
+    def save(self, path):
+        entries = [[content, block_type, base_path, html] for (content, block_type, base_path), html in self.entries.items()]
+        save_versioned(path, GENERATOR_VERSION, {"entries": entries})
+
+# One cache per process, configured by the build (and by each worker's initializer).
+_block_cache = None
+
+def configure_block_cache(maxsize, path=None):
+    global _block_cache
+    if maxsize <= 0:
+        _block_cache = None
+        return None
+    _block_cache = RenderCache(maxsize)
+    if path:
+        _block_cache.load(path)
+    return _block_cache
+
+def get_block_cache():
+    return _block_cache
@@ -0,0 +1,85 @@
+import os
+from blocknode import iter_blocks
+from diagnostics import Diagnostics, Policy
+from frontmatter import read_front_matter
+from manifest import cache_path_for, load_versioned, save_versioned, stat_key
+from metadata import fallback_title, scan_metadata
+
+INDEX_VERSION = 1
+
+def index_path_for(dst):
+    return cache_path_for(dst, "index")
+
+def url_for(output):
+    """Site URL of an output path relative to the destination, index.html pages ending in a slash."""
+    url = "/" + output.replace(os.sep, "/")
+    if url.endswith("/index.html"):
+        url = url[:-len("index.html")]
+    return url
+
+def index_page(src_path, rel_path, output):
+    """Read one page once and return its index entry."""
+    words = 0
+    with open(src_path, 'r', encoding='utf-8') as f:
+        # rendering reports front matter problems, the index only needs the fields
+        front_matter, skip_lines = read_front_matter(f, Diagnostics(Policy.COLLECT))
+        f.seek(0)
+        blocks = iter_blocks(f, skip_lines=skip_lines)
+        def counted():
+            nonlocal words
+            for block in blocks:
+                words += len(block.content.split())
+                yield block
+        # the metadata scan stops early, the rest of the page is only counted
+        metadata = scan_metadata(counted(), front_matter)
+        for block in blocks:
+            words += len(block.content.split())
+    return {
+        "path": rel_path.replace(os.sep, "/"),
+        "title": metadata.title or fallback_title(src_path),
+        "description": metadata.description,
+        "date": str(metadata.date) if metadata.date is not None else None,
+        "tags": metadata.tags,
+        "words": words,
+        "output": output.replace(os.sep, "/"),
+        "url": url_for(output),
+    }
+
+class SiteIndex:
+    """Metadata for every page of a site, kept on disk so later stages never re-read markdown."""
+    def __init__(self, path):
+        self.path = path
+        self.entries = {}
+
+    @classmethod
+    def load(cls, path):
+        index = cls(path)
+        data = load_versioned(path, INDEX_VERSION, f"could not read site index '{path}', rebuilding it.")
+        if data is not None:
+            index.entries = data.get("entries", {})
+        return index
+
+    def save(self):
+        save_versioned(self.path, INDEX_VERSION, {"entries": self.entries})
+
+    def update(self, src, dst, pages):
+        """Index every (source, output) page pair, re-reading only pages whose size or mtime changed.
+
+        Pages not in pages are dropped. Returns the number of pages read.
+        """
+        entries = {}
+        read = 0
+        for src_md, dst_html in pages:
+            rel_path = os.path.relpath(src_md, src)
+            current_stat = stat_key(os.stat(src_md))
+            entry = self.entries.get(rel_path)
+            if entry is None or entry.get("stat") != current_stat:
+                entry = index_page(src_md, rel_path, os.path.relpath(dst_html, dst))
+                entry["stat"] = current_stat
+                read += 1
+            entries[rel_path] = entry
+        self.entries = entries
+        return read
+
+    def pages(self):
+        return [self.entries[rel_path] for rel_path in sorted(self.entries)]
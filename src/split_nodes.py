@@ -1,6 +1,6 @@
-import re
 from htmlnode import *
 from textnode import TextNode, TextType
+from link_scanner import LinkScanner
 
 def check_delimter_syntax(node, delimiter):
     count = node.text.count(delimiter)
@@ -15,7 +15,7 @@ def split_node_at_delimiter(old_nodes, delimiter, text_type):
             new_nodes.append(node)
             continue
         if not check_delimter_syntax(node, delimiter):
-            raise Exception(f"Did not find an even number of {delimiter} in {node.text}. Markdown syntax requires opening and closing delimiters to be in pairs.")
+            raise ValueError(f"Did not find an even number of {delimiter} in {node.text}. Markdown syntax requires opening and closing delimiters to be in pairs.")
         parts = node.text.split(delimiter)
         plain_nodes = [TextNode(part, node.text_type) for part in parts[::2]]
         text_type_nodes = [TextNode(part, text_type) for part in parts[1::2]]
@@ -26,68 +26,37 @@ def split_node_at_delimiter(old_nodes, delimiter, text_type):
                 new_nodes.append(text_type_nodes[i])
     return new_nodes
 
-def search_for_link(old_node):
-    return re.search(r'\[([^\]]+)[\]\(]([^)]+)\)', old_node.text)
-    
-
-def split_node_at_links(old_nodes):
+def split_node_at_tokens(old_nodes, marker, text_type, match):
     new_nodes = []
     for node in old_nodes:
         if node.text_type != TextType.PLAIN:
             new_nodes.append(node)
             continue
-        
-        # Find all valid markdown links first
-        link_pattern = r'\[([^\[\]]*(?:\[[^\[\]]*\][^\[\]]*)*)\]\(([^)]+)\)'
-        links = list(re.finditer(link_pattern, node.text))
-        
-        if not links:
-            new_nodes.append(node)
-            continue
-            
-        # Split based on the actual found links
+        text = node.text
+        links = LinkScanner(text)
+        match_token = match(links)
         last_end = 0
-        for match in links:
-            # Add text before the link
-            if match.start() > last_end:
-                before_text = node.text[last_end:match.start()]
-                if before_text:
-                    new_nodes.append(TextNode(before_text, TextType.PLAIN))
-            
-            # Add the link
-            text, url = match.groups()
-            new_nodes.append(TextNode(text, TextType.LINK, url))
-            last_end = match.end()
-        
-        # Add any remaining text
-        if last_end < len(node.text):
-            remaining_text = node.text[last_end:]
-            if remaining_text:
-                new_nodes.append(TextNode(remaining_text, TextType.PLAIN))
-    
+        pos = text.find(marker)
+        while pos != -1:
+            token = match_token(pos)
+            if token is None:
+                pos = text.find(marker, pos + 1)
+                continue
+            # Add text before the token, then the token itself
+            if pos > last_end:
+                new_nodes.append(TextNode(text[last_end:pos], TextType.PLAIN))
+            value, url, last_end = token
+            new_nodes.append(TextNode(value, text_type, url))
+            pos = text.find(marker, last_end)
+        # Add any remaining text, or the node untouched if it held no tokens
+        if last_end == 0:
+            new_nodes.append(node)
+        elif last_end < len(text):
+            new_nodes.append(TextNode(text[last_end:], TextType.PLAIN))
     return new_nodes
-    
-def search_for_image(old_node):
-    return re.search(r'!\[(.*)[\]\(]([^)]+)\)', old_node.text)
+
+def split_node_at_links(old_nodes):
+    return split_node_at_tokens(old_nodes, "[", TextType.LINK, lambda links: links.match_link)
 
 def split_node_at_images(old_nodes):
-    new_nodes = []
-    for node in old_nodes:
-        if node.text_type != TextType.PLAIN:
-            new_nodes.append(node)
-            continue
-        if not search_for_image(node):
-            new_nodes.append(node)
-            continue
-        parts = re.split(r'(!\[.*?[\]\(].+?\))', node.text)
-        for part in parts:
-            if not part.strip():
-                continue
-            if part.startswith("![") and part.endswith(")"):
-                match = re.match(r'!\[(.*?)\]\((.+)\)', part)
-                if match:
-                    alt_text, url = match.groups()
-                    new_nodes.append(TextNode(alt_text, TextType.IMAGE, url))
-            else:
-                new_nodes.append(TextNode(part, TextType.PLAIN))
-    return new_nodes
+    return split_node_at_tokens(old_nodes, "![", TextType.IMAGE, lambda links: links.match_image)
@@ -0,0 +1,104 @@
+import hashlib
+import os
+import re
+
+SLOT_PATTERN = re.compile(r"\{\{ *([A-Za-z_][A-Za-z0-9_]*) *\}\}")
+ROOT_RELATIVE_ATTR_PATTERN = re.compile(r'\b(href|src)="/(?!/)')
+
+class CompiledTemplate:
+    """A template split once into literal segments and named slots.
+
+    literals always has one more entry than slots; rendering writes
+    literals[0], slot 0, literals[1], slot 1, ... literals[-1].
+    """
+    def __init__(self, literals, slots, placeholders):
+        self.literals = literals
+        self.slots = slots
+        self.placeholders = placeholders
+        self._digest = None
+
+    @classmethod
+    def compile(cls, template_html):
+        literals = []
+        slots = []
+        placeholders = []
+        last_end = 0
+        for match in SLOT_PATTERN.finditer(template_html):
+            literals.append(template_html[last_end:match.start()])
+            slots.append(match.group(1))
+            placeholders.append(match.group(0))
+            last_end = match.end()
+        literals.append(template_html[last_end:])
+        return cls(literals, slots, placeholders)
+
+    def rebased(self, base_path):
+        """Return a copy whose literal href/src attributes point under base_path."""
+        if not base_path:
+            return self
+        literals = [ROOT_RELATIVE_ATTR_PATTERN.sub(lambda m: f'{m.group(1)}="{base_path}', literal) for literal in self.literals]
+        return CompiledTemplate(literals, self.slots, self.placeholders)
+
+    def digest(self):
+        """Hex digest of the template's literals and slots, for keying rendered output."""
+        if self._digest is None:
+            digest = hashlib.sha256()
+            for literal, placeholder in zip(self.literals, self.placeholders):
+                digest.update(literal.encode('utf-8'))
+                digest.update(b"\0")
+                digest.update(placeholder.encode('utf-8'))
+                digest.update(b"\0")
+            digest.update(self.literals[-1].encode('utf-8'))
+            self._digest = digest.hexdigest()
+        return self._digest
+
+    def slot_count(self, name):
+        return self.slots.count(name)
+
+    def render(self, stream, values):
+        """Write the template to stream.
+
+        values maps slot names to strings, or to callables that take the stream
+        and write the slot contents themselves. Slots without a value are
+        written back out as their original placeholder.
+        """
+        write = stream.write
+        for literal, name, placeholder in zip(self.literals, self.slots, self.placeholders):
+            write(literal)
+            value = values.get(name)
+            if value is None:
+                write(placeholder)
+            elif callable(value):
+                value(stream)
+            else:
+                write(value)
+        write(self.literals[-1])
+
+    def render_to_string(self, values):
+        parts = []
+        self.render(_ListWriter(parts), values)
+        return "".join(parts)
+
+class _ListWriter:
+    def __init__(self, parts):
+        self.write = parts.append
+
+_template_cache = {}
+
+def load_template(path, base_path=None):
+    """Return the compiled template for path, reading and parsing it only when its mtime or size changes.
+
+    With a base_path the template's own asset references are rewritten once here
+    rather than on every rendered page.
+    """
+    abs_path = os.path.abspath(path)
+    if not os.path.exists(abs_path):
+        raise FileNotFoundError(f"Template file '{abs_path}' does not exist.")
+    stat = os.stat(abs_path)
+    key = (stat.st_mtime_ns, stat.st_size)
+    cached = _template_cache.get((abs_path, base_path))
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    with open(abs_path, 'r', encoding='utf-8') as f:
+        compiled = CompiledTemplate.compile(f.read()).rebased(base_path)
+    _template_cache[(abs_path, base_path)] = (key, compiled)
+    return compiled
@@ -0,0 +1,60 @@
+import os
+import unittest
+import assets
+from assets import sync_assets, sync_file
+from fixtures import SiteTestCase
+
+class TestAssets(SiteTestCase):
+    def setUp(self):
+        super().setUp()
+        self.write(os.path.join(self.src, "index.md"), "# Home")
+        self.write(os.path.join(self.src, "index.css"), "body {}")
+        self.write(os.path.join(self.src, "images", "logo.png"), "png")
+
+    def test_pages_are_not_copied(self):
+        pages, stats = sync_assets(self.src, self.dst)
+        self.assertEqual(pages, [(os.path.join(self.src, "index.md"), os.path.join(self.dst, "index.html"))])
+        self.assertFalse(os.path.exists(os.path.join(self.dst, "index.md")))
+        self.assertEqual(self.read(os.path.join(self.dst, "images", "logo.png")), "png")
+        self.assertEqual(stats.linked + stats.copied, 2)
+
+    def test_unchanged_assets_are_skipped(self):
+        sync_assets(self.src, self.dst, assets.COPY)
+        pages, stats = sync_assets(self.src, self.dst, assets.COPY)
+        self.assertEqual((stats.skipped, stats.copied), (2, 0))
+
+    def test_changed_asset_is_copied(self):
+        sync_assets(self.src, self.dst, assets.COPY)
+        self.write(os.path.join(self.src, "index.css"), "body { margin: 0; }")
+        pages, stats = sync_assets(self.src, self.dst, assets.COPY)
+        self.assertEqual((stats.skipped, stats.copied), (1, 1))
+        self.assertEqual(self.read(os.path.join(self.dst, "index.css")), "body { margin: 0; }")
+
+    def test_copy_mode_does_not_link(self):
+        dst = os.path.join(self.dst, "index.css")
+        self.assertEqual(sync_file(os.path.join(self.src, "index.css"), dst, assets.COPY), "copied")
+        self.assertFalse(os.path.samefile(os.path.join(self.src, "index.css"), dst))
+        self.assertEqual(os.stat(dst).st_mtime_ns, os.stat(os.path.join(self.src, "index.css")).st_mtime_ns)
+
+    def test_verify_catches_same_size_and_mtime(self):
+        src = os.path.join(self.src, "index.css")
+        dst = os.path.join(self.dst, "index.css")
+        sync_file(src, dst, assets.COPY)
+        self.write(dst, "html {}")
+        st = os.stat(src)
+        os.utime(dst, ns=(st.st_atime_ns, st.st_mtime_ns))
+        self.assertEqual(sync_file(src, dst, assets.COPY), "skipped")
+        self.assertEqual(sync_file(src, dst, assets.COPY, verify=True), "copied")
+        self.assertEqual(self.read(dst), "body {}")
+
+    def test_stale_outputs_are_removed(self):
+        os.makedirs(os.path.join(self.dst, "old"))
+        self.write(os.path.join(self.dst, "old", "page.html"), "old")
+        self.write(os.path.join(self.dst, "index.html"), "kept until rendered")
+        pages, stats = sync_assets(self.src, self.dst)
+        self.assertEqual(stats.removed, 1)
+        self.assertFalse(os.path.exists(os.path.join(self.dst, "old")))
+        self.assertTrue(os.path.exists(os.path.join(self.dst, "index.html")))
+
+if __name__ == "__main__":
+    unittest.main()
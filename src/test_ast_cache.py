@@ -0,0 +1,66 @@
+import json
+import os
+import unittest
+from unittest import mock
+from ast_cache import configure_ast_cache
+from blocknode import BlockNode, section_from_ast
+from diagnostics import Diagnostics, Policy
+from fixtures import SiteTestCase
+from main import markdown_to_blocks, write_page
+from template import CompiledTemplate
+
+MARKDOWN = ("---\ntags: [a]\n---\n# Title\n\nSome **bold** and [a link](/x/) ![img](/i.png)\n\n"
+            "```\ncode <b>\n```\n\n> quoted _text_\n\n- one\n- `two`\n\n1. first\n2. second")
+
+class TestAstCache(SiteTestCase):
+    def setUp(self):
+        super().setUp()
+        self.cache = configure_ast_cache(os.path.join(self.tmp, "ast"), 8)
+        self.src = os.path.join(self.tmp, "page.md")
+        self.dst = os.path.join(self.tmp, "page.html")
+
+    def tearDown(self):
+        configure_ast_cache(None)
+        super().tearDown()
+
+    def test_ast_round_trip_matches_direct_rendering(self):
+        for block in markdown_to_blocks(MARKDOWN.split("---\n", 2)[2]):
+            expected = BlockNode(block.content, block.start_line).to_section("/repo/").to_html()
+            ast = json.loads(json.dumps(block.to_ast()))
+            self.assertEqual(section_from_ast(ast, "/repo/").to_html(), expected)
+
+    def test_template_change_skips_the_parser(self):
+        self.write(self.src, MARKDOWN)
+        write_page(self.src, CompiledTemplate.compile("<title>{{ Title }}</title>{{ Content }}"), self.dst)
+        self.assertEqual(self.cache.stores, 1)
+        new_template = CompiledTemplate.compile("<h1>{{ Title }}</h1><main>{{ Content }}</main>").rebased("/repo/")
+        configure_ast_cache(None)
+        write_page(self.src, new_template, self.dst, "/repo/")
+        expected = self.read(self.dst)
+        self.cache = configure_ast_cache(os.path.join(self.tmp, "ast"), 8)
+        with mock.patch("main.render_file_to", side_effect=AssertionError("parsed a cached page")):
+            write_page(self.src, new_template, self.dst, "/repo/")
+        self.assertEqual(self.read(self.dst), expected)
+        self.assertEqual(self.cache.hits, 1)
+
+    def test_page_with_warnings_is_not_cached(self):
+        self.write(self.src, "# Title\n\nSome **unclosed")
+        diagnostics = Diagnostics(Policy.COLLECT)
+        write_page(self.src, CompiledTemplate.compile("{{ Content }}"), self.dst, diagnostics=diagnostics)
+        write_page(self.src, CompiledTemplate.compile("{{ Content }}"), self.dst, diagnostics=diagnostics)
+        self.assertEqual((self.cache.stores, len(diagnostics.warnings)), (0, 2))
+        leftovers = [name for root, dirs, files in os.walk(os.path.join(self.tmp, "ast")) for name in files]
+        self.assertEqual(leftovers, [])
+
+    def test_template_without_content_does_not_cache_an_empty_page(self):
+        self.write(self.src, MARKDOWN)
+        write_page(self.src, CompiledTemplate.compile("<title>{{ Title }}</title>"), self.dst)
+        self.assertEqual(self.cache.stores, 0)
+        write_page(self.src, CompiledTemplate.compile("<title>{{ Title }}</title><main>{{ Content }}</main>"), self.dst)
+        self.assertEqual(self.cache.stores, 1)
+        self.assertIn("<main><div><h1>Title</h1></div>", self.read(self.dst))
+        leftovers = [name for root, dirs, files in os.walk(os.path.join(self.tmp, "ast")) for name in files if name.endswith(".tmp")]
+        self.assertEqual(leftovers, [])
+
+if __name__ == "__main__":
+    unittest.main()
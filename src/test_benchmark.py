@@ -0,0 +1,24 @@
+import random
+import unittest
+from benchmark import MIXES, STAGES, parse_mix, run_benchmark, synthetic_page
+from main import markdown_to_blocks, get_title
+
+class TestBenchmark(unittest.TestCase):
+    def test_parse_mix(self):
+        self.assertEqual(parse_mix("code"), MIXES["code"])
+        self.assertEqual(parse_mix("paragraph=0.5,code=0.5"), {"paragraph": 0.5, "code": 0.5})
+
+    def test_synthetic_pages_have_a_title(self):
+        for mix in MIXES.values():
+            markdown = synthetic_page(random.Random(1), 10, mix)
+            self.assertTrue(get_title(markdown_to_blocks(markdown)))
+
+    def test_run_benchmark_reports_every_stage(self):
+        result = run_benchmark(pages=2, blocks=5, mix="balanced", repeat=1)
+        self.assertEqual(set(result["stages"]), set(STAGES))
+        self.assertEqual(result["corpus"]["pages"], 2)
+        self.assertEqual(result["corpus"]["blocks"], 12)
+        self.assertGreater(result["corpus"]["bytes_out"], 0)
+
+if __name__ == "__main__":
+    unittest.main()
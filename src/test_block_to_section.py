@@ -21,6 +21,12 @@ class TestBlockToSection(unittest.TestCase):
         expected_section = ParentNode(tag="div", children=[ParentNode(tag="pre", children=[LeafNode(tag="code", value="print('Hello, World!')", props=None)])])
         self.assertEqual(section, expected_section)
 
+    def test_code_block_keeps_blank_lines_and_backticks_inside_fences(self):
+        block = BlockNode("```\n\n`tick`\n\n```", 1)
+        self.assertEqual(block.to_html(), "<div><pre><code>\n`tick`\n</code></pre></div>")
+        block = BlockNode("```\n``\n\n  indented\n```", 1)
+        self.assertEqual(block.parse(), ("pre", "``\n\n  indented"))
+
     def test_quote_block_to_section(self):
         block = BlockNode("> This is a quote", 1)
         section = block.to_section()
@@ -102,4 +108,31 @@ class TestBlockToSection(unittest.TestCase):
                 LeafNode(tag="code", value="print('Hello, **World!**')", props=None)
             ])
         ])
-        self.assertEqual(section, expected_section)
\ No newline at end of file
+        self.assertEqual(section, expected_section)
+
+    def test_base_path_applies_to_links_but_not_code(self):
+        block = BlockNode("See [home](/) and `<a href=\"/x\">`", 1)
+        html = block.to_section("/repo/").to_html()
+        self.assertEqual(html, '<div><p>See <a href="/repo/">home</a> and <code><a href="/x"></code></p></div>')
+        code_block = BlockNode('```\n<a href="/x">\n```', 1)
+        self.assertEqual(code_block.to_section("/repo/").to_html(), '<div><pre><code><a href="/x"></code></pre></div>')
+
+    def test_to_html_matches_section_html(self):
+        contents = [
+            "A **bold** _word_ with `code`, a [link](/a) and ![img](/i.png)",
+            "## Heading with [link](https://example.com)",
+            "```\nfirst\n\nsecond\n```",
+            "> quoted **text**",
+            "- one\n- [two](/two)",
+            "1. one\n2. ![](/two.png)",
+        ]
+        for content in contents:
+            expected = BlockNode(content, 1).to_section("/repo/").to_html()
+            self.assertEqual(BlockNode(content, 1).to_html("/repo/"), expected)
+
+    def test_to_html_raises_like_to_section(self):
+        for content in ("****", "- one\n- \n- three"):
+            with self.assertRaises(ValueError):
+                BlockNode(content, 1).to_section()
+            with self.assertRaises(ValueError):
+                BlockNode(content, 1).to_html()
@@ -54,4 +54,29 @@ class TestBlockType(unittest.TestCase):
     def paragraph_starting_with_dash(self):
         block = BlockNode("- This is a paragraph starting with a dash.\nThis is still part of the same paragraph.", 1)
         block_type = block.block_type
-        self.assertEqual(block_type, BlockType.PARAGRAPH)
\ No newline at end of file
+        self.assertEqual(block_type, BlockType.PARAGRAPH)
+
+    def test_hashtag_is_paragraph(self):
+        block = BlockNode("#hashtag at the start", 1)
+        self.assertEqual(block.block_type, BlockType.PARAGRAPH)
+
+    def test_multi_line_heading_is_paragraph(self):
+        block = BlockNode("# Heading\nfollowed by text", 1)
+        self.assertEqual(block.block_type, BlockType.PARAGRAPH)
+
+    def test_unclosed_code_is_paragraph(self):
+        block = BlockNode("```\nprint('never closed')", 1)
+        self.assertEqual(block.block_type, BlockType.PARAGRAPH)
+
+    def test_misnumbered_ordered_list_is_paragraph(self):
+        block = BlockNode("1. First item\n3. Third item", 1)
+        self.assertEqual(block.block_type, BlockType.PARAGRAPH)
+
+    def test_quote_with_unquoted_line_is_paragraph(self):
+        block = BlockNode("> quoted\nnot quoted", 1)
+        self.assertEqual(block.block_type, BlockType.PARAGRAPH)
+
+    def test_empty_block_is_paragraph(self):
+        block = BlockNode("", 1)
+        self.assertEqual(block.block_type, BlockType.PARAGRAPH)
+
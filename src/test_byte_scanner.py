@@ -0,0 +1,88 @@
+import io
+import os
+import random
+import unittest
+from blocknode import BlockType, iter_blocks
+from byte_scanner import BYTES, TEXT, configure_scanner, get_scanner, iter_bytes_blocks, iter_file_blocks
+from fixtures import SiteTestCase
+from main import parse_args, write_page
+from template import CompiledTemplate
+
+MARKDOWN = ("---\ntitle: Page\n---\n# Title\n\nSome **bold** text\nover two lines\n\n"
+            "```\ncode\n\n  still code\n```\n\n> quoted\n\n- one\n- two\n\n1. first\n2. second\n")
+
+def text_blocks(raw, skip_lines=0):
+    return list(iter_blocks(io.TextIOWrapper(io.BytesIO(raw), encoding="utf-8"), skip_lines=skip_lines))
+
+def described(blocks):
+    return [(block.content, block.start_line, block.block_type) for block in blocks]
+
+class TestByteScanner(SiteTestCase):
+    def tearDown(self):
+        configure_scanner(TEXT)
+        super().tearDown()
+
+    def write_bytes(self, name, raw):
+        path = os.path.join(self.tmp, name)
+        with open(path, "wb") as f:
+            f.write(raw)
+        return path
+
+    def test_matches_text_scanner(self):
+        raw = MARKDOWN.encode()
+        self.assertEqual(described(iter_bytes_blocks(raw)), described(text_blocks(raw)))
+        self.assertEqual(described(iter_bytes_blocks(raw, skip_lines=3)), described(text_blocks(raw, 3)))
+
+    def test_fence_with_blank_lines_is_one_code_block(self):
+        blocks = list(iter_bytes_blocks(b"intro\n\n```\na\n\n\nb\n```\n\nafter"))
+        self.assertEqual([block.block_type for block in blocks], [BlockType.PARAGRAPH, BlockType.CODE, BlockType.PARAGRAPH])
+        self.assertEqual([block.start_line for block in blocks], [1, 3, 10])
+
+    def test_unclosed_fence_splits_on_blank_lines(self):
+        raw = b"```\na\n\nb"
+        self.assertEqual(described(iter_bytes_blocks(raw)), described(text_blocks(raw)))
+        self.assertEqual(len(list(iter_bytes_blocks(raw))), 2)
+
+    def test_carriage_returns_and_unicode_whitespace(self):
+        raw = "# A\r\n\r\npara\r\n　 \nnext\rline\n \t\n".encode()
+        self.assertEqual(described(iter_bytes_blocks(raw)), described(text_blocks(raw)))
+
+    def test_random_documents_match_text_scanner(self):
+        rng = random.Random(0)
+        pieces = ["a", " ", "\n", "\n", "```", "\t", "\r\n", "　", "# ", "- ", "1. ", "> ", "é"]
+        for _ in range(3000):
+            raw = "".join(rng.choice(pieces) for _ in range(rng.randint(0, 20))).encode()
+            skip_lines = rng.randint(0, 2)
+            self.assertEqual(described(iter_bytes_blocks(raw, skip_lines=skip_lines)),
+                             described(text_blocks(raw, skip_lines)), raw)
+
+    def test_file_blocks(self):
+        path = self.write_bytes("page.md", MARKDOWN.encode())
+        self.assertEqual(described(iter_file_blocks(path)), described(text_blocks(MARKDOWN.encode())))
+        self.assertEqual(list(iter_file_blocks(self.write_bytes("empty.md", b""))), [])
+
+    def test_configure_scanner(self):
+        self.assertEqual(get_scanner(), TEXT)
+        configure_scanner(BYTES)
+        self.assertEqual(get_scanner(), BYTES)
+        with self.assertRaises(ValueError):
+            configure_scanner("numpy")
+        self.assertEqual(get_scanner(), BYTES)
+        self.assertEqual(parse_args(["--scanner", "bytes"]).scanner, BYTES)
+        self.assertEqual(parse_args([]).scanner, TEXT)
+
+    def test_write_page_is_the_same_with_either_scanner(self):
+        src = self.write_bytes("page.md", MARKDOWN.encode())
+        template = CompiledTemplate.compile("<title>{{ Title }}</title>{{ Content }}")
+        pages = []
+        for scanner in (TEXT, BYTES):
+            configure_scanner(scanner)
+            dst = os.path.join(self.tmp, f"{scanner}.html")
+            write_page(src, template, dst)
+            with open(dst, encoding="utf-8") as f:
+                pages.append(f.read())
+        self.assertEqual(pages[0], pages[1])
+        self.assertIn("<pre><code>", pages[0])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from blocknode import BlockNode
+from diagnostics import Diagnostic, Diagnostics, MarkdownSyntaxError, Policy
+from main import markdown_to_blocks
+
+class TestDiagnostics(unittest.TestCase):
+    def test_strict_policy_raises(self):
+        block = BlockNode("This has **unbalanced bold", 3, Diagnostics(Policy.STRICT, "page.md"))
+        with self.assertRaises(MarkdownSyntaxError) as context:
+            block.to_section()
+        self.assertIn("page.md:3: [unbalanced-bold]", str(context.exception))
+
+    def test_collect_policy_continues_and_records(self):
+        diagnostics = Diagnostics(Policy.COLLECT, "page.md")
+        block = BlockNode("This has **unbalanced bold", 3, diagnostics)
+        output = StringIO()
+        with redirect_stdout(output):
+            html = block.to_section().to_html()
+        self.assertEqual(html, "<div><p>This has **unbalanced bold</p></div>")
+        self.assertEqual(output.getvalue(), "")
+        self.assertEqual(len(diagnostics.warnings), 1)
+        self.assertEqual(diagnostics.warnings[0].rule_id, "unbalanced-bold")
+        self.assertEqual((diagnostics.warnings[0].start_line, diagnostics.warnings[0].end_line), (3, 3))
+
+    def test_lenient_policy_prints_and_continues(self):
+        diagnostics = Diagnostics(Policy.LENIENT, "page.md")
+        block = BlockNode("A paragraph\n# with a heading inside", 5, diagnostics)
+        output = StringIO()
+        with redirect_stdout(output):
+            block.to_section()
+        self.assertIn("Warning: page.md:6: [paragraph-heading]", output.getvalue())
+        self.assertEqual(diagnostics.warnings[0].start_line, 6)
+
+    def test_only_first_suspicious_line_is_reported(self):
+        diagnostics = Diagnostics(Policy.COLLECT)
+        BlockNode("Text\n- looks like a list\n> looks like a quote", 1, diagnostics).to_section()
+        self.assertEqual([d.rule_id for d in diagnostics.warnings], ["paragraph-list"])
+
+    def test_markdown_to_blocks_threads_diagnostics(self):
+        diagnostics = Diagnostics(Policy.COLLECT, "page.md")
+        for block in markdown_to_blocks("# Title\n\nSome _odd italic\n\nFine text.", diagnostics):
+            block.to_section()
+        self.assertEqual(diagnostics.warnings, [Diagnostic("page.md", 3, 3, "unbalanced-italic", diagnostics.warnings[0].message)])
+
+    def test_report_lists_collected_warnings(self):
+        diagnostics = Diagnostics(Policy.COLLECT)
+        diagnostics.extend([Diagnostic("b.md", 2, 2, "paragraph-quote", "quote"), Diagnostic("a.md", 1, 4, "unbalanced-code", "code")])
+        output = StringIO()
+        with redirect_stdout(output):
+            diagnostics.report()
+        self.assertEqual(output.getvalue(), "Diagnostics report: 2 warning(s)\n  a.md:1-4: [unbalanced-code] code\n  b.md:2: [paragraph-quote] quote\n")
+
+if __name__ == "__main__":
+    unittest.main()
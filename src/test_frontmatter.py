@@ -0,0 +1,45 @@
+import unittest
+from diagnostics import Diagnostics, Policy
+from frontmatter import parse_value, read_front_matter
+from main import render_page
+
+class TestFrontMatter(unittest.TestCase):
+    def test_yaml_front_matter(self):
+        lines = "---\ntitle: \"Hello: World\"\ndate: 2024-05-01\ntags:\n  - elves\n  - rings\ndraft: false\n---\n# Body".split("\n")
+        fields, line_count = read_front_matter(lines)
+        self.assertEqual(fields, {"title": "Hello: World", "date": "2024-05-01", "tags": ["elves", "rings"], "draft": False})
+        self.assertEqual(line_count, 8)
+
+    def test_toml_front_matter(self):
+        fields, line_count = read_front_matter(['+++', 'title = "Home"', 'tags = ["a", "b"]', '+++'])
+        self.assertEqual(fields, {"title": "Home", "tags": ["a", "b"]})
+        self.assertEqual(line_count, 4)
+
+    def test_no_front_matter(self):
+        self.assertEqual(read_front_matter(["# Home", "", "text"]), ({}, 0))
+        self.assertEqual(read_front_matter([]), ({}, 0))
+
+    def test_unclosed_front_matter_is_a_diagnostic(self):
+        diagnostics = Diagnostics(Policy.COLLECT)
+        self.assertEqual(read_front_matter(["---", "title: x", "# Home"], diagnostics), ({}, 0))
+        self.assertEqual([warning.rule_id for warning in diagnostics.warnings], ["front-matter-unclosed"])
+
+    def test_bad_line_is_a_diagnostic_with_its_line(self):
+        diagnostics = Diagnostics(Policy.COLLECT)
+        fields, line_count = read_front_matter(["---", "title: x", "not a pair", "---"], diagnostics)
+        self.assertEqual(fields, {"title": "x"})
+        self.assertEqual((diagnostics.warnings[0].rule_id, diagnostics.warnings[0].start_line), ("front-matter-syntax", 3))
+
+    def test_parse_value(self):
+        self.assertEqual(parse_value(" 'quoted' "), "quoted")
+        self.assertEqual(parse_value("[]"), [])
+        self.assertEqual(parse_value("true"), True)
+
+    def test_front_matter_is_stripped_and_line_numbers_kept(self):
+        diagnostics = Diagnostics(Policy.COLLECT)
+        html = render_page("---\ntitle: Front\n---\n# Heading\n\nSome **unclosed", "{{ Title }}|{{ Content }}", diagnostics=diagnostics)
+        self.assertEqual(html, "Front|<div><h1>Heading</h1></div>\n<div><p>Some **unclosed</p></div>")
+        self.assertEqual(diagnostics.warnings[0].start_line, 6)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,8 @@
+import copy
+import pickle
 import unittest
-from htmlnode import HTMLNode
+from htmlnode import EMPTY_CHILDREN, EMPTY_PROPS, HTMLNode, ImageNode, LeafNode, ParentNode
+from textnode import TextNode, TextType
 
 class TestHTMLNode(unittest.TestCase):
     def test_init_with_tag_and_value(self):
@@ -81,4 +84,31 @@ class TestHTMLNode(unittest.TestCase):
         self.assertEqual(node2.props_to_html(), ' href="https://example.com"')
         self.assertEqual(node3.props_to_html(), ' src="https://example.com/image.png"')
         self.assertNotEqual(node, node2)
-        self.assertNotEqual(node, node3)
\ No newline at end of file
+        self.assertNotEqual(node, node3)
+
+    def test_nodes_have_no_instance_dict(self):
+        nodes = [HTMLNode(tag="div", value="x"), LeafNode(tag=None, value="x"), ParentNode(tag="p", children=[LeafNode(tag=None, value="x")]), TextNode("x", TextType.PLAIN)]
+        for node in nodes:
+            self.assertFalse(hasattr(node, "__dict__"))
+
+    def test_empty_children_and_props_are_shared_and_immutable(self):
+        node = LeafNode(tag="b", value="x")
+        node2 = LeafNode(tag="i", value="y")
+        self.assertIs(node.children, node2.children)
+        self.assertIs(node.props, node2.props)
+        with self.assertRaises(TypeError):
+            node.children.append(node2)
+        with self.assertRaises(TypeError):
+            node.props["class"] = "x"
+        self.assertEqual(node2.children, [])
+        self.assertEqual(node2.props, {})
+
+    def test_nodes_round_trip_through_copy_and_pickle(self):
+        node = ParentNode(tag="p", children=[LeafNode(tag="b", value="x"), LeafNode(tag="a", value="y", props={"href": "/"}),
+                                             ImageNode(tag="img", props={"src": "/i.png", "alt": "i"})])
+        for clone in (copy.deepcopy(node), copy.copy(node), pickle.loads(pickle.dumps(node))):
+            self.assertEqual(clone, node)
+            self.assertEqual(clone.to_html(), node.to_html())
+            self.assertIs(clone.children[0].props, EMPTY_PROPS)
+            self.assertIs(clone.children[0].children, EMPTY_CHILDREN)
+
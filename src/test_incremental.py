@@ -0,0 +1,78 @@
+import os
+import unittest
+from unittest import mock
+from contextlib import redirect_stdout
+from io import StringIO
+from diagnostics import Diagnostics, Policy
+from fixtures import SiteTestCase
+from main import incremental_generate
+
+class TestIncrementalBuild(SiteTestCase):
+    def setUp(self):
+        super().setUp()
+        self.write_small_site()
+
+    def build(self, jobs=1, diagnostics=None):
+        output = StringIO()
+        with redirect_stdout(output):
+            incremental_generate(self.src, self.dst, self.template, jobs=jobs, diagnostics=diagnostics)
+        return output.getvalue()
+
+    def test_first_build_renders_everything(self):
+        self.build()
+        self.assertEqual(self.read(os.path.join(self.dst, "index.html")), "<title>Home</title><main><div><h1>Home</h1></div>\n<div><p>Welcome.</p></div></main>")
+        self.assertTrue(os.path.exists(os.path.join(self.dst, "blog", "post.html")))
+        self.assertTrue(os.path.exists(os.path.join(self.dst, "index.css")))
+        self.assertFalse(os.path.exists(os.path.join(self.dst, "index.md")))
+
+    def test_noop_rebuild_renders_nothing(self):
+        self.build()
+        output = self.build()
+        self.assertNotIn("Generating page", output)
+        self.assertIn("0 file(s) updated, 0 page(s) rendered, 0 output(s) removed", output)
+
+    def test_only_changed_page_is_rendered(self):
+        self.build()
+        self.write(os.path.join(self.src, "blog", "post.md"), "# Post\n\nHello again.")
+        output = self.build()
+        self.assertIn("post.md", output)
+        self.assertNotIn("index.md", output)
+        self.assertIn("Hello again.", self.read(os.path.join(self.dst, "blog", "post.html")))
+
+    def test_template_change_rerenders_all_pages(self):
+        self.build()
+        self.write(self.template, "<h1>{{ Title }}</h1>{{ Content }}")
+        output = self.build()
+        self.assertIn("2 page(s) rendered", output)
+
+    def test_generator_version_change_rerenders_all_pages(self):
+        self.build()
+        with mock.patch("main.GENERATOR_VERSION", "next"):
+            output = self.build()
+            self.assertIn("2 page(s) rendered", output)
+            output = self.build()
+            self.assertIn("0 page(s) rendered", output)
+
+    def test_deleted_source_removes_outputs(self):
+        self.build()
+        os.remove(os.path.join(self.src, "blog", "post.md"))
+        self.build()
+        self.assertFalse(os.path.exists(os.path.join(self.dst, "blog", "post.html")))
+        self.assertFalse(os.path.exists(os.path.join(self.dst, "blog")))
+
+    def test_failed_page_is_rebuilt_next_time(self):
+        # two pages so the parallel path, which reports failures instead of raising, is taken
+        self.write(os.path.join(self.src, "blog", "post.md"), "Hello, no title.")
+        self.write(os.path.join(self.src, "blog", "other.md"), "No title either.")
+        output = self.build(jobs=2, diagnostics=Diagnostics(Policy.STRICT))
+        self.assertEqual(output.count("Error generating page from"), 2)
+        output = self.build(jobs=2, diagnostics=Diagnostics(Policy.STRICT))
+        self.assertEqual(output.count("Error generating page from"), 2)
+        self.write(os.path.join(self.src, "blog", "post.md"), "# Post\n\nFixed.")
+        self.write(os.path.join(self.src, "blog", "other.md"), "# Other\n\nFixed.")
+        self.build(jobs=2, diagnostics=Diagnostics(Policy.STRICT))
+        output = self.build(jobs=2, diagnostics=Diagnostics(Policy.STRICT))
+        self.assertIn("0 file(s) updated, 0 page(s) rendered", output)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+import unittest
+from inline_parser import text_to_text_nodes
+from textnode import TextNode, TextType
+
+class TestInlineParser(unittest.TestCase):
+    def test_plain_text(self):
+        self.assertEqual(text_to_text_nodes("Just text"), [TextNode("Just text", TextType.PLAIN)])
+
+    def test_all_token_types(self):
+        nodes = text_to_text_nodes("A **bold** _italic_ `code` [link](https://example.com) ![image](/image.png) end")
+        expected_nodes = [
+            TextNode("A ", TextType.PLAIN),
+            TextNode("bold", TextType.BOLD),
+            TextNode(" ", TextType.PLAIN),
+            TextNode("italic", TextType.ITALIC),
+            TextNode(" ", TextType.PLAIN),
+            TextNode("code", TextType.CODE),
+            TextNode(" ", TextType.PLAIN),
+            TextNode("link", TextType.LINK, "https://example.com"),
+            TextNode(" ", TextType.PLAIN),
+            TextNode("image", TextType.IMAGE, "/image.png"),
+            TextNode(" end", TextType.PLAIN)
+        ]
+        self.assertEqual(nodes, expected_nodes)
+
+    def test_empty_delimited_span_is_dropped(self):
+        self.assertEqual(text_to_text_nodes("a****b"), [TextNode("a", TextType.PLAIN), TextNode("b", TextType.PLAIN)])
+
+    def test_delimiters_inside_code_are_literal(self):
+        nodes = text_to_text_nodes("Run `x = a**b`")
+        self.assertEqual(nodes, [TextNode("Run ", TextType.PLAIN), TextNode("x = a**b", TextType.CODE)])
+
+    def test_nested_brackets_in_link(self):
+        nodes = text_to_text_nodes("See [link with [nested brackets]](https://example.com)")
+        self.assertEqual(nodes, [TextNode("See ", TextType.PLAIN), TextNode("link with [nested brackets]", TextType.LINK, "https://example.com")])
+
+    def test_nested_brackets_in_image(self):
+        nodes = text_to_text_nodes("![image with [nested brackets]](https://example.com/image.png)")
+        self.assertEqual(nodes, [TextNode("image with [nested brackets]", TextType.IMAGE, "https://example.com/image.png")])
+
+    def test_brackets_without_link(self):
+        nodes = text_to_text_nodes("Use array[0] and ![image] here")
+        self.assertEqual(nodes, [TextNode("Use array[0] and ![image] here", TextType.PLAIN)])
+
+    def test_unclosed_delimiter_is_plain_and_reported(self):
+        warnings = []
+        nodes = text_to_text_nodes("A **bold and **more** _x", lambda rule_id, message: warnings.append(rule_id))
+        expected_nodes = [
+            TextNode("A ", TextType.PLAIN),
+            TextNode("bold and ", TextType.BOLD),
+            TextNode("more** _x", TextType.PLAIN)
+        ]
+        self.assertEqual(nodes, expected_nodes)
+        self.assertEqual(warnings, ["unbalanced-bold", "unbalanced-italic"])
+
+if __name__ == "__main__":
+    unittest.main()
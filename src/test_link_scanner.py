@@ -0,0 +1,59 @@
+import random
+import re
+import unittest
+from link_scanner import ForwardFinder, LinkScanner
+
+LINK_PATTERN = re.compile(r"\[([^\[\]]*(?:\[[^\[\]]*\][^\[\]]*)*)\]\(([^)]+)\)")
+IMAGE_PATTERN = re.compile(r"!\[(.*?)\]\(([^)]+)\)")
+
+def regex_token(pattern, text, start):
+    match = pattern.match(text, start)
+    return match and (match.group(1), match.group(2), match.end())
+
+class TestLinkScanner(unittest.TestCase):
+    def test_link(self):
+        text = "see [the docs](https://example.com) now"
+        self.assertEqual(LinkScanner(text).match_link(4), ("the docs", "https://example.com", 35))
+
+    def test_link_with_nested_brackets(self):
+        text = "[link with [nested brackets]](/url)"
+        self.assertEqual(LinkScanner(text).match_link(0), ("link with [nested brackets]", "/url", len(text)))
+
+    def test_link_rejects_double_nesting_and_empty_url(self):
+        self.assertIsNone(LinkScanner("[a [b [c]]](/url)").match_link(0))
+        self.assertIsNone(LinkScanner("[a]()").match_link(0))
+        self.assertIsNone(LinkScanner("[a](/url").match_link(0))
+
+    def test_image_takes_shortest_alt_with_a_url(self):
+        text = "![a]() b](/img.png)"
+        self.assertEqual(LinkScanner(text).match_image(0), ("a]() b", "/img.png", len(text)))
+
+    def test_image_alt_stays_on_one_line(self):
+        self.assertIsNone(LinkScanner("![a\nb](/img.png)").match_image(0))
+        self.assertEqual(LinkScanner("![a](/img\n.png)").match_image(0), ("a", "/img\n.png", 15))
+
+    def test_matches_regexes(self):
+        rng = random.Random(0)
+        for _ in range(5000):
+            text = "".join(rng.choice("[]()!a\n ") for _ in range(rng.randint(0, 12)))
+            links = LinkScanner(text)
+            for start in range(len(text)):
+                if text.startswith("![", start):
+                    self.assertEqual(links.match_image(start), regex_token(IMAGE_PATTERN, text, start), text)
+                if text[start] == "[":
+                    self.assertEqual(links.match_link(start), regex_token(LINK_PATTERN, text, start), text)
+
+    def test_forward_finder_handles_backward_queries(self):
+        finder = ForwardFinder("a)b)c", ")")
+        self.assertEqual(finder.find(2), 3)
+        self.assertEqual(finder.find(0), 1)
+        self.assertEqual(finder.find(4), -1)
+        self.assertEqual(finder.find(1), 1)
+
+    def test_pathological_images_finish(self):
+        text = "![a " * 20000 + "]() " * 20000
+        links = LinkScanner(text)
+        self.assertTrue(all(links.match_image(start) is None for start in range(0, 80000, 4)))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+import os
+import shutil
+import unittest
+from fixtures import SiteTestCase
+from listings import blog_posts, plan_listings, slugify
+from main import generate_listings
+from site_index import SiteIndex
+
+def entry(path, date=None, tags=()):
+    name = path.split("/")[1]
+    return {"path": path, "title": name.title(), "date": date, "tags": list(tags), "url": f"/blog/{name}/"}
+
+def tokens(page):
+    """Every inline token of a planned listing page, in order."""
+    found = []
+    for tag, payload in page["blocks"]:
+        for row in (payload if tag == "ul" else [payload]):
+            found.extend(tuple(token) for token in row)
+    return found
+
+class TestPlanListings(unittest.TestCase):
+    def test_posts_sorted_newest_first(self):
+        pages = [entry("blog/a/index.md", "2024-01-01"), entry("blog/b/index.md"), entry("blog/c/index.md", "2024-03-01"),
+                 {"path": "index.md", "title": "Home", "date": None, "tags": [], "url": "/"}]
+        self.assertEqual([post["path"] for post in blog_posts(pages)], ["blog/c/index.md", "blog/a/index.md", "blog/b/index.md"])
+
+    def test_pagination(self):
+        pages = [entry(f"blog/p{i}/index.md", f"2024-01-{i + 10}") for i in range(5)]
+        listings = plan_listings(pages, per_page=2)
+        self.assertEqual(sorted(listings), ["blog/index.html", "blog/page/2/index.html", "blog/page/3/index.html"])
+        self.assertIn(("Older posts >", "LINK", "/blog/page/2/"), tokens(listings["blog/index.html"]))
+        self.assertIn(("< Newer posts", "LINK", "/blog/page/2/"), tokens(listings["blog/page/3/index.html"]))
+        self.assertNotIn("Older posts >", [token[0] for token in tokens(listings["blog/page/3/index.html"])])
+        self.assertEqual(listings["blog/page/2/index.html"]["title"], "Blog (page 2)")
+
+    def test_tag_pages(self):
+        pages = [entry("blog/a/index.md", "2024-01-01", ["Elves"]), entry("blog/b/index.md", "2024-02-01", ["Elves", "Rings of Power"])]
+        listings = plan_listings(pages)
+        self.assertIn("blog/tags/elves/index.html", listings)
+        self.assertIn("blog/tags/rings-of-power/index.html", listings)
+        elves = [token[0] for token in tokens(listings["blog/tags/elves/index.html"])]
+        self.assertLess(elves.index("B"), elves.index("A"))
+        self.assertEqual(listings["blog/tags/index.html"]["blocks"][1],
+                         ["ul", [[["Elves", "LINK", "/blog/tags/elves/"], [" (2)", "PLAIN"]],
+                                 [["Rings of Power", "LINK", "/blog/tags/rings-of-power/"], [" (1)", "PLAIN"]]]])
+
+    def test_colliding_tags_keep_their_own_pages(self):
+        pages = [entry("blog/a/index.md", "2024-01-01", ["C++", "elves"]), entry("blog/b/index.md", "2024-02-01", ["C#", "Elves"]),
+                 entry("blog/c/index.md", "2024-03-01", ["c"])]
+        listings = plan_listings(pages)
+        self.assertEqual(sorted(output for output in listings if output.startswith("blog/tags/")),
+                         ["blog/tags/c-2/index.html", "blog/tags/c-3/index.html", "blog/tags/c/index.html",
+                          "blog/tags/elves/index.html", "blog/tags/index.html"])
+        rows = listings["blog/tags/index.html"]["blocks"][1][1]
+        self.assertEqual([(row[0][0], row[0][2], row[1][0]) for row in rows],
+                         [("c", "/blog/tags/c/", " (1)"), ("C#", "/blog/tags/c-2/", " (1)"), ("C++", "/blog/tags/c-3/", " (1)"),
+                          ("Elves", "/blog/tags/elves/", " (2)")])
+        self.assertEqual(listings["blog/tags/elves/index.html"]["title"], "Posts tagged Elves")
+
+    def test_empty_blog(self):
+        page = plan_listings([])["blog/index.html"]
+        self.assertIn(("No posts yet.", "PLAIN"), tokens(page))
+        self.assertEqual(page["description"], "No posts yet.")
+
+    def test_slugify(self):
+        self.assertEqual(slugify("C++ & Rust"), "c-rust")
+        self.assertEqual(slugify("!!"), "tag")
+
+class TestGenerateListings(SiteTestCase):
+    def setUp(self):
+        super().setUp()
+        self.write(self.template, "<title>{{ Title }}</title>{{ Content }}")
+        for i in range(3):
+            self.post(f"p{i}", f"2024-01-1{i}")
+        self.index = SiteIndex(os.path.join(self.tmp, "index.json"))
+
+    def post(self, name, date, tags="[]"):
+        self.write(os.path.join(self.src, "blog", name, "index.md"), f"---\ndate: {date}\ntags: {tags}\n---\n# {name}\n\nText.")
+
+    def generate(self):
+        pages = []
+        for root, dirs, files in os.walk(self.src):
+            for name in files:
+                src_md = os.path.join(root, name)
+                pages.append((src_md, os.path.join(self.dst, os.path.relpath(src_md, self.src)[:-3] + ".html")))
+        self.index.update(self.src, self.dst, pages)
+        return generate_listings(self.src, self.dst, self.template, None, self.index.pages(), per_page=2)
+
+    def test_only_affected_listing_pages_are_rewritten(self):
+        self.assertEqual(self.generate(), (2, 0))
+        self.assertEqual(self.generate(), (0, 0))
+        # an older post only changes the last page
+        self.post("old", "2023-01-01")
+        self.assertEqual(self.generate(), (1, 0))
+        with open(os.path.join(self.dst, "blog", "page", "2", "index.html"), encoding='utf-8') as f:
+            self.assertIn("old", f.read())
+
+    def test_stale_listing_pages_are_removed(self):
+        self.post("tagged", "2024-02-01", "[elves]")
+        self.generate()
+        self.assertTrue(os.path.exists(os.path.join(self.dst, "blog", "tags", "elves", "index.html")))
+        shutil.rmtree(os.path.join(self.src, "blog", "tagged"))
+        # both blog pages shift up by one post, the tag page and tag overview go
+        self.assertEqual(self.generate(), (2, 2))
+        self.assertFalse(os.path.exists(os.path.join(self.dst, "blog", "tags")))
+
+    def test_titles_are_not_read_as_markdown(self):
+        self.write(os.path.join(self.src, "blog", "p0", "index.md"), "---\ndate: 2024-01-10\n---\n# a_b [c] **d\n\nText.")
+        self.write(os.path.join(self.src, "blog", "p1", "index.md"), "---\ndate: 2024-01-11\n---\n# x] y_\n\nText.")
+        self.generate()
+        with open(os.path.join(self.dst, "blog", "page", "2", "index.html"), encoding='utf-8') as f:
+            self.assertIn('<a href="/blog/p0/">a_b [c] **d</a> (2024-01-10)', f.read())
+        with open(os.path.join(self.dst, "blog", "index.html"), encoding='utf-8') as f:
+            self.assertIn('<a href="/blog/p1/">x] y_</a> (2024-01-11)', f.read())
+
+    def test_hand_written_blog_index_disables_listings(self):
+        self.write(os.path.join(self.src, "blog", "index.md"), "# My Blog")
+        self.assertEqual(self.generate(), (0, 0))
+        self.assertFalse(os.path.exists(os.path.join(self.dst, "blog", "index.html")))
+
+if __name__ == "__main__":
+    unittest.main()
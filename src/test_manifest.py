@@ -0,0 +1,38 @@
+import os
+import shutil
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from manifest import load_versioned, save_versioned
+
+class TestVersionedJson(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp, "nested", "state.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_round_trip(self):
+        save_versioned(self.path, 3, {"entries": {"a": [1, 2]}})
+        self.assertEqual(load_versioned(self.path, 3, "unused"), {"version": 3, "entries": {"a": [1, 2]}})
+        self.assertFalse(os.path.exists(self.path + ".tmp"))
+
+    def test_missing_or_other_version_is_none(self):
+        self.assertIsNone(load_versioned(self.path, 3, "unused"))
+        save_versioned(self.path, 2, {"entries": {}})
+        self.assertIsNone(load_versioned(self.path, 3, "unused"))
+
+    def test_unreadable_file_warns_and_other_shapes_are_ignored(self):
+        os.makedirs(os.path.dirname(self.path))
+        for content, expected in (("{not json", "Warning: could not read state, starting over.\n"), ("[1, 2]", "")):
+            with open(self.path, 'w', encoding='utf-8') as f:
+                f.write(content)
+            output = StringIO()
+            with redirect_stdout(output):
+                self.assertIsNone(load_versioned(self.path, 3, "could not read state, starting over."))
+            self.assertEqual(output.getvalue(), expected)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+import unittest
+from blocknode import BlockNode
+from diagnostics import Diagnostics, MarkdownSyntaxError, Policy
+from main import markdown_to_blocks, render_page
+from metadata import fallback_title, scan_metadata
+
+class TestMetadata(unittest.TestCase):
+    def test_title_and_description(self):
+        metadata = scan_metadata(markdown_to_blocks("# Home\n\nWelcome to\nthe site.\n\nMore text."))
+        self.assertEqual(metadata.title, "Home")
+        self.assertEqual(metadata.description, "Welcome to the site.")
+
+    def test_description_before_title(self):
+        metadata = scan_metadata(markdown_to_blocks("Intro text.\n\n## Section\n\n# Home"))
+        self.assertEqual((metadata.title, metadata.description), ("Home", "Intro text."))
+
+    def test_no_description_after_list(self):
+        metadata = scan_metadata(markdown_to_blocks("# Home\n\n- a\n- b\n\nLater text."))
+        self.assertIsNone(metadata.description)
+
+    def test_scan_stops_after_the_block_following_the_title(self):
+        def blocks():
+            yield BlockNode("# Home", 1)
+            yield BlockNode("Welcome.", 3)
+            raise AssertionError("scanned past the description")
+        self.assertEqual(scan_metadata(blocks()).title, "Home")
+
+    def test_fallback_title(self):
+        self.assertEqual(fallback_title("static/blog/my-first_post.md"), "My First Post")
+        self.assertEqual(fallback_title("static/contact/index.md"), "Contact")
+        self.assertEqual(fallback_title(None), "Untitled")
+
+    def test_missing_title_is_a_diagnostic(self):
+        diagnostics = Diagnostics(Policy.COLLECT, "static/about/index.md")
+        html = render_page("Just text.", "<title>{{ Title }}</title>{{ Content }}", diagnostics=diagnostics)
+        self.assertTrue(html.startswith("<title>About</title>"))
+        self.assertEqual([warning.rule_id for warning in diagnostics.warnings], ["missing-title"])
+
+    def test_missing_title_fails_under_strict(self):
+        with self.assertRaises(MarkdownSyntaxError):
+            render_page("Just text.", "{{ Title }}{{ Content }}", diagnostics=Diagnostics(Policy.STRICT))
+
+    def test_description_slot_is_escaped(self):
+        html = render_page('# Home\n\nSay "hi" & <wave>.', '<meta content="{{ Description }}">')
+        self.assertEqual(html, '<meta content="Say &quot;hi&quot; &amp; &lt;wave&gt;.">')
+
+if __name__ == "__main__":
+    unittest.main()
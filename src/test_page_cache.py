@@ -0,0 +1,76 @@
+import os
+import time
+import unittest
+import page_cache
+from diagnostics import Diagnostics, Policy
+from fixtures import SiteTestCase
+from main import write_page
+from page_cache import PageCache, configure_page_cache
+from template import CompiledTemplate
+
+TEMPLATE = CompiledTemplate.compile("<title>{{ Title }}</title><main>{{ Content }}</main>")
+
+class TestPageCache(SiteTestCase):
+    def setUp(self):
+        super().setUp()
+        self.cache = configure_page_cache(os.path.join(self.tmp, "pages"), 8)
+        self.src = os.path.join(self.tmp, "page.md")
+        self.dst = os.path.join(self.tmp, "page.html")
+
+    def tearDown(self):
+        configure_page_cache(None)
+        super().tearDown()
+
+    def test_key_depends_on_every_input(self):
+        key = self.cache.key("digest-1", TEMPLATE, None)
+        self.assertEqual(key, self.cache.key("digest-1", CompiledTemplate.compile("<title>{{ Title }}</title><main>{{ Content }}</main>"), None))
+        self.assertNotEqual(key, self.cache.key("digest-2", TEMPLATE, None))
+        self.assertNotEqual(key, self.cache.key("digest-1", TEMPLATE, "/base/"))
+        self.assertNotEqual(key, self.cache.key("digest-1", CompiledTemplate.compile("<h1>{{ Title }}</h1>{{ Content }}"), None))
+        old_version = page_cache.GENERATOR_VERSION
+        try:
+            page_cache.GENERATOR_VERSION = old_version + "-next"
+            self.assertNotEqual(key, self.cache.key("digest-1", TEMPLATE, None))
+        finally:
+            page_cache.GENERATOR_VERSION = old_version
+
+    def test_write_page_reuses_cached_page(self):
+        self.write(self.src, "# Home\n\nWelcome.")
+        write_page(self.src, TEMPLATE, self.dst, diagnostics=Diagnostics(Policy.COLLECT))
+        expected = self.read(self.dst)
+        self.assertEqual((self.cache.hits, self.cache.misses, self.cache.stores), (0, 1, 1))
+        os.remove(self.dst)
+        write_page(self.src, TEMPLATE, self.dst, diagnostics=Diagnostics(Policy.COLLECT))
+        self.assertEqual(self.read(self.dst), expected)
+        self.assertEqual(self.cache.hits, 1)
+
+    def test_page_with_warnings_is_not_cached(self):
+        self.write(self.src, "# Home\n\nSome **unclosed text.")
+        diagnostics = Diagnostics(Policy.COLLECT)
+        write_page(self.src, TEMPLATE, self.dst, diagnostics=diagnostics)
+        write_page(self.src, TEMPLATE, self.dst, diagnostics=diagnostics)
+        self.assertEqual(self.cache.stores, 0)
+        self.assertEqual(len(diagnostics.warnings), 2)
+
+    def test_prune_evicts_least_recently_used(self):
+        cache = PageCache(os.path.join(self.tmp, "lru"), 2)
+        self.write(self.dst, "<p>page</p>")
+        for i, key in enumerate(["aa01", "bb02", "cc03"]):
+            cache.put(key, self.dst)
+            stamp = time.time() - 100 + i
+            os.utime(cache.path_for(key), (stamp, stamp))
+        cache.get("aa01")
+        cache.prune()
+        self.assertEqual(cache.evictions, 1)
+        self.assertTrue(os.path.exists(cache.path_for("aa01")))
+        self.assertFalse(os.path.exists(cache.path_for("bb02")))
+        self.assertTrue(os.path.exists(cache.path_for("cc03")))
+
+    def test_clear(self):
+        self.write(self.dst, "<p>page</p>")
+        self.cache.put("aa01", self.dst)
+        self.cache.clear()
+        self.assertIsNone(self.cache.get("aa01"))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+import os
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from diagnostics import Diagnostics, Policy
+from fixtures import SiteTestCase
+from main import clone_directory_and_generate, render_pages
+
+class TestParallelBuild(SiteTestCase):
+    def setUp(self):
+        super().setUp()
+        for i in range(6):
+            self.write(os.path.join(self.src, "blog", f"post{i}.md"), f"# Post {i}\n\nSome **bold** text and a [link](/blog/post{i}).\n\n- one\n- two")
+
+    def build(self, dst, jobs, diagnostics=None):
+        pages = []
+        with redirect_stdout(StringIO()):
+            clone_directory_and_generate(self.src, dst, self.template, "/repo/", pages)
+            failures = render_pages(pages, self.template, "/repo/", jobs, diagnostics)
+        return failures
+
+    def test_parallel_output_matches_serial(self):
+        serial = os.path.join(self.tmp, "serial")
+        parallel = os.path.join(self.tmp, "parallel")
+        self.assertEqual(self.build(serial, 1), [])
+        self.assertEqual(self.build(parallel, 3), [])
+        for i in range(6):
+            name = os.path.join("blog", f"post{i}.html")
+            with open(os.path.join(serial, name), 'rb') as f:
+                expected = f.read()
+            with open(os.path.join(parallel, name), 'rb') as f:
+                self.assertEqual(f.read(), expected)
+
+    def test_parallel_errors_are_reported_per_page(self):
+        self.write(os.path.join(self.src, "blog", "untitled.md"), "No heading here.")
+        failures = self.build(os.path.join(self.tmp, "parallel"), 3, Diagnostics(Policy.STRICT))
+        self.assertEqual(len(failures), 1)
+        self.assertTrue(failures[0][0].endswith("untitled.md"))
+        self.assertIn("missing-title", failures[0][1])
+        self.assertTrue(os.path.exists(os.path.join(self.tmp, "parallel", "blog", "post5.html")))
+
+    def test_parallel_strict_failure_keeps_previous_output(self):
+        dst = os.path.join(self.tmp, "parallel")
+        self.assertEqual(self.build(dst, 3, Diagnostics(Policy.STRICT)), [])
+        self.write(os.path.join(self.src, "blog", "post2.md"), "Lost its heading.")
+        failures = self.build(dst, 3, Diagnostics(Policy.STRICT))
+        self.assertEqual([os.path.basename(src) for src, message in failures], ["post2.md"])
+        with open(os.path.join(dst, "blog", "post2.html"), encoding='utf-8') as f:
+            self.assertIn("<h1>Post 2</h1>", f.read())
+        self.assertFalse(os.path.exists(os.path.join(dst, "blog", "post2.html.tmp")))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,6 @@
 import unittest
-from htmlnode import ParentNode, LeafNode
+from io import StringIO
+from htmlnode import ParentNode, LeafNode, ImageNode
 
 class TestParentNode(unittest.TestCase):
     def test_init_with_tag_and_children(self):
@@ -113,4 +114,41 @@ class TestParentNode(unittest.TestCase):
 
     def test_no_tag(self):
         with self.assertRaises(ValueError):
-            ParentNode(tag=None, children=[LeafNode(tag="span", value="Child Node")])
\ No newline at end of file
+            ParentNode(tag=None, children=[LeafNode(tag="span", value="Child Node")])
+
+    def test_write_html_matches_to_html(self):
+        child_node1 = LeafNode(tag="span", value="Child Node 1", props={"class": "highlight"})
+        child_node2 = ParentNode(tag="div", children=[LeafNode(tag=None, value="text"), ImageNode(tag="img", props={"src": "/a.png"})])
+        node = ParentNode(tag="section", children=[child_node1, child_node2])
+        stream = StringIO()
+        node.write_html(stream)
+        self.assertEqual(stream.getvalue(), node.to_html())
+
+    def test_write_html_without_children(self):
+        node = ParentNode(tag="div", children=[LeafNode(tag="span", value="Child Node")])
+        node.children = []
+        with self.assertRaises(ValueError):
+            node.write_html(StringIO())
+
+    def test_trusted_nodes_match_validated_nodes(self):
+        trusted = ParentNode.trusted(tag="p", children=[
+            LeafNode.trusted(tag=None, value="text "),
+            LeafNode.trusted(tag="a", value="link", props={"href": "/x"}),
+            ImageNode.trusted(tag="img", props={"src": "/a.png", "alt": "a"})
+        ])
+        validated = ParentNode(tag="p", children=[
+            LeafNode(tag=None, value="text "),
+            LeafNode(tag="a", value="link", props={"href": "/x"}),
+            ImageNode(tag="img", props={"src": "/a.png", "alt": "a"})
+        ])
+        self.assertEqual(trusted, validated)
+        self.assertIsInstance(trusted, ParentNode)
+        self.assertEqual(trusted.to_html(), validated.to_html())
+        stream = StringIO()
+        trusted.write_html(stream)
+        self.assertEqual(stream.getvalue(), validated.to_html())
+
+    def test_trusted_parent_still_requires_children(self):
+        with self.assertRaises(ValueError):
+            ParentNode.trusted(tag="p", children=[])
+
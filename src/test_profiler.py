@@ -0,0 +1,41 @@
+import os
+import shutil
+import tempfile
+import unittest
+from main import write_page
+from profiler import BuildProfiler, PageProfile, PAGE_STAGES
+from template import CompiledTemplate
+
+class TestProfiler(unittest.TestCase):
+    def test_write_page_fills_page_profile(self):
+        tmp = tempfile.mkdtemp()
+        try:
+            src = os.path.join(tmp, "page.md")
+            dst = os.path.join(tmp, "page.html")
+            with open(src, 'w', encoding='utf-8') as f:
+                f.write("# Title\n\nSome **bold** text.")
+            profile = PageProfile(src)
+            write_page(src, CompiledTemplate.compile("<h1>{{ Title }}</h1>{{ Content }}"), dst, profile=profile)
+            self.assertEqual(profile.blocks, 2)
+            self.assertEqual(profile.bytes_read, os.path.getsize(src))
+            self.assertEqual(profile.bytes_written, os.path.getsize(dst))
+            self.assertEqual(set(profile.stages), set(PAGE_STAGES))
+            self.assertGreater(profile.seconds, 0)
+        finally:
+            shutil.rmtree(tmp)
+
+    def test_summary_lists_slowest_pages_first(self):
+        profiler = BuildProfiler()
+        profiler.record("copy", 0.01)
+        for name, seconds in (("fast.md", 0.001), ("slow.md", 0.5), ("medium.md", 0.05)):
+            page = PageProfile(name)
+            page.seconds = seconds
+            page.add("parse", seconds)
+            profiler.add_page(page)
+        summary = profiler.summary(top=2)
+        self.assertIn("copy", summary)
+        self.assertLess(summary.index("slow.md"), summary.index("medium.md"))
+        self.assertNotIn("fast.md", summary)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+import os
+import shutil
+import tempfile
+import unittest
+from io import StringIO
+import render_cache
+import version
+from diagnostics import Diagnostics, Policy
+from main import markdown_to_blocks, write_body
+from render_cache import RenderCache, configure_block_cache, get_block_cache
+
+def render_body(markdown, base_path=None):
+    stream = StringIO()
+    write_body(stream, markdown_to_blocks(markdown, Diagnostics(Policy.COLLECT)), base_path)
+    return stream.getvalue()
+
+class TestRenderCache(unittest.TestCase):
+    def tearDown(self):
+        configure_block_cache(0)
+
+    def test_hits_and_misses(self):
+        cache = RenderCache(4)
+        self.assertIsNone(cache.get(("a", "paragraph", None)))
+        cache.put(("a", "paragraph", None), "<p>a</p>")
+        self.assertEqual(cache.get(("a", "paragraph", None)), "<p>a</p>")
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        self.assertEqual(cache.hit_rate(), 0.5)
+
+    def test_lru_eviction(self):
+        cache = RenderCache(2)
+        cache.put("a", "A")
+        cache.put("b", "B")
+        cache.get("a")
+        cache.put("c", "C")
+        self.assertEqual(list(cache.entries), ["a", "c"])
+        self.assertEqual(cache.evictions, 1)
+
+    def test_save_and_load(self):
+        tmp = tempfile.mkdtemp()
+        try:
+            path = os.path.join(tmp, "cache", "blocks.json")
+            cache = RenderCache()
+            cache.put(("a", "paragraph", None), "<p>a</p>")
+            cache.put(("b", "paragraph", "/base/"), "<p>b</p>")
+            cache.save(path)
+            loaded = RenderCache()
+            loaded.load(path)
+            self.assertEqual(loaded.entries, cache.entries)
+        finally:
+            shutil.rmtree(tmp)
+
+    def test_load_ignores_other_generator_version(self):
+        tmp = tempfile.mkdtemp()
+        old_version = render_cache.GENERATOR_VERSION
+        try:
+            path = os.path.join(tmp, "blocks.json")
+            cache = RenderCache()
+            cache.put(("a", "paragraph", None), "<p>a</p>")
+            cache.save(path)
+            render_cache.GENERATOR_VERSION = version.GENERATOR_VERSION + "-next"
+            loaded = RenderCache()
+            loaded.load(path)
+            self.assertEqual(len(loaded.entries), 0)
+        finally:
+            render_cache.GENERATOR_VERSION = old_version
+            shutil.rmtree(tmp)
+
+    def test_cached_body_matches_uncached(self):
+        markdown = "# Title\n\nSome **bold** [link](/a/)\n\n- one\n- two\n\nSome **bold** [link](/a/)"
+        expected = render_body(markdown, "/base/")
+        cache = configure_block_cache(16)
+        self.assertEqual(render_body(markdown, "/base/"), expected)
+        self.assertEqual(render_body(markdown, "/base/"), expected)
+        self.assertEqual(cache.hits, 5)
+        self.assertNotEqual(render_body(markdown, "/other/"), expected)
+
+    def test_block_with_warnings_is_not_cached(self):
+        cache = configure_block_cache(16)
+        render_body("Some **unclosed text")
+        self.assertEqual(len(cache.entries), 0)
+        render_body("Some closed text")
+        self.assertEqual(len(cache.entries), 1)
+
+    def test_zero_size_disables_cache(self):
+        self.assertIsNone(configure_block_cache(0))
+        self.assertIsNone(get_block_cache())
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+import os
+import unittest
+from fixtures import SiteTestCase
+from site_index import SiteIndex, url_for
+
+class TestSiteIndex(SiteTestCase):
+    def setUp(self):
+        super().setUp()
+        self.post = os.path.join(self.src, "blog", "tom", "index.md")
+        self.write(self.post, "---\ndate: 2024-05-01\ntags: [hobbits, songs]\n---\n# Tom\n\nOld Tom Bombadil.\n\n- a merry fellow")
+        self.write(os.path.join(self.src, "index.md"), "# Home\n\nWelcome.")
+        self.pages = [(self.post, os.path.join(self.dst, "blog", "tom", "index.html")),
+                      (os.path.join(self.src, "index.md"), os.path.join(self.dst, "index.html"))]
+        self.path = os.path.join(self.tmp, ".cache", "index.json")
+
+    def test_entries(self):
+        index = SiteIndex(self.path)
+        self.assertEqual(index.update(self.src, self.dst, self.pages), 2)
+        entry = index.entries[os.path.join("blog", "tom", "index.md")]
+        self.assertEqual(entry["title"], "Tom")
+        self.assertEqual(entry["description"], "Old Tom Bombadil.")
+        self.assertEqual(entry["date"], "2024-05-01")
+        self.assertEqual(entry["tags"], ["hobbits", "songs"])
+        self.assertEqual(entry["words"], 9)
+        self.assertEqual(entry["output"], "blog/tom/index.html")
+        self.assertEqual(entry["url"], "/blog/tom/")
+        self.assertEqual([page["path"] for page in index.pages()], ["blog/tom/index.md", "index.md"])
+
+    def test_unchanged_pages_are_not_reread(self):
+        index = SiteIndex(self.path)
+        index.update(self.src, self.dst, self.pages)
+        index.save()
+        loaded = SiteIndex.load(self.path)
+        self.assertEqual(loaded.entries, index.entries)
+        self.write(self.post, "# Tom\n\nChanged.")
+        self.assertEqual(loaded.update(self.src, self.dst, self.pages), 1)
+        self.assertEqual(loaded.update(self.src, self.dst, self.pages[1:]), 0)
+        self.assertEqual(list(loaded.entries), ["index.md"])
+
+    def test_url_for(self):
+        self.assertEqual(url_for("index.html"), "/")
+        self.assertEqual(url_for("about.html"), "/about.html")
+
+if __name__ == "__main__":
+    unittest.main()
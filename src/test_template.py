@@ -0,0 +1,55 @@
+import os
+import shutil
+import tempfile
+import unittest
+from io import StringIO
+from template import CompiledTemplate, load_template
+
+class TestCompiledTemplate(unittest.TestCase):
+    def test_compile_splits_literals_and_slots(self):
+        template = CompiledTemplate.compile("<title>{{ Title }}</title><main>{{ Content }}</main>")
+        self.assertEqual(template.literals, ["<title>", "</title><main>", "</main>"])
+        self.assertEqual(template.slots, ["Title", "Content"])
+
+    def test_render_string_and_callable_slots(self):
+        template = CompiledTemplate.compile("{{ Title }}|{{Content}}|{{ Author }}")
+        stream = StringIO()
+        template.render(stream, {"Title": "T", "Content": lambda out: out.write("<p>body</p>"), "Author": "A"})
+        self.assertEqual(stream.getvalue(), "T|<p>body</p>|A")
+
+    def test_missing_slot_keeps_placeholder(self):
+        template = CompiledTemplate.compile("<p>{{ Title }} by {{ Author }}</p>")
+        self.assertEqual(template.render_to_string({"Title": "Post"}), "<p>Post by {{ Author }}</p>")
+
+    def test_template_without_slots(self):
+        template = CompiledTemplate.compile("<p>static</p>")
+        self.assertEqual(template.render_to_string({"Title": "unused"}), "<p>static</p>")
+
+    def test_rebased_rewrites_root_relative_assets(self):
+        template = CompiledTemplate.compile('<link href="/index.css" /><script src="//cdn/x.js"></script>{{ Content }}<img src="/a.png" />')
+        rebased = template.rebased("/repo/")
+        self.assertEqual(rebased.render_to_string({"Content": 'href="/'}), '<link href="/repo/index.css" /><script src="//cdn/x.js"></script>href="/<img src="/repo/a.png" />')
+        self.assertIs(template.rebased(None), template)
+
+    def test_load_template_is_cached_until_modified(self):
+        tmp = tempfile.mkdtemp()
+        try:
+            path = os.path.join(tmp, "template.html")
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write("<h1>{{ Title }}</h1>")
+            first = load_template(path)
+            self.assertIs(load_template(path), first)
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write("<h2>{{ Title }}</h2>!")
+            second = load_template(path)
+            self.assertIsNot(second, first)
+            self.assertEqual(second.render_to_string({"Title": "x"}), "<h2>x</h2>!")
+        finally:
+            shutil.rmtree(tmp)
+
+    def test_load_missing_template(self):
+        with self.assertRaises(FileNotFoundError):
+            load_template("does/not/exist.html")
+
+if __name__ == "__main__":
+    unittest.main()
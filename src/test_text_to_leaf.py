@@ -93,3 +93,35 @@ class TestTextToLeafNode(unittest.TestCase):
 
 
         
+
+    def test_link_with_base_path(self):
+        text_node = TextNode("Home", TextType.LINK, "/blog/")
+        leaf_node = text_node.to_html_node("/repo/")
+        self.assertEqual(leaf_node, LeafNode(tag="a", value="Home", props={"href": "/repo/blog/"}))
+
+    def test_image_with_base_path(self):
+        text_node = TextNode("alt", TextType.IMAGE, "/images/a.png")
+        image_node = text_node.to_html_node("/repo/")
+        self.assertEqual(image_node, ImageNode(tag="img", props={"src": "/repo/images/a.png", "alt": "alt"}))
+
+    def test_base_path_leaves_absolute_urls(self):
+        for url in ("https://example.com/a", "//cdn.example.com/a.js", "relative/page"):
+            leaf_node = TextNode("x", TextType.LINK, url).to_html_node("/repo/")
+            self.assertEqual(leaf_node.props["href"], url)
+
+    def test_to_html_matches_node_html(self):
+        nodes = [
+            TextNode("plain", TextType.PLAIN),
+            TextNode("bold", TextType.BOLD),
+            TextNode("italic", TextType.ITALIC),
+            TextNode("code", TextType.CODE),
+            TextNode("home", TextType.LINK, "/"),
+            TextNode("logo", TextType.IMAGE, "/logo.png"),
+            TextNode("", TextType.IMAGE, "https://example.com/a.png"),
+        ]
+        for node in nodes:
+            self.assertEqual(node.to_html("/repo/"), node.to_html_node("/repo/").to_html())
+
+    def test_to_html_link_without_text(self):
+        with self.assertRaises(ValueError):
+            TextNode("", TextType.LINK, "https://www.openai.com").to_html()
@@ -1,7 +1,8 @@
 import unittest
+from io import StringIO
 from textnode import TextNode, TextType
 from blocknode import BlockNode, BlockType
-from main import markdown_to_blocks
+from main import iter_blocks, markdown_to_blocks
 
 class TestTextToTextNode(unittest.TestCase):
     def test_plain_text(self):
@@ -118,6 +119,50 @@ This is the same paragraph on a new line
             ],
         )
 
+    def test_iter_blocks_from_file_matches_markdown_to_blocks(self):
+        md = "# Title\n\n\nFirst paragraph\nstill first\n   \n- a\n- b\n\n```\ncode\n```\n"
+        self.assertEqual(list(iter_blocks(StringIO(md))), markdown_to_blocks(md))
+        self.assertEqual([block.start_line for block in iter_blocks(StringIO(md))], [1, 4, 7, 10])
+
+    def test_iter_blocks_is_lazy(self):
+        def lines():
+            yield "# Title\n"
+            yield "\n"
+            raise AssertionError("read past the first block")
+        self.assertEqual(next(iter_blocks(lines())), BlockNode("# Title", 1))
+
+    def test_iter_blocks_keeps_blank_lines_inside_fences(self):
+        md = "Intro\n\n```\nfirst\n\n\nsecond\n```\nAfter\n"
+        blocks = markdown_to_blocks(md)
+        self.assertEqual(blocks, [
+            BlockNode("Intro", 1),
+            BlockNode("```\nfirst\n\n\nsecond\n```", 3),
+            BlockNode("After", 9),
+        ])
+        self.assertEqual(blocks[1].block_type, BlockType.CODE)
+
+    def test_iter_blocks_splits_unclosed_fence_on_blank_lines(self):
+        md = "```\nfirst\n\nsecond\n\n- a\n"
+        blocks = markdown_to_blocks(md)
+        self.assertEqual(blocks, [
+            BlockNode("```\nfirst", 1),
+            BlockNode("second", 4),
+            BlockNode("- a", 6),
+        ])
+        self.assertEqual([block.block_type for block in blocks],
+                         [BlockType.PARAGRAPH, BlockType.PARAGRAPH, BlockType.UNORDERED_LIST])
+
+    def test_iter_blocks_types_match_classifier(self):
+        md = "  # Title  \n\n> a\n> b \n\n1. one\n2. two\n\n- \n\nplain\n"
+        for block in markdown_to_blocks(md):
+            self.assertEqual(block.block_type, block.determine_block_type())
+
+    def test_iter_blocks_large_fence_is_linear(self):
+        body = "log line\n\n" * 50000
+        blocks = markdown_to_blocks(f"```\n{body}```\n")
+        self.assertEqual(len(blocks), 1)
+        self.assertEqual(blocks[0].block_type, BlockType.CODE)
+
     def test_markdown_to_text_nodes(self):
         md = """This is a **bolded** paragraph
 
@@ -0,0 +1,80 @@
+import os
+import unittest
+import urllib.request
+from contextlib import redirect_stdout
+from io import StringIO
+from fixtures import SiteTestCase
+from main import clone_directory_and_generate, render_pages, update_listings
+from watch import Watcher, start_server
+
+class TestWatch(SiteTestCase):
+    def setUp(self):
+        super().setUp()
+        self.write_small_site()
+        pages = []
+        with redirect_stdout(StringIO()):
+            clone_directory_and_generate(self.src, self.dst, self.template, None, pages)
+            render_pages(pages, self.template)
+            update_listings(self.src, self.dst, self.template, None, pages)
+        self.watcher = Watcher(self.src, self.dst, self.template)
+
+    def poll(self):
+        with redirect_stdout(StringIO()):
+            return self.watcher.poll()
+
+    def test_no_changes(self):
+        self.assertIsNone(self.poll())
+
+    def test_page_change_renders_one_page(self):
+        self.write(os.path.join(self.src, "blog", "post.md"), "# Post\n\nHello again.")
+        self.assertEqual(self.poll(), (0, 1, 0))
+        self.assertIn("Hello again.", self.read(os.path.join(self.dst, "blog", "post.html")))
+
+    def test_asset_change_copies_one_file(self):
+        self.write(os.path.join(self.src, "index.css"), "body { margin: 0; }")
+        self.assertEqual(self.poll(), (1, 0, 0))
+        self.assertEqual(self.read(os.path.join(self.dst, "index.css")), "body { margin: 0; }")
+
+    def test_template_change_renders_every_page(self):
+        self.write(self.template, "<h1>{{ Title }}</h1><article>{{ Content }}</article>")
+        self.assertEqual(self.poll(), (0, 2, 0))
+        self.assertTrue(self.read(os.path.join(self.dst, "index.html")).startswith("<h1>Home</h1>"))
+
+    def test_deleted_page_removes_outputs(self):
+        os.remove(os.path.join(self.src, "blog", "post.md"))
+        self.assertEqual(self.poll(), (0, 0, 1))
+        self.assertFalse(os.path.exists(os.path.join(self.dst, "blog", "post.html")))
+        self.assertIn("No posts yet.", self.read(os.path.join(self.dst, "blog", "index.html")))
+
+    def test_post_changes_update_listings(self):
+        listing = os.path.join(self.dst, "blog", "index.html")
+        self.assertIn("/blog/post.html", self.read(listing))
+        self.write(os.path.join(self.src, "blog", "new.md"), "---\ndate: 2024-05-01\ntags: [elves]\n---\n# New Post\n\nHi.")
+        self.assertEqual(self.poll(), (0, 1, 0))
+        self.assertIn("New Post", self.read(listing))
+        self.assertIn("New Post", self.read(os.path.join(self.dst, "blog", "tags", "elves", "index.html")))
+        self.write(os.path.join(self.src, "blog", "new.md"), "---\ndate: 2024-05-01\n---\n# Renamed Post\n\nHi.")
+        self.poll()
+        self.assertIn("Renamed Post", self.read(listing))
+        self.assertNotIn("New Post", self.read(listing))
+        self.assertFalse(os.path.exists(os.path.join(self.dst, "blog", "tags")))
+
+    def test_broken_page_keeps_watching(self):
+        self.write(os.path.join(self.src, "index.md"), "No title here.")
+        self.assertEqual(self.poll(), (0, 1, 0))
+        self.write(os.path.join(self.src, "index.md"), "# Home\n\nFixed.")
+        self.poll()
+        self.assertIn("Fixed.", self.read(os.path.join(self.dst, "index.html")))
+
+    def test_server_serves_output(self):
+        server = start_server(self.dst, 0)
+        try:
+            port = server.server_address[1]
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/index.html") as response:
+                self.assertIn(b"Welcome.", response.read())
+        finally:
+            server.shutdown()
+            server.server_close()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,5 @@
 from enum import Enum
-from htmlnode import LeafNode, ImageNode
+from htmlnode import LeafNode, ImageNode, rebase_url
 
 class TextType(Enum):
     PLAIN = "PLAIN"
@@ -9,7 +9,17 @@ class TextType(Enum):
     LINK = "LINK"
     IMAGE = "IMAGE"
 
+LEAF_TAGS = {
+    TextType.PLAIN: None,
+    TextType.BOLD: "b",
+    TextType.ITALIC: "i",
+    TextType.CODE: "code",
+    TextType.LINK: "a",
+}
+
 class TextNode:
+    __slots__ = ("text", "text_type", "url")
+
     def __init__(self, text, text_type: TextType, url=None):
         self.text = text
         self.text_type = text_type
@@ -32,20 +42,70 @@ class TextNode:
             return f"TextNode({self.text}, {self.text_type.value}, {self.url})"
         return f"TextNode({self.text}, {self.text_type.value})"
     
-    def to_html_node(self):
-        if self.text_type == TextType.PLAIN:
-            return LeafNode(tag=None, value=self.text)
-        elif self.text_type == TextType.BOLD:
-            return LeafNode(tag="b", value=self.text)
-        elif self.text_type == TextType.ITALIC:
-            return LeafNode(tag="i", value=self.text)
-        elif self.text_type == TextType.CODE:
-            return LeafNode(tag="code", value=self.text)
-        elif self.text_type == TextType.LINK:
-            return LeafNode(tag="a", value=self.text, props={"href": self.url})
-        elif self.text_type == TextType.IMAGE:
-            if not self.text:
-                return ImageNode(tag="img", props={"src": self.url})
-            return ImageNode(tag="img", props={"src": self.url, "alt": self.text})
-        else:
-            raise ValueError(f"Unsupported TextType: {self.text_type}")
\ No newline at end of file
+    def to_html_node(self, base_path=None):
+        # TextNode.__init__ already guarantees a url for links and images
+        return text_to_html_node(self.text, self.text_type, self.url, base_path)
+
+    def to_html(self, base_path=None):
+        return text_to_html(self.text, self.text_type, self.url, base_path)
+
+def text_to_html_node(text, text_type, url=None, base_path=None):
+    """The HTMLNode for one inline span, using the trusted factories after the checks that can still fail."""
+    if text_type == TextType.IMAGE:
+        if not isinstance(url, str):
+            raise TypeError("The 'src' property of ImageNode must be a string.")
+        src = rebase_url(url, base_path)
+        if not text:
+            return ImageNode.trusted(tag="img", props={"src": src})
+        return ImageNode.trusted(tag="img", props={"src": src, "alt": text})
+    tag = LEAF_TAGS.get(text_type, "")
+    if tag == "":
+        raise ValueError(f"Unsupported TextType: {text_type}")
+    if not text:
+        raise ValueError("LeafNode must have a value.")
+    if text_type == TextType.LINK:
+        return LeafNode.trusted(tag="a", value=text, props={"href": rebase_url(url, base_path)})
+    return LeafNode.trusted(tag=tag, value=text)
+
+def _plain_html(text, url=None, base_path=None):
+    if not text:
+        raise ValueError("LeafNode must have a value.")
+    return text
+
+def _leaf_html(tag):
+    def emit(text, url=None, base_path=None):
+        if not text:
+            raise ValueError("LeafNode must have a value.")
+        return f"<{tag}>{text}</{tag}>"
+    return emit
+
+def _link_html(text, url, base_path=None):
+    if not text:
+        raise ValueError("LeafNode must have a value.")
+    return f'<a href="{rebase_url(url, base_path)}">{text}</a>'
+
+def _image_html(text, url, base_path=None):
+    if not isinstance(url, str):
+        raise TypeError("The 'src' property of ImageNode must be a string.")
+    src = rebase_url(url, base_path)
+    if not text:
+        return f'<img src="{src}" />'
+    return f'<img src="{src}" alt="{text}" />'
+
+# emitter(text, url, base_path) per type, giving the same HTML as the node from
+# text_to_html_node without building it
+HTML_EMITTERS = {
+    TextType.PLAIN: _plain_html,
+    TextType.BOLD: _leaf_html("b"),
+    TextType.ITALIC: _leaf_html("i"),
+    TextType.CODE: _leaf_html("code"),
+    TextType.LINK: _link_html,
+    TextType.IMAGE: _image_html,
+}
+
+def text_to_html(text, text_type, url=None, base_path=None):
+    """The HTML for one inline span, the same as text_to_html_node(...).to_html()."""
+    emitter = HTML_EMITTERS.get(text_type)
+    if emitter is None:
+        raise ValueError(f"Unsupported TextType: {text_type}")
+    return emitter(text, url, base_path)
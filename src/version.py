@@ -0,0 +1,2 @@
+# Bump whenever a change alters the HTML produced for the same markdown, so caches keyed on it are discarded.
+GENERATOR_VERSION = "3"
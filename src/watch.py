@@ -0,0 +1,125 @@
+import functools
+import os
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+import assets
+from diagnostics import Diagnostics
+from listings import DEFAULT_PER_PAGE
+from main import outputs_for, remove_output, render_pages, update_listings
+
+DEFAULT_PORT = 8888
+DEFAULT_INTERVAL = 0.25
+
+def snapshot(src, template):
+    """Map every watched file to (size, mtime_ns); the template is keyed by its own path."""
+    files = {}
+    for root, dirs, names in os.walk(src):
+        for name in names:
+            path = os.path.join(root, name)
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                continue
+            files[os.path.relpath(path, src)] = (st.st_size, st.st_mtime_ns)
+    try:
+        st = os.stat(template)
+        files[None] = (st.st_size, st.st_mtime_ns)
+    except FileNotFoundError:
+        pass
+    return files
+
+class Watcher:
+    """Polls the source tree and template and applies targeted rebuilds.
+
+    A template change re-renders every page, a changed page re-renders just
+    that page, any other file is copied on its own, and deleted sources have
+    their outputs removed. Whenever a page or the template changes the site
+    index is updated and the blog listings regenerated, as a full build does.
+    """
+    def __init__(self, src, dst, template, base_path=None, policy=None, asset_mode=assets.LINK,
+                 per_page=DEFAULT_PER_PAGE):
+        self.src = src
+        self.dst = dst
+        self.template = template
+        self.base_path = base_path
+        self.policy = policy
+        self.asset_mode = asset_mode
+        self.per_page = per_page
+        self.files = snapshot(src, template)
+
+    def poll(self):
+        """Check for changes once, rebuild, and return (copied, rendered, removed) counts, or None if nothing changed."""
+        current = snapshot(self.src, self.template)
+        if current == self.files:
+            return None
+        previous, self.files = self.files, current
+        changed = [rel for rel, key in current.items() if previous.get(rel) != key]
+        removed = [rel for rel in previous if rel not in current]
+        return self.rebuild(changed, removed)
+
+    def rebuild(self, changed, removed):
+        template_changed = None in changed
+        pages = []
+        copied = 0
+        for rel_path in sorted(rel for rel in changed if rel is not None):
+            src_item = os.path.join(self.src, rel_path)
+            if not assets.is_page(rel_path):
+                assets.sync_file(src_item, os.path.join(self.dst, rel_path), self.asset_mode)
+                copied += 1
+            elif not template_changed:
+                pages.append((src_item, os.path.join(self.dst, outputs_for(rel_path)[0])))
+        site_pages = [(os.path.join(self.src, rel), os.path.join(self.dst, outputs_for(rel)[0]))
+                      for rel in sorted(rel for rel in self.files if rel is not None and assets.is_page(rel))]
+        if template_changed:
+            pages = site_pages
+        removed_outputs = 0
+        for rel_path in removed:
+            if rel_path is None:
+                continue
+            for output in outputs_for(rel_path):
+                remove_output(self.dst, output)
+                removed_outputs += 1
+        diagnostics = Diagnostics(self.policy) if self.policy is not None else Diagnostics()
+        for src, dst in pages:
+            try:
+                render_pages([(src, dst)], self.template, self.base_path, 1, diagnostics)
+            except Exception as e:
+                # a broken page must not stop the server, report it and keep watching
+                print(f"Error generating page from {src}: {type(e).__name__}: {e}")
+        if template_changed or pages or any(rel is not None and assets.is_page(rel) for rel in removed):
+            try:
+                update_listings(self.src, self.dst, self.template, self.base_path, site_pages, self.per_page)
+            except Exception as e:
+                print(f"Error generating listing pages: {type(e).__name__}: {e}")
+        return copied, len(pages), removed_outputs
+
+def start_server(directory, port=DEFAULT_PORT):
+    handler = functools.partial(SimpleHTTPRequestHandler, directory=directory)
+    server = ThreadingHTTPServer(("", port), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+def serve(src, dst, template, base_path=None, port=DEFAULT_PORT, watch=False, interval=DEFAULT_INTERVAL, policy=None,
+          asset_mode=assets.LINK, per_page=DEFAULT_PER_PAGE):
+    server = start_server(dst, port)
+    print(f"Serving {dst} at http://localhost:{server.server_address[1]}/ (Ctrl+C to stop)")
+    try:
+        if not watch:
+            threading.Event().wait()
+        watcher = Watcher(src, dst, template, base_path, policy, asset_mode, per_page)
+        print(f"Watching {src} and {template} for changes")
+        while True:
+            time.sleep(interval)
+            start = time.perf_counter()
+            result = watcher.poll()
+            if result is not None:
+                copied, rendered, removed = result
+                print(f"Rebuilt in {(time.perf_counter() - start) * 1000:.1f} ms: "
+                      f"{copied} file(s) copied, {rendered} page(s) rendered, {removed} output(s) removed.")
+    except KeyboardInterrupt:
+        print("Stopping server.")
+    finally:
+        server.shutdown()
+        server.server_close()